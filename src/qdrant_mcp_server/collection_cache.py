@@ -0,0 +1,195 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+from dotenv import load_dotenv
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, SparseVectorParams, VectorParams
+from .collection_config import build_vector_params, get_collection_settings
+
+# Name of the dense vector in collections created by this server
+DENSE_VECTOR_NAME = "default"
+# Name of the sparse vector stored for hybrid search
+SPARSE_VECTOR_NAME = "sparse"
+
+
+class CollectionInfo:
+    """Cached existence and vector layout of a collection."""
+
+    def __init__(
+        self,
+        vectors: Dict[Optional[str], Tuple[int, str]],
+        vector_name: Optional[str],
+        sparse_vectors: Iterable[str] = ()
+    ):
+        # Maps vector name (None for a single unnamed vector) to (size, distance)
+        self.vectors = vectors
+        self.vector_name = vector_name
+        self.sparse_vectors = set(sparse_vectors)
+        self.fetched_at = time.monotonic()
+
+    @property
+    def vector_size(self) -> int:
+        return self.vectors[self.vector_name][0]
+
+    @property
+    def distance(self) -> str:
+        return self.vectors[self.vector_name][1]
+
+    @property
+    def has_sparse(self) -> bool:
+        return SPARSE_VECTOR_NAME in self.sparse_vectors
+
+    def vector_input(self, vector: Any, sparse: Any = None) -> Any:
+        """
+        Wrap a dense vector (or a list of them) for upsert according to the
+        collection's vector layout, adding the sparse vector if it has one.
+        """
+        if sparse is not None and self.has_sparse:
+            # The unnamed dense vector is addressed as "" next to named vectors
+            return {self.vector_name or "": vector, SPARSE_VECTOR_NAME: sparse}
+        if self.vector_name is None:
+            return vector
+        return {self.vector_name: vector}
+
+    @classmethod
+    def from_params(cls, vectors_config: Any, sparse_vectors_config: Any = None) -> "CollectionInfo":
+        sparse_vectors = (sparse_vectors_config or {}).keys()
+        if isinstance(vectors_config, VectorParams):
+            return cls({None: (vectors_config.size, str(vectors_config.distance.value))}, None, sparse_vectors)
+
+        vectors = {
+            name: (params.size, str(params.distance.value))
+            for name, params in (vectors_config or {}).items()
+        }
+        if DENSE_VECTOR_NAME in vectors or not vectors:
+            vector_name = DENSE_VECTOR_NAME
+        else:
+            vector_name = next(iter(vectors))
+        return cls(vectors, vector_name, sparse_vectors)
+
+
+class CollectionCache:
+    """
+    Caches collection metadata so writes don't fetch the collection every time.
+
+    Entries expire after `ttl` seconds and should be invalidated whenever an
+    operation on the collection fails. Missing collections are created with
+    create-if-absent semantics, so concurrent writers never recreate (and wipe)
+    a collection another writer just created.
+    """
+
+    def __init__(self, client: AsyncQdrantClient, logger: logging.Logger = None):
+        load_dotenv()
+
+        self.client = client
+        self.logger = logger or logging.getLogger(__name__)
+        self.ttl = float(os.getenv("COLLECTION_CACHE_TTL", "300"))
+        # Storage layout (quantization, datatype, on-disk) for collections created here
+        self.settings = get_collection_settings(self.logger)
+
+        self._entries: Dict[str, CollectionInfo] = {}
+        self._creating: Dict[str, asyncio.Lock] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _cached(self, collection: str) -> Optional[CollectionInfo]:
+        with self._lock:
+            info = self._entries.get(collection)
+            if info is not None and time.monotonic() - info.fetched_at < self.ttl:
+                self._hits += 1
+                return info
+            self._misses += 1
+            return None
+
+    async def _fetch(self, collection: str) -> Optional[CollectionInfo]:
+        if not await self.client.collection_exists(collection):
+            return None
+        description = await self.client.get_collection(collection)
+        info = CollectionInfo.from_params(
+            description.config.params.vectors,
+            description.config.params.sparse_vectors
+        )
+        with self._lock:
+            self._entries[collection] = info
+        return info
+
+    async def get(self, collection: str) -> Optional[CollectionInfo]:
+        """Return metadata for a collection, or None if it does not exist."""
+        return self._cached(collection) or await self._fetch(collection)
+
+    async def ensure(
+        self,
+        collection: str,
+        vector_size: int,
+        sparse: Optional[SparseVectorParams] = None
+    ) -> CollectionInfo:
+        """
+        Return metadata for a collection, creating it first if it does not exist.
+
+        New collections get the sparse vector too when `sparse` is given;
+        existing collections are used as they are.
+        """
+        info = await self.get(collection)
+        if info is None:
+            lock = self._creating.setdefault(collection, asyncio.Lock())
+            async with lock:
+                info = self._cached(collection) or await self._create(collection, vector_size, sparse)
+
+        if info.vector_size != vector_size:
+            raise ValueError(
+                f"Collection {collection} stores vectors of size {info.vector_size}, "
+                f"but the embedding model produces vectors of size {vector_size}"
+            )
+        return info
+
+    async def _create(
+        self,
+        collection: str,
+        vector_size: int,
+        sparse: Optional[SparseVectorParams] = None
+    ) -> CollectionInfo:
+        self.logger.info(f"Collection {collection} not found, creating...")
+        try:
+            await self.client.create_collection(
+                collection_name=collection,
+                vectors_config={
+                    DENSE_VECTOR_NAME: build_vector_params(vector_size, self.settings)
+                },
+                sparse_vectors_config={SPARSE_VECTOR_NAME: sparse} if sparse is not None else None,
+                on_disk_payload=self.settings["payload_on_disk"] or None
+            )
+        except Exception:
+            # Another writer may have created it in the meantime; use theirs if so
+            info = await self._fetch(collection)
+            if info is None:
+                raise
+            self.logger.info(f"Collection {collection} was created concurrently, reusing it")
+            return info
+
+        info = CollectionInfo(
+            {DENSE_VECTOR_NAME: (vector_size, Distance.COSINE.value)},
+            DENSE_VECTOR_NAME,
+            [SPARSE_VECTOR_NAME] if sparse is not None else []
+        )
+        with self._lock:
+            self._entries[collection] = info
+        return info
+
+    def invalidate(self, collection: str):
+        """Forget cached metadata for a collection."""
+        with self._lock:
+            self._entries.pop(collection, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache hit and miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
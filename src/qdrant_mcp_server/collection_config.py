@@ -0,0 +1,100 @@
+import os
+import logging
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+from qdrant_client.http.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CompressionRatio,
+    Datatype,
+    Distance,
+    ProductQuantization,
+    ProductQuantizationConfig,
+    QuantizationConfig,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
+
+QUANTIZATION_METHODS = ("none", "scalar", "binary", "product")
+
+# Qdrant casts uint8 vectors without rescaling them, so fastembed's float
+# components in [-1, 1] would all be truncated to 0 or 1
+UNSUPPORTED_DATATYPES = {
+    Datatype.UINT8: "embeddings are floats in [-1, 1] and would be truncated to 0 or 1; use float16 to halve vector size",
+}
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("true", "1", "yes")
+
+
+def get_collection_settings(logger: Optional[logging.Logger] = None) -> Dict[str, Any]:
+    """
+    Read the storage settings used for collections created by this server.
+
+    Raises ValueError on unknown quantization methods, datatypes or
+    compression ratios, and on datatypes that cannot hold this server's
+    embeddings, so misconfiguration surfaces at startup.
+    """
+    logger = logger or logging.getLogger(__name__)
+    load_dotenv()
+    settings = {
+        "quantization": os.getenv("COLLECTION_QUANTIZATION", "none").lower(),
+        "quantization_always_ram": _env_bool("COLLECTION_QUANTIZATION_ALWAYS_RAM", "True"),
+        "quantile": float(os.getenv("COLLECTION_QUANTIZATION_QUANTILE", "0.99")),
+        "compression": os.getenv("COLLECTION_PRODUCT_COMPRESSION", "x16").lower(),
+        "datatype": os.getenv("COLLECTION_VECTOR_DATATYPE", "float32").lower(),
+        "vectors_on_disk": _env_bool("COLLECTION_VECTORS_ON_DISK", "False"),
+        "payload_on_disk": _env_bool("COLLECTION_PAYLOAD_ON_DISK", "False"),
+    }
+
+    if settings["quantization"] not in QUANTIZATION_METHODS:
+        raise ValueError(
+            f"Unknown COLLECTION_QUANTIZATION {settings['quantization']!r}, "
+            f"expected one of {', '.join(QUANTIZATION_METHODS)}"
+        )
+    # Enum lookups raise ValueError for unsupported values
+    datatype = Datatype(settings["datatype"])
+    CompressionRatio(settings["compression"])
+    if datatype in UNSUPPORTED_DATATYPES:
+        message = f"COLLECTION_VECTOR_DATATYPE={datatype.value} is not supported: {UNSUPPORTED_DATATYPES[datatype]}"
+        logger.error(message)
+        raise ValueError(message)
+    return settings
+
+
+def build_quantization_config(settings: Dict[str, Any]) -> Optional[QuantizationConfig]:
+    """Return the quantization config for the configured method, or None to store full vectors only."""
+    method = settings["quantization"]
+    always_ram = settings["quantization_always_ram"]
+    if method == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=settings["quantile"],
+                always_ram=always_ram
+            )
+        )
+    if method == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=always_ram))
+    if method == "product":
+        return ProductQuantization(
+            product=ProductQuantizationConfig(
+                compression=CompressionRatio(settings["compression"]),
+                always_ram=always_ram
+            )
+        )
+    return None
+
+
+def build_vector_params(size: int, settings: Dict[str, Any]) -> VectorParams:
+    """Return the dense vector parameters for a new collection."""
+    return VectorParams(
+        size=size,
+        distance=Distance.COSINE,
+        datatype=Datatype(settings["datatype"]),
+        on_disk=settings["vectors_on_disk"] or None,
+        quantization_config=build_quantization_config(settings)
+    )
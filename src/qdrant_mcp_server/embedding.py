@@ -1,9 +1,41 @@
 import os
+import time
+import asyncio
 import logging
+import threading
 import numpy as np
-from typing import List, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from dotenv import load_dotenv
-from fastembed import TextEmbedding
+from .embedding_executor import EmbeddingExecutor
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_cache import EmbeddingCache, PersistentEmbeddingCache
+
+# Model instance owned by each worker when embeddings run in a process pool
+_worker_model = None
+
+def _init_worker(model_name: str):
+    """Load the embedding model once per worker process."""
+    global _worker_model
+    from fastembed import TextEmbedding
+    _worker_model = TextEmbedding(model_name=model_name)
+
+def _worker_embed(texts: List[str]) -> np.ndarray:
+    """Embed texts with the worker process's model."""
+    return _to_matrix(_worker_model.embed(texts), len(texts))
+
+def _worker_warm_up() -> int:
+    """Run one embedding in a worker process and report which process ran it."""
+    _worker_embed(["warm up"])
+    return os.getpid()
+
+def _to_matrix(embeddings: Iterable[np.ndarray], count: int) -> np.ndarray:
+    """Copy per-text embeddings into one contiguous float32 matrix."""
+    matrix = None
+    for i, embedding in enumerate(embeddings):
+        if matrix is None:
+            matrix = np.empty((count, len(embedding)), dtype=np.float32)
+        matrix[i] = embedding
+    return matrix
 
 class EmbeddingModel:
     _instance = None
@@ -23,21 +55,159 @@ class EmbeddingModel:
         
         self.logger = logger or logging.getLogger(__name__)
         self.model_name = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
-        self.logger.info(f"Initializing embedding model: {self.model_name}")
+        self.logger.info(f"Using embedding model: {self.model_name} (loaded on first use)")
+        
+        # The model (and fastembed/onnxruntime) is loaded lazily on first use
+        self._model = None
+        self._vector_size: Optional[int] = None
+        self._load_lock = threading.Lock()
+        self.load_time: Optional[float] = None
+        
+        # Repeated texts are served from memory without running the model
+        self.cache = EmbeddingCache(self.model_name, self.logger)
+        
+        # Optional on-disk cache so re-ingesting unchanged texts survives restarts
+        self.disk_cache = None
+        disk_cache_path = os.getenv("EMBEDDING_DISK_CACHE_PATH", "")
+        if disk_cache_path:
+            self.disk_cache = PersistentEmbeddingCache(disk_cache_path, self.model_name, self.logger)
+        
+        # Inference runs in a dedicated executor so it never blocks the event loop.
+        # Large inputs are split into chunks so short queries can interleave with them.
+        self.chunk_size = int(os.getenv("EMBEDDING_CHUNK_SIZE", "64"))
+        self.executor = EmbeddingExecutor(self.logger, initializer=_init_worker, initargs=(self.model_name,))
+        # Concurrent single-text requests are coalesced into one model call
+        self.batcher = EmbeddingBatcher(self._embed_in_executor, self.logger)
         
+        self._initialized = True
+        
+        # Optionally load the model in the background so the first request doesn't pay for it
+        if os.getenv("EMBEDDING_WARMUP", "False").lower() in ("true", "1", "yes"):
+            threading.Thread(target=self._warm_up, name="embedding-warmup", daemon=True).start()
+    
+    @property
+    def model(self):
+        """The fastembed model, loaded on first access."""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+    
+    def _load_model(self):
+        self.logger.info(f"Loading embedding model: {self.model_name}")
+        start = time.perf_counter()
         try:
-            self.model = TextEmbedding(model_name=self.model_name)
-            
-            # Get vector size by embedding a test string
-            test_embedding = next(self.model.embed(["test"]))
-            self.vector_size = len(test_embedding)
-            
-            self.logger.info(f"Model loaded successfully. Vector size: {self.vector_size}")
+            from fastembed import TextEmbedding
+            model = TextEmbedding(model_name=self.model_name)
         except Exception as e:
             self.logger.error(f"Error loading embedding model: {e}")
             raise
+        self.load_time = time.perf_counter() - start
+        self.logger.info(f"Model loaded successfully in {self.load_time * 1000:.0f} ms")
+        return model
+    
+    def _warm_up(self):
+        try:
+            if self.executor.kind == "process":
+                # Workers load their own copy; the main process never embeds, so it skips loading.
+                # One task per worker makes the pool start every worker rather than reusing the first.
+                pids = asyncio.run(self._warm_up_workers())
+                self.logger.info(f"Warmed up {len(set(pids))} embedding worker process(es)")
+            else:
+                self.model
+        except Exception as e:
+            self.logger.warning(f"Embedding model warm-up failed: {e}")
+    
+    async def _warm_up_workers(self) -> List[int]:
+        return await asyncio.gather(*(self.executor.run(_worker_warm_up) for _ in range(self.executor.workers)))
+    
+    @property
+    def vector_size(self) -> int:
+        """Dimension of the model's vectors, read from fastembed's model metadata."""
+        if self._vector_size is None:
+            self._vector_size = self._lookup_vector_size()
+        return self._vector_size
+    
+    def _lookup_vector_size(self) -> int:
+        from fastembed import TextEmbedding
+        for description in TextEmbedding.list_supported_models():
+            if description["model"].lower() == self.model_name.lower():
+                return description["dim"]
+        
+        # Custom models registered at runtime may lack metadata; fall back to a test inference
+        self.logger.info(f"No metadata for {self.model_name}, measuring vector size with a test inference")
+        return len(next(self.model.embed(["test"])))
+    
+    def _embed_uncached(self, texts: List[str]) -> np.ndarray:
+        """Run the model on texts, bypassing the cache."""
+        try:
+            return _to_matrix(self.model.embed(texts), len(texts))
+        except Exception as e:
+            self.logger.error(f"Error generating embeddings: {e}")
+            raise
+    
+    def _lookup(self, texts: List[str]) -> Tuple[List[Optional[np.ndarray]], Dict[str, List[int]]]:
+        """Return cached vectors (None for misses) and the positions of each distinct missing text."""
+        rows: List[Optional[np.ndarray]] = []
+        missing: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            vector = self.cache.get(text)
+            if vector is None:
+                missing.setdefault(text, []).append(i)
+            rows.append(vector)
+        return rows, missing
+    
+    def _lookup_disk(self, rows: List[Optional[np.ndarray]], missing: Dict[str, List[int]]):
+        """Fill rows from the persistent cache and remove the texts it had from missing."""
+        texts = list(missing)
+        for text, vector in zip(texts, self.disk_cache.get_many(texts)):
+            if vector is not None:
+                self.cache.put(text, vector)
+                for i in missing.pop(text):
+                    rows[i] = vector
+    
+    def _fill(self, rows: List[Optional[np.ndarray]], missing: Dict[str, List[int]], vectors: np.ndarray):
+        """Cache freshly computed vectors and place them at their positions in rows."""
+        for text, vector in zip(missing, vectors):
+            self.cache.put(text, vector)
+            for i in missing[text]:
+                rows[i] = vector
+    
+    def _assemble(self, rows: List[np.ndarray]) -> np.ndarray:
+        if not rows:
+            return np.empty((0, self.vector_size), dtype=np.float32)
+        return np.stack(rows)
+    
+    def embed_array(self, text: Union[str, List[str]]) -> np.ndarray:
+        """
+        Convert text or list of texts to a contiguous float32 matrix with one row per text.
+        
+        Args:
+            text: A single text string or list of text strings to embed
             
-        self._initialized = True
+        Returns:
+            Array of shape (number of texts, vector size)
+        """
+        if isinstance(text, str):
+            text = [text]
+        
+        rows, missing = self._lookup(text)
+        if missing and self.disk_cache is not None:
+            self._lookup_disk(rows, missing)
+        if not missing:
+            return self._assemble(rows)
+        
+        texts = list(missing)
+        vectors = self._embed_uncached(texts)
+        self._fill(rows, missing, vectors)
+        if self.disk_cache is not None:
+            self.disk_cache.put_many(texts, vectors)
+        
+        # Nothing was cached or repeated: the model's matrix is already the result
+        if len(texts) == len(text):
+            return vectors
+        return self._assemble(rows)
     
     def embed_text(self, text: Union[str, List[str]]) -> List[List[float]]:
         """
@@ -49,18 +219,71 @@ class EmbeddingModel:
         Returns:
             List of embedding vectors
         """
+        return self.embed_array(text).tolist()
+    
+    async def _embed_in_executor(self, texts: List[str]) -> np.ndarray:
+        embed_fn = _worker_embed if self.executor.kind == "process" else self._embed_uncached
+        return await self.executor.run(embed_fn, texts)
+    
+    async def aembed_array(self, text: Union[str, List[str]]) -> np.ndarray:
+        """
+        Convert text or list of texts to a contiguous float32 matrix in the embedding executor.
+        Cached texts are returned without running the model.
+        
+        Args:
+            text: A single text string or list of text strings to embed
+            
+        Returns:
+            Array of shape (number of texts, vector size)
+        """
         if isinstance(text, str):
             text = [text]
+        
+        rows, missing = self._lookup(text)
+        if missing and self.disk_cache is not None:
+            await asyncio.to_thread(self._lookup_disk, rows, missing)
+        if not missing:
+            return self._assemble(rows)
+        
+        texts = list(missing)
+        if len(texts) == 1:
+            # Single texts are coalesced with concurrent requests into one model call
+            vectors = (await self.batcher.embed(texts[0]))[np.newaxis]
+        else:
+            chunks = []
+            for start in range(0, len(texts), self.chunk_size):
+                chunks.append(await self._embed_in_executor(texts[start:start + self.chunk_size]))
+            vectors = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+        
+        self._fill(rows, missing, vectors)
+        if self.disk_cache is not None:
+            await asyncio.to_thread(self.disk_cache.put_many, texts, vectors)
+        
+        # Nothing was cached or repeated: the model's matrix is already the result
+        if len(texts) == len(text):
+            return vectors
+        return self._assemble(rows)
+    
+    async def aembed_text(self, text: Union[str, List[str]]) -> List[List[float]]:
+        """
+        Convert text or list of texts to embedding vectors in the embedding executor.
+        
+        Args:
+            text: A single text string or list of text strings to embed
             
-        try:
-            # Generate embeddings
-            embeddings = list(self.model.embed(text))
-            
-            # Convert to list of lists if needed
-            if isinstance(embeddings[0], np.ndarray):
-                embeddings = [emb.tolist() for emb in embeddings]
-                
-            return embeddings
-        except Exception as e:
-            self.logger.error(f"Error generating embeddings: {e}")
-            raise 
\ No newline at end of file
+        Returns:
+            List of embedding vectors
+        """
+        return (await self.aembed_array(text)).tolist()
+    
+    def get_stats(self) -> dict:
+        """Return embedding cache, executor and batching statistics."""
+        return {
+            "model": self.model_name,
+            "model_loaded": self._model is not None,
+            "model_load_ms": self.load_time * 1000 if self.load_time is not None else None,
+            "cache": self.cache.get_stats(),
+            "disk_cache": self.disk_cache.get_stats() if self.disk_cache is not None else None,
+            "executor": self.executor.get_stats(),
+            "batching": self.batcher.get_stats()
+        }
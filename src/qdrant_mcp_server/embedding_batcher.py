@@ -0,0 +1,112 @@
+import os
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+
+
+class _PendingBatch:
+    """Requests collected on one event loop that have not been dispatched yet."""
+
+    def __init__(self):
+        self.items: List[Tuple[str, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        # Strong references to in-flight dispatches so they are not garbage collected
+        self.tasks: Set[asyncio.Task] = set()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into one model call.
+
+    Requests arriving within `window_ms` of the first pending one (or until
+    `max_batch_size` requests are pending) are embedded together, and each
+    caller receives its own vector.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[Any]]],
+        logger: logging.Logger = None
+    ):
+        load_dotenv()
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.embed_batch = embed_batch
+        self.window_ms = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "2"))
+        self.max_batch_size = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "32"))
+
+        self._pending: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PendingBatch]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._max_fill = 0
+
+    def _get_pending(self) -> _PendingBatch:
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(loop)
+        if pending is None:
+            pending = _PendingBatch()
+            self._pending[loop] = pending
+        return pending
+
+    async def embed(self, text: str) -> Any:
+        """Embed a single text as part of the next batch."""
+        loop = asyncio.get_running_loop()
+        pending = self._get_pending()
+        future = loop.create_future()
+        pending.items.append((text, future))
+
+        if len(pending.items) >= self.max_batch_size:
+            self._flush(pending)
+        elif pending.timer is None:
+            pending.timer = loop.call_later(self.window_ms / 1000, self._flush, pending)
+
+        return await future
+
+    def _flush(self, pending: _PendingBatch):
+        if pending.timer is not None:
+            pending.timer.cancel()
+            pending.timer = None
+        if not pending.items:
+            return
+
+        items, pending.items = pending.items, []
+        task = asyncio.ensure_future(self._dispatch(items))
+        pending.tasks.add(task)
+        task.add_done_callback(pending.tasks.discard)
+
+    async def _dispatch(self, items: List[Tuple[str, asyncio.Future]]):
+        with self._lock:
+            self._batches += 1
+            self._items += len(items)
+            self._max_fill = max(self._max_fill, len(items))
+
+        try:
+            vectors = await self.embed_batch([text for text, _ in items])
+        except Exception as e:
+            self.logger.error(f"Error embedding batch of {len(items)} texts: {e}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(items, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return batch count and average batch fill."""
+        with self._lock:
+            avg_batch_size = self._items / self._batches if self._batches else 0.0
+            return {
+                "window_ms": self.window_ms,
+                "max_batch_size": self.max_batch_size,
+                "batches": self._batches,
+                "requests": self._items,
+                "avg_batch_size": avg_batch_size,
+                "avg_batch_fill": avg_batch_size / self.max_batch_size,
+                "max_batch_fill": self._max_fill / self.max_batch_size,
+            }
@@ -0,0 +1,255 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from dotenv import load_dotenv
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache lookups (Unicode NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """
+    In-process LRU cache of embeddings keyed by (model name, normalized text).
+
+    Vectors are stored as float32 arrays. Entries are evicted least recently
+    used first once either the entry or the byte budget is exceeded.
+    """
+
+    def __init__(self, model_name: str, logger: logging.Logger = None):
+        load_dotenv()
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.model_name = model_name
+        self.max_entries = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "10000"))
+        self.max_bytes = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def _key(self, text: str) -> Tuple[str, str]:
+        return (self.model_name, normalize_text(text))
+
+    @staticmethod
+    def _entry_size(key: Tuple[str, str], vector: np.ndarray) -> int:
+        return vector.nbytes + len(key[1])
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Return the cached vector for text, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        key = self._key(text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return vector
+
+    def put(self, text: str, vector: Any):
+        """Store a vector for text, evicting least recently used entries as needed."""
+        if not self.enabled:
+            return
+
+        key = self._key(text)
+        # Copy so a cached row never keeps a whole batch matrix alive
+        vector = np.array(vector, dtype=np.float32)
+        size = self._entry_size(key, vector)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._entry_size(key, previous)
+            self._entries[key] = vector
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, old_vector = self._entries.popitem(last=False)
+                self._bytes -= self._entry_size(old_key, old_vector)
+                self._evictions += 1
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit, miss and eviction counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+class PersistentEmbeddingCache:
+    """
+    SQLite-backed embedding cache that survives server restarts.
+
+    Rows are keyed by model name and the SHA-256 of the normalized text, and
+    vectors are stored as raw float32 blobs. When the row count exceeds
+    `max_entries`, the least recently used rows are deleted down to
+    `compact_ratio` of the limit and freed pages are returned to the file.
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    _LOOKUP_CHUNK = 500
+
+    def __init__(self, path: str, model_name: str, logger: logging.Logger = None):
+        load_dotenv()
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.path = path
+        self.model_name = model_name
+        self.max_entries = int(os.getenv("EMBEDDING_DISK_CACHE_MAX_ENTRIES", "1000000"))
+        self.compact_ratio = float(os.getenv("EMBEDDING_DISK_CACHE_COMPACT_RATIO", "0.9"))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                hash BLOB NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, hash)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        self.logger.info(f"Persistent embedding cache at {path} with {self._entries} entries")
+
+    @staticmethod
+    def _hash(text: str) -> bytes:
+        return hashlib.sha256(normalize_text(text).encode("utf-8")).digest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return the cached vector for each text, or None where it is missing."""
+        hashes = [self._hash(text) for text in texts]
+        found: Dict[bytes, np.ndarray] = {}
+        now = time.time()
+
+        with self._lock:
+            unique = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique), self._LOOKUP_CHUNK):
+                chunk = unique[start:start + self._LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    [self.model_name, *chunk]
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND hash = ?",
+                    [(now, self.model_name, key) for key in found]
+                )
+                self._conn.commit()
+
+            results = [found.get(key) for key in hashes]
+            hits = sum(1 for vector in results if vector is not None)
+            self._hits += hits
+            self._misses += len(results) - hits
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Any]):
+        """Store vectors for texts, compacting the cache if it grew past its limit."""
+        now = time.time()
+        rows = [
+            (self.model_name, self._hash(text), np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            inserted = self._conn.total_changes - before
+            self._entries += inserted
+            self._writes += inserted
+
+            if self._entries > self.max_entries:
+                self._compact()
+
+    def _compact(self):
+        """Evict least recently used rows down to the compaction target and reclaim space."""
+        target = int(self.max_entries * self.compact_ratio)
+        excess = self._entries - target
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE (model, hash) IN "
+            "(SELECT model, hash FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        self._conn.commit()
+        self._conn.execute("PRAGMA incremental_vacuum")
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self._evictions += excess
+        self.logger.info(f"Compacted persistent embedding cache, evicted {excess} entries")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit, miss, write and eviction counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "path": self.path,
+                "entries": self._entries,
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
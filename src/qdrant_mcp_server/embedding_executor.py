@@ -0,0 +1,127 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+
+def _timed_call(fn: Callable, *args: Any) -> Tuple[float, Any]:
+    """Run fn in a worker and return the wall-clock time it started together with its result."""
+    started_at = time.time()
+    return started_at, fn(*args)
+
+
+class EmbeddingExecutor:
+    """
+    Runs CPU-bound embedding work off the event loop.
+
+    At most `queue_size` submissions may be pending (queued or running) at once;
+    further callers wait for a free slot, which applies backpressure to large
+    ingestion requests instead of letting them pile up unbounded work.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger = None,
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = ()
+    ):
+        load_dotenv()
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.kind = os.getenv("EMBEDDING_EXECUTOR", "thread").lower()
+        self.workers = int(os.getenv("EMBEDDING_WORKERS", "1"))
+        self.queue_size = int(os.getenv("EMBEDDING_QUEUE_SIZE", "64"))
+
+        if self.kind == "process":
+            self._executor: Executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=initializer,
+                initargs=initargs
+            )
+        elif self.kind == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="embedding")
+        else:
+            raise ValueError(f"Unknown EMBEDDING_EXECUTOR '{self.kind}', expected 'thread' or 'process'")
+
+        self.logger.info(
+            f"Embedding executor: {self.kind} pool with {self.workers} worker(s), queue size {self.queue_size}"
+        )
+
+        # Slots are per event loop because asyncio primitives are bound to the loop that uses them
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._submitted = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = asyncio.Semaphore(self.queue_size)
+            self._slots[loop] = slots
+        return slots
+
+    def _enter_queue(self):
+        with self._lock:
+            self._queue_depth += 1
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+
+    def _leave_queue(self, wait: float, run: float):
+        with self._lock:
+            self._queue_depth -= 1
+            self._completed += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._total_run += run
+
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """
+        Run fn(*args) in the executor, waiting for a free queue slot first.
+
+        In process mode fn and args must be picklable.
+        """
+        queued_at = time.time()
+        self._enter_queue()
+        wait = run = 0.0
+        try:
+            async with self._get_slots():
+                loop = asyncio.get_running_loop()
+                started_at, result = await loop.run_in_executor(self._executor, _timed_call, fn, *args)
+            finished_at = time.time()
+            wait = max(started_at - queued_at, 0.0)
+            run = max(finished_at - started_at, 0.0)
+            return result
+        finally:
+            self._leave_queue(wait, run)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth and wait time statistics."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "submitted": self._submitted,
+                "completed": completed,
+                "avg_wait_ms": 1000 * self._total_wait / completed if completed else 0.0,
+                "max_wait_ms": 1000 * self._max_wait,
+                "avg_run_ms": 1000 * self._total_run / completed if completed else 0.0,
+            }
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,323 @@
+import os
+import json
+import asyncio
+import logging
+import argparse
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Filter
+from .qdrant_client import QdrantConnectionPool
+from .scroll import filter_digest, scroll_pages
+
+MANIFEST_NAME = "export.json"
+PAYLOAD_FORMATS = ("ndjson", "parquet")
+
+# Called after each page with (points written, total points)
+ExportProgress = Callable[[int, int], Awaitable[None]]
+
+
+def vector_file_name(name: Optional[str]) -> str:
+    """Return the .npy file holding a dense vector (None for a single unnamed vector)."""
+    return "vectors.npy" if name is None else f"vectors.{name}.npy"
+
+
+class ExportReport:
+    """Where an export stands, persisted as the manifest used to resume it."""
+
+    def __init__(self, collection: str, output_dir: str, manifest: Dict[str, Any]):
+        self.collection = collection
+        self.output_dir = output_dir
+        self.manifest = manifest
+
+    @property
+    def complete(self) -> bool:
+        return self.manifest["complete"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "collection": self.collection,
+            "output_dir": self.output_dir,
+            "points": self.manifest["rows"],
+            "total": self.manifest["total"],
+            "complete": self.manifest["complete"],
+            "payload_format": self.manifest["payload_format"],
+            "vectors": self.manifest["vectors"],
+            "skipped_vectors": self.manifest["skipped_vectors"],
+        }
+
+
+class _NdjsonWriter:
+    """Appends one {"id", "payload"} line per point to points.ndjson."""
+
+    def __init__(self, output_dir: str, manifest: Dict[str, Any]):
+        path = os.path.join(output_dir, "points.ndjson")
+        self.file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        # Drop anything written after the last checkpoint
+        self.file.truncate(manifest.get("payload_bytes", 0))
+        self.file.seek(0, os.SEEK_END)
+        self.manifest = manifest
+
+    def write(self, points: List[Any]):
+        lines = [json.dumps({"id": point.id, "payload": point.payload}, ensure_ascii=False) for point in points]
+        if lines:
+            self.file.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+    def checkpoint(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.manifest["payload_bytes"] = self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetWriter:
+    """Writes each page to its own Parquet part with columns id and payload (JSON)."""
+
+    def __init__(self, output_dir: str, manifest: Dict[str, Any]):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export requires pyarrow, install it with: pip install qdrant-mcp-server[parquet]"
+            ) from e
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.directory = os.path.join(output_dir, "points")
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest = manifest
+        self.manifest.setdefault("parts", 0)
+
+        # Drop parts written after the last checkpoint
+        for name in os.listdir(self.directory):
+            if name.startswith("part-") and int(name[5:10]) >= self.manifest["parts"]:
+                os.remove(os.path.join(self.directory, name))
+
+    def write(self, points: List[Any]):
+        if not points:
+            return
+        table = self.pa.table({
+            "id": [str(point.id) for point in points],
+            "payload": [json.dumps(point.payload, ensure_ascii=False) for point in points],
+        })
+        self.pq.write_table(table, os.path.join(self.directory, f"part-{self.manifest['parts']:05d}.parquet"))
+        self.manifest["parts"] += 1
+
+    def checkpoint(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _write_manifest(output_dir: str, manifest: Dict[str, Any]):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _read_manifest(output_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _start_export(output_dir: str, manifest: Dict[str, Any]):
+    """Create the zero-filled vector files and the initial manifest."""
+    for file_name, spec in manifest["vectors"].items():
+        np.lib.format.open_memmap(
+            os.path.join(output_dir, file_name), mode="w+", dtype=np.float32, shape=(manifest["total"], spec["size"])
+        ).flush()
+    _write_manifest(output_dir, manifest)
+
+
+def _open_outputs(output_dir: str, manifest: Dict[str, Any]) -> Tuple[Any, Dict[str, np.memmap]]:
+    """Open the payload writer and memory-map the vector files for writing."""
+    if manifest["payload_format"] == "ndjson":
+        writer = _NdjsonWriter(output_dir, manifest)
+    else:
+        writer = _ParquetWriter(output_dir, manifest)
+    arrays = {
+        file_name: np.lib.format.open_memmap(os.path.join(output_dir, file_name), mode="r+")
+        for file_name in manifest["vectors"]
+    }
+    return writer, arrays
+
+
+def _write_page(
+    output_dir: str,
+    manifest: Dict[str, Any],
+    writer: Any,
+    arrays: Dict[str, np.memmap],
+    points: List[Any],
+    next_offset: Any
+):
+    """Write one page of points to the export files and checkpoint it in the manifest."""
+    start = manifest["rows"]
+    for file_name, spec in manifest["vectors"].items():
+        array = arrays[file_name]
+        for row, point in enumerate(points, start):
+            vector = point.vector if spec["name"] is None else (point.vector or {}).get(spec["name"])
+            # Points without this named vector keep a zero row
+            if vector is not None:
+                array[row] = vector
+        array.flush()
+    writer.write(points)
+    writer.checkpoint()
+
+    manifest["rows"] += len(points)
+    manifest["next_offset"] = next_offset
+    _write_manifest(output_dir, manifest)
+
+
+async def export_collection(
+    client: AsyncQdrantClient,
+    collection: str,
+    output_dir: str,
+    logger: logging.Logger,
+    payload_format: str = "ndjson",
+    with_vectors: bool = True,
+    filter_json: Optional[str] = None,
+    page_size: int = 1000,
+    resume: bool = True,
+    on_progress: Optional[ExportProgress] = None
+) -> ExportReport:
+    """
+    Export the points of a collection (optionally filtered) to `output_dir`.
+
+    Payloads go to points.ndjson (one {"id", "payload"} object per line) or to
+    Parquet parts under points/, and each dense vector to a float32 .npy file
+    whose row i belongs to the i-th exported point. Points are streamed page
+    by page and vectors written through a memory map, so memory use is bounded
+    by the page size. A manifest (export.json) is checkpointed after every
+    page; calling again with resume=True continues an interrupted export.
+    File I/O runs in a worker thread, one call per page, so the event loop
+    keeps serving other requests during large exports.
+
+    The number of points is fixed when the export starts: points added later
+    are not exported, and if points are deleted meanwhile the trailing rows of
+    the .npy files stay zero (the manifest's "rows" is authoritative).
+    """
+    if payload_format not in PAYLOAD_FORMATS:
+        raise ValueError(f"Unknown payload format {payload_format!r}, expected one of {', '.join(PAYLOAD_FORMATS)}")
+    scroll_filter = Filter(**json.loads(filter_json)) if filter_json else None
+    await asyncio.to_thread(os.makedirs, output_dir, exist_ok=True)
+
+    manifest = await asyncio.to_thread(_read_manifest, output_dir) if resume else None
+    if manifest is not None:
+        expected = (collection, filter_digest(filter_json), payload_format, with_vectors)
+        found = (manifest["collection"], manifest["filter"], manifest["payload_format"], manifest["with_vectors"])
+        if expected != found:
+            raise ValueError(
+                f"{output_dir} holds an export with different settings; use resume=False to overwrite it"
+            )
+        if manifest["complete"]:
+            logger.info(f"Export of {collection} to {output_dir} is already complete")
+            return ExportReport(collection, output_dir, manifest)
+        logger.info(f"Resuming export of {collection} at {manifest['rows']}/{manifest['total']} points")
+    else:
+        description = await client.get_collection(collection)
+        vectors, skipped = {}, []
+        if with_vectors:
+            for name, params in _dense_vectors(description.config.params.vectors).items():
+                if getattr(params, "multivector_config", None) is not None:
+                    skipped.append(name)
+                else:
+                    vectors[vector_file_name(name)] = {"name": name, "size": params.size}
+            skipped += list((description.config.params.sparse_vectors or {}).keys())
+        total = (await client.count(collection_name=collection, count_filter=scroll_filter, exact=True)).count
+        manifest = {
+            "collection": collection,
+            "filter": filter_digest(filter_json),
+            "payload_format": payload_format,
+            "with_vectors": with_vectors,
+            "vectors": vectors,
+            "skipped_vectors": skipped,
+            "total": total,
+            "rows": 0,
+            "next_offset": None,
+            "complete": False,
+        }
+        await asyncio.to_thread(_start_export, output_dir, manifest)
+        logger.info(f"Exporting {total} points of {collection} (vectors: {list(vectors) or 'none'}) to {output_dir}")
+
+    writer, arrays = await asyncio.to_thread(_open_outputs, output_dir, manifest)
+    # Named vectors are requested by name, a single unnamed vector with True
+    names = [spec["name"] for spec in manifest["vectors"].values() if spec["name"] is not None]
+    vector_selector = names or bool(arrays)
+    try:
+        remaining = manifest["total"] - manifest["rows"]
+        if remaining > 0:
+            async for points, next_offset in scroll_pages(
+                client,
+                collection,
+                scroll_filter,
+                page_size=page_size,
+                offset=manifest["next_offset"],
+                max_points=remaining,
+                with_payload=True,
+                with_vectors=vector_selector
+            ):
+                await asyncio.to_thread(_write_page, output_dir, manifest, writer, arrays, points, next_offset)
+                if on_progress is not None:
+                    await on_progress(manifest["rows"], manifest["total"])
+
+        manifest["complete"] = True
+        await asyncio.to_thread(_write_manifest, output_dir, manifest)
+        logger.info(f"Exported {manifest['rows']} points of {collection} to {output_dir}")
+        return ExportReport(collection, output_dir, manifest)
+    finally:
+        await asyncio.to_thread(writer.close)
+
+
+def _dense_vectors(vectors_config: Any) -> Dict[Optional[str], Any]:
+    """Map dense vector names (None for a single unnamed vector) to their params."""
+    if vectors_config is None:
+        return {}
+    if isinstance(vectors_config, dict):
+        return dict(vectors_config)
+    return {None: vectors_config}
+
+
+def main():
+    """Command line entry point: export a collection to local files."""
+    parser = argparse.ArgumentParser(description="Export a Qdrant collection to NDJSON/Parquet payloads and .npy vectors")
+    parser.add_argument("collection", help="Collection to export")
+    parser.add_argument("output_dir", help="Directory for the exported files")
+    parser.add_argument("--format", choices=PAYLOAD_FORMATS, default="ndjson", help="Payload file format")
+    parser.add_argument("--no-vectors", action="store_true", help="Export payloads only")
+    parser.add_argument("--filter", help="JSON filter selecting the points to export")
+    parser.add_argument("--page-size", type=int, default=1000, help="Points read per scroll request")
+    parser.add_argument("--restart", action="store_true", help="Start over instead of resuming a previous export")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger = logging.getLogger("qdrant_mcp_export")
+
+    async def run() -> ExportReport:
+        pool = QdrantConnectionPool(logger)
+        try:
+            return await export_collection(
+                pool.client,
+                args.collection,
+                args.output_dir,
+                logger,
+                payload_format=args.format,
+                with_vectors=not args.no_vectors,
+                filter_json=args.filter,
+                page_size=args.page_size,
+                resume=not args.restart
+            )
+        finally:
+            await pool.client.close()
+
+    report = asyncio.run(run())
+    print(json.dumps(report.to_dict(), indent=2))
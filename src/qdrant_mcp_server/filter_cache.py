@@ -0,0 +1,101 @@
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from dotenv import load_dotenv
+from qdrant_client.http.models import Filter
+
+
+class FilterCache:
+    """
+    LRU cache of parsed filters, keyed by the canonical JSON of the filter.
+
+    Filters that differ only in key order or whitespace share one entry.
+    Invalid filters are cached too, with the validation error they raised, so
+    a repeated bad filter fails without being validated again. Cached Filter objects are
+    shared between calls and must not be modified. Disabled when `max_size`
+    is 0.
+    """
+
+    def __init__(self, logger: logging.Logger = None):
+        load_dotenv()
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_size = int(os.getenv("FILTER_CACHE_SIZE", "256"))
+
+        # Canonical filter JSON -> (filter, validation error)
+        self._entries: "OrderedDict[str, Tuple[Optional[Filter], Optional[ValueError]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalid = 0
+
+    @staticmethod
+    def _build(data: Any) -> Tuple[Optional[Filter], Optional[ValueError]]:
+        try:
+            if not isinstance(data, dict):
+                raise ValueError("Filter must be a JSON object")
+            return Filter(**data), None
+        except ValueError as e:
+            # Includes pydantic's ValidationError
+            return None, e
+
+    def parse(self, filter_json: Optional[str]) -> Optional[Filter]:
+        """
+        Return the Filter for a JSON filter string, or None if none is given.
+
+        Raises json.JSONDecodeError for malformed JSON and ValueError for JSON
+        that is not a valid filter, whether or not the result was cached.
+        """
+        if not filter_json:
+            return None
+
+        # Decoding is cheap next to validating the model, and gives the canonical key;
+        # malformed JSON fails right here, so it is never cached
+        data = json.loads(filter_json)
+        key = json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        if entry is None:
+            entry = self._build(data)
+            with self._lock:
+                if entry[1] is not None:
+                    self._invalid += 1
+                if self.max_size > 0:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+
+        parsed, error = entry
+        if error is not None:
+            # Drop the traceback of earlier raises so it doesn't grow on every hit
+            raise error.with_traceback(None)
+        return parsed
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit and miss counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalid": self._invalid,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,402 @@
+import os
+import csv
+import json
+import uuid
+import asyncio
+import logging
+import argparse
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Batch, SparseVector, SparseVectorParams
+from .collection_cache import CollectionCache
+from .ingest import get_upsert_settings, upsert_batches
+from .qdrant_client import QdrantConnectionPool
+
+TEXT_FORMATS = (".jsonl", ".ndjson", ".csv", ".parquet")
+VECTOR_FORMATS = (".npy",)
+
+# Called after each batch with (points imported, total points or None if not known up front)
+ImportProgress = Callable[[int, Optional[int]], Awaitable[None]]
+
+
+def read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the rows of a JSONL, CSV or Parquet file one at a time."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif extension == ".parquet":
+        try:
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError(
+                "Parquet import requires pyarrow, install it with: pip install qdrant-mcp-server[parquet]"
+            ) from e
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+    else:
+        raise ValueError(f"Unsupported file type {extension!r}, expected one of {', '.join(TEXT_FORMATS)}")
+
+
+class ImportReport:
+    """Outcome of a file import, counting only the batches written by this run."""
+
+    def __init__(self, collection: str, path: str, batch_size: int):
+        self.collection = collection
+        self.path = path
+        self.batch_size = batch_size
+        # Rows read from the input
+        self.total = 0
+        self.points = 0
+        self.batches = 0
+        # Batches stored by an earlier, interrupted run
+        self.skipped = 0
+        # Batch index -> last error message
+        self.failed: Dict[int, str] = {}
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "collection": self.collection,
+            "path": self.path,
+            "points": self.points,
+            "batches": self.batches,
+            "skipped_batches": self.skipped,
+            "complete": self.complete,
+            "failed": [
+                {
+                    "batch": index,
+                    "start": index * self.batch_size,
+                    "end": min((index + 1) * self.batch_size, self.total),
+                    "error": error
+                }
+                for index, error in sorted(self.failed.items())
+            ],
+        }
+
+
+def _source_signature(paths: List[str]) -> List[List[Any]]:
+    """Identify input files by path, size and modification time."""
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def _read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_checkpoint(path: str, state: Dict[str, Any]):
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def _point_id(value: Any) -> Any:
+    # Numeric ids read from CSV files arrive as strings
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return value
+
+
+async def import_file(
+    client: AsyncQdrantClient,
+    collections: CollectionCache,
+    collection: str,
+    path: str,
+    logger: logging.Logger,
+    embed: Optional[Callable[[List[str]], Awaitable[np.ndarray]]] = None,
+    vector_size: Optional[int] = None,
+    embed_sparse: Optional[Callable[[List[str]], Awaitable[List[SparseVector]]]] = None,
+    sparse_params: Optional[SparseVectorParams] = None,
+    payload_path: Optional[str] = None,
+    text_field: str = "text",
+    id_field: Optional[str] = None,
+    payload_field: Optional[str] = None,
+    batch_size: int = 256,
+    parallel: int = 4,
+    max_retries: int = 2,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = True,
+    on_progress: Optional[ImportProgress] = None
+) -> ImportReport:
+    """
+    Import points from a file into a collection, creating it if needed.
+
+    Text files (JSONL, CSV, Parquet) are embedded with `embed`; each row's
+    `text_field` is stored as the "text" payload field, like store_texts does.
+    With `embed_sparse`, texts also get the sparse vector used by hybrid
+    search (new collections are created with `sparse_params`).
+    A .npy file is memory-mapped and its rows upserted as vectors, with
+    payloads read row by row from the optional `payload_path` file. Payloads
+    are the row's remaining fields, or the object in `payload_field`; ids come
+    from `id_field`, or are derived from the file path and row number so that
+    re-running an import overwrites instead of duplicating points.
+
+    Rows are read in windows of `parallel` batches. While one window is
+    upserted (batches in parallel, failures retried), the next one is read
+    and embedded, so memory is bounded by the window size. Finished batch
+    indexes are checkpointed to `checkpoint_path` (default: next to the
+    file) as they complete, and a resumed import skips them. Reading files
+    and writing checkpoints runs in worker threads, off the event loop.
+    """
+    is_vectors = os.path.splitext(path)[1].lower() in VECTOR_FORMATS
+    if is_vectors:
+        vectors = await asyncio.to_thread(np.load, path, mmap_mode="r")
+        if vectors.ndim != 2:
+            raise ValueError(f"{path} must hold a 2-D array of vectors, got shape {vectors.shape}")
+        total: Optional[int] = len(vectors)
+        vector_size = vectors.shape[1]
+        rows = read_rows(payload_path) if payload_path else iter(lambda: {}, None)
+    else:
+        if embed is None or vector_size is None:
+            raise ValueError("Importing texts requires an embedding model")
+        total = None
+        rows = read_rows(path)
+
+    checkpoint_path = checkpoint_path or path + ".import.json"
+    sources = await asyncio.to_thread(_source_signature, [path] + ([payload_path] if payload_path else []))
+    settings = {
+        "collection": collection,
+        "sources": sources,
+        "batch_size": batch_size,
+        "text_field": text_field,
+        "id_field": id_field,
+        "payload_field": payload_field,
+    }
+    state = {**settings, "done": [], "complete": False}
+    found = await asyncio.to_thread(_read_checkpoint, checkpoint_path) if resume else None
+    if found is not None:
+        if any(found.get(key) != value for key, value in settings.items()):
+            raise ValueError(
+                f"{checkpoint_path} belongs to another import or the input changed; use resume=False to start over"
+            )
+        state = found
+    done = set(state["done"])
+
+    report = ImportReport(collection, path, batch_size)
+    if state["complete"]:
+        report.skipped = len(done)
+        logger.info(f"Import of {path} into {collection} is already complete")
+        return report
+    if done:
+        logger.info(f"Resuming import of {path} into {collection}, skipping {len(done)} finished batches")
+
+    info = await collections.ensure(collection, vector_size, sparse_params)
+    if not info.has_sparse:
+        # Collections without the sparse vector only store dense vectors
+        embed_sparse = None
+    window_size = batch_size * max(parallel, 1)
+    # Fields that are not copied into the payload
+    reserved = (id_field,) if is_vectors else (id_field, text_field)
+
+    def payload_of(row: Dict[str, Any], number: int) -> Dict[str, Any]:
+        if payload_field is not None:
+            value = row.get(payload_field)
+            payload = dict(json.loads(value) if isinstance(value, str) else value or {})
+        else:
+            payload = {key: value for key, value in row.items() if key not in reserved}
+        if not is_vectors:
+            payload["text"] = row[text_field]
+        return payload
+
+    def id_of(row: Dict[str, Any], number: int) -> Any:
+        if id_field is None:
+            return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{os.path.abspath(path)}#{number}"))
+        if row.get(id_field) is None:
+            raise ValueError(f"Row {number} of {path} has no {id_field!r} field")
+        return _point_id(row[id_field])
+
+    def read_window(start: int) -> List[Dict[str, Any]]:
+        count = window_size if total is None else min(window_size, total - start)
+        window = list(islice(rows, count))
+        if total is not None and len(window) < count:
+            raise ValueError(f"{payload_path} has fewer rows than the {total} vectors in {path}")
+        if not is_vectors:
+            # Fail before the window is embedded
+            for i, row in enumerate(window):
+                if not row.get(text_field):
+                    raise ValueError(f"Row {start + i} of {path} has no {text_field!r} field")
+        return window
+
+    async def prepare(start: int) -> Optional[Tuple[int, List[int], Dict[int, Any], List[Any], List[Dict[str, Any]]]]:
+        """Read a window and compute the vectors of its unfinished batches."""
+        window = await asyncio.to_thread(read_window, start)
+        if not window:
+            return None
+        first = start // batch_size
+        indexes = range(first, first + (len(window) + batch_size - 1) // batch_size)
+        pending = [index for index in indexes if index not in done]
+        report.skipped += len(indexes) - len(pending)
+
+        def local(index: int) -> slice:
+            return slice(index * batch_size - start, (index + 1) * batch_size - start)
+
+        def page_in(index: int) -> np.ndarray:
+            # Only the rows of unfinished batches are paged in from the memory map
+            rows_range = local(index)
+            return np.array(vectors[start + rows_range.start:start + min(rows_range.stop, len(window))], dtype=np.float32)
+
+        batch_vectors: Dict[int, np.ndarray] = {}
+        batch_sparse: Dict[int, Optional[List[SparseVector]]] = {index: None for index in pending}
+        if is_vectors:
+            batch_vectors = await asyncio.to_thread(lambda: {index: page_in(index) for index in pending})
+        elif pending:
+            # One embedding call for all unfinished batches of the window
+            texts = [row.get(text_field) for index in pending for row in window[local(index)]]
+            if embed_sparse is not None:
+                embedded, sparse = await asyncio.gather(embed(texts), embed_sparse(texts))
+            else:
+                embedded, sparse = await embed(texts), None
+            offset = 0
+            for index in pending:
+                count = len(window[local(index)])
+                batch_vectors[index] = embedded[offset:offset + count]
+                if sparse is not None:
+                    batch_sparse[index] = sparse[offset:offset + count]
+                offset += count
+        ids = [id_of(row, start + i) for i, row in enumerate(window)]
+        payloads = [payload_of(row, start + i) for i, row in enumerate(window)]
+        return start + len(window), pending, (batch_vectors, batch_sparse), ids, payloads
+
+    # Batches finish concurrently; their checkpoint writes share one temporary file
+    checkpoint_lock = asyncio.Lock()
+
+    async def mark_done(index: int):
+        done.add(index)
+        async with checkpoint_lock:
+            state["done"] = sorted(done)
+            await asyncio.to_thread(_write_checkpoint, checkpoint_path, state)
+        report.points += len(batch_vectors[index])
+        report.batches += 1
+        if on_progress is not None:
+            await on_progress(report.points, total)
+
+    start = 0
+    next_window = asyncio.ensure_future(prepare(start))
+    try:
+        while True:
+            prepared = await next_window
+            if prepared is None:
+                break
+            end, pending, (batch_vectors, batch_sparse), ids, payloads = prepared
+            window_start = start
+            start = end
+            # Read and embed the next window while this one is upserted
+            next_window = asyncio.ensure_future(prepare(start))
+
+            def build_batch(batch_start: int, batch_end: int) -> Batch:
+                local = slice(batch_start - window_start, batch_end - window_start)
+                return Batch(
+                    ids=ids[local],
+                    vectors=info.vector_input(
+                        batch_vectors[batch_start // batch_size].tolist(),
+                        batch_sparse[batch_start // batch_size]
+                    ),
+                    payloads=payloads[local]
+                )
+
+            if pending:
+                result = await upsert_batches(
+                    client,
+                    collection,
+                    end,
+                    build_batch,
+                    batch_size,
+                    parallel,
+                    max_retries,
+                    logger,
+                    batches=pending,
+                    on_batch=mark_done
+                )
+                report.failed.update(result.failed)
+            logger.info(f"Imported {end} rows of {path} into {collection}")
+    except BaseException:
+        next_window.cancel()
+        raise
+
+    report.total = start
+    if total is not None and payload_path and await asyncio.to_thread(next, rows, None) is not None:
+        logger.warning(f"{payload_path} has more rows than the {total} vectors in {path}; extra rows were ignored")
+    state["complete"] = report.complete
+    await asyncio.to_thread(_write_checkpoint, checkpoint_path, state)
+    logger.info(
+        f"Imported {report.points} points into {collection} "
+        f"({report.skipped} batches skipped, {len(report.failed)} failed)"
+    )
+    return report
+
+
+def main():
+    """Command line entry point: import a local file into a collection."""
+    parser = argparse.ArgumentParser(description="Import texts (JSONL/CSV/Parquet) or .npy vectors into a Qdrant collection")
+    parser.add_argument("path", help="File to import")
+    parser.add_argument("collection", help="Collection to import into (created if missing)")
+    parser.add_argument("--payloads", help="JSONL/CSV/Parquet file with one payload row per vector of a .npy file")
+    parser.add_argument("--text-field", default="text", help="Field holding the text to embed")
+    parser.add_argument("--id-field", help="Field holding the point id (ids are derived from row numbers otherwise)")
+    parser.add_argument("--payload-field", help="Field holding the payload object (all other fields otherwise)")
+    parser.add_argument("--batch-size", type=int, help="Points per upsert request (uses UPSERT_BATCH_SIZE if not set)")
+    parser.add_argument("--parallel", type=int, help="Concurrent upsert requests (uses UPSERT_PARALLEL if not set)")
+    parser.add_argument("--restart", action="store_true", help="Start over instead of resuming a previous import")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger = logging.getLogger("qdrant_mcp_import")
+    upsert_settings = get_upsert_settings()
+
+    embed, vector_size, embed_sparse, sparse_params = None, None, None, None
+    if os.path.splitext(args.path)[1].lower() not in VECTOR_FORMATS:
+        from .embedding import EmbeddingModel
+        from .sparse_embedding import SparseEmbeddingModel
+        embedding_model = EmbeddingModel(logger)
+        embed, vector_size = embedding_model.aembed_array, embedding_model.vector_size
+        sparse_model = SparseEmbeddingModel(logger, executor=embedding_model.executor)
+        if sparse_model.enabled:
+            embed_sparse, sparse_params = sparse_model.aembed_documents, sparse_model.vector_params()
+
+    async def run() -> ImportReport:
+        pool = QdrantConnectionPool(logger)
+        try:
+            return await import_file(
+                pool.client,
+                pool.collections,
+                args.collection,
+                args.path,
+                logger,
+                embed=embed,
+                vector_size=vector_size,
+                embed_sparse=embed_sparse,
+                sparse_params=sparse_params,
+                payload_path=args.payloads,
+                text_field=args.text_field,
+                id_field=args.id_field,
+                payload_field=args.payload_field,
+                batch_size=args.batch_size or upsert_settings["batch_size"],
+                parallel=args.parallel or upsert_settings["parallel"],
+                max_retries=upsert_settings["max_retries"],
+                resume=not args.restart
+            )
+        finally:
+            await pool.client.close()
+
+    report = asyncio.run(run())
+    print(json.dumps(report.to_dict(), indent=2))
@@ -0,0 +1,216 @@
+import os
+import logging
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+from dotenv import load_dotenv
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import (
+    DatetimeRange,
+    FieldCondition,
+    Filter,
+    NestedCondition,
+    PayloadSchemaType,
+)
+
+# Fields of the full-text Match* models. Match types are told apart by their
+# fields rather than classes, since older clients lack some of them.
+_TEXT_MATCHES = ("text", "text_any", "phrase")
+
+
+def _value_schema(value: Any) -> Optional[PayloadSchemaType]:
+    # bool is checked first since it is a subclass of int
+    if isinstance(value, bool):
+        return PayloadSchemaType.BOOL
+    if isinstance(value, int):
+        return PayloadSchemaType.INTEGER
+    if isinstance(value, str):
+        return PayloadSchemaType.KEYWORD
+    return None
+
+
+def classify_condition(condition: FieldCondition) -> Optional[Tuple[str, PayloadSchemaType]]:
+    """
+    Return the match type of a field condition and the payload index serving
+    it, or None for conditions no index helps with (e.g. values_count).
+    """
+    match = condition.match
+    if match is not None:
+        if hasattr(match, "value"):
+            schema = _value_schema(match.value)
+            return ("value", schema) if schema else None
+        if hasattr(match, "any") or hasattr(match, "except_"):
+            values = match.any if hasattr(match, "any") else match.except_
+            schema = _value_schema(values[0]) if values else None
+            return ("any" if hasattr(match, "any") else "except", schema) if schema else None
+        for name in _TEXT_MATCHES:
+            if hasattr(match, name):
+                return "text", PayloadSchemaType.TEXT
+        if hasattr(match, "prefix"):
+            return "prefix", PayloadSchemaType.KEYWORD
+        return None
+    if condition.range is not None:
+        if isinstance(condition.range, DatetimeRange):
+            return "datetime_range", PayloadSchemaType.DATETIME
+        return "range", PayloadSchemaType.FLOAT
+    if condition.geo_bounding_box or condition.geo_radius or condition.geo_polygon:
+        return "geo", PayloadSchemaType.GEO
+    return None
+
+
+def _as_list(conditions: Any) -> list:
+    if conditions is None:
+        return []
+    return conditions if isinstance(conditions, list) else [conditions]
+
+
+def filter_conditions(query_filter: Filter, prefix: str = "") -> Iterator[Tuple[str, FieldCondition]]:
+    """
+    Yield (payload key, condition) for every field condition of a filter,
+    including those in nested filters; keys inside nested conditions use
+    Qdrant's "parent[].child" syntax.
+    """
+    conditions = _as_list(query_filter.must) + _as_list(query_filter.should) + _as_list(query_filter.must_not)
+    if query_filter.min_should is not None:
+        conditions += query_filter.min_should.conditions
+    for condition in conditions:
+        if isinstance(condition, FieldCondition):
+            yield prefix + condition.key, condition
+        elif isinstance(condition, NestedCondition):
+            yield from filter_conditions(condition.nested.filter, f"{prefix}{condition.nested.key}[].")
+        elif isinstance(condition, Filter):
+            yield from filter_conditions(condition, prefix)
+
+
+class PayloadIndexAdvisor:
+    """
+    Records which payload fields are filtered on, and how, per collection.
+
+    Every filter the tools run is recorded; once a field has been filtered on
+    `threshold` times, it is recommended for a payload index of the type its
+    conditions need (keyword, integer, float, bool, text, datetime or geo), and
+    created automatically when `auto_create` is enabled. Fields that already
+    have an index are left alone.
+    """
+
+    def __init__(self, client: AsyncQdrantClient, logger: logging.Logger = None):
+        load_dotenv()
+
+        self.client = client
+        self.logger = logger or logging.getLogger(__name__)
+        self.auto_create = os.getenv("PAYLOAD_INDEX_AUTO_CREATE", "False").lower() in ("true", "1", "yes")
+        self.threshold = int(os.getenv("PAYLOAD_INDEX_THRESHOLD", "20"))
+
+        self._lock = threading.Lock()
+        # Collection -> field -> Counter of match types, and of the index types they need
+        self._match_types: Dict[str, Dict[str, Counter]] = {}
+        self._schemas: Dict[str, Dict[str, Counter]] = {}
+        # Collection -> field -> index type, for indexes found or created
+        self._indexes: Dict[str, Dict[str, str]] = {}
+        # Collections whose existing indexes were fetched, and fields already attempted
+        self._fetched: Set[str] = set()
+        self._attempted: Set[Tuple[str, str]] = set()
+        self._created = 0
+        self._failed = 0
+
+    def record(self, collection: str, query_filter: Optional[Filter]) -> Dict[str, PayloadSchemaType]:
+        """
+        Count the fields used by a filter, once per field, and return the
+        fields that crossed the threshold without being indexed yet.
+        """
+        if query_filter is None:
+            return {}
+
+        used: Dict[str, Tuple[str, PayloadSchemaType]] = {}
+        for key, condition in filter_conditions(query_filter):
+            classified = classify_condition(condition)
+            if classified is not None:
+                used.setdefault(key, classified)
+
+        due = {}
+        with self._lock:
+            match_types = self._match_types.setdefault(collection, {})
+            schemas = self._schemas.setdefault(collection, {})
+            indexes = self._indexes.setdefault(collection, {})
+            for key, (match_type, schema) in used.items():
+                match_types.setdefault(key, Counter())[match_type] += 1
+                schemas.setdefault(key, Counter())[schema.value] += 1
+                if sum(schemas[key].values()) >= self.threshold and key not in indexes:
+                    due[key] = PayloadSchemaType(schemas[key].most_common(1)[0][0])
+        return due
+
+    async def observe(self, collection: str, query_filter: Optional[Filter]):
+        """
+        Record a filter and, with auto_create enabled, start building the
+        indexes it made due. Failures are logged, never raised, so searches
+        don't fail because an index could not be created.
+        """
+        due = self.record(collection, query_filter)
+        if not due:
+            return
+
+        try:
+            # Fields indexed outside this server are no longer due
+            await self._fetch_indexes(collection)
+        except Exception as e:
+            self.logger.warning(f"Could not read payload indexes of {collection}: {e}")
+            return
+        if not self.auto_create:
+            return
+
+        for key, schema in due.items():
+            with self._lock:
+                if key in self._indexes[collection] or (collection, key) in self._attempted:
+                    continue
+                self._attempted.add((collection, key))
+            try:
+                # Built in the background by Qdrant; searches keep working meanwhile
+                await self.client.create_payload_index(
+                    collection_name=collection,
+                    field_name=key,
+                    field_schema=schema,
+                    wait=False
+                )
+            except Exception as e:
+                self.logger.warning(f"Could not create {schema.value} index on {collection}.{key}: {e}")
+                with self._lock:
+                    self._failed += 1
+                continue
+            self.logger.info(f"Creating {schema.value} payload index on {collection}.{key}")
+            with self._lock:
+                self._indexes[collection][key] = schema.value
+                self._created += 1
+
+    async def _fetch_indexes(self, collection: str):
+        if collection in self._fetched:
+            return
+        description = await self.client.get_collection(collection)
+        with self._lock:
+            for key, info in (description.payload_schema or {}).items():
+                data_type = info.data_type
+                self._indexes.setdefault(collection, {})[key] = getattr(data_type, "value", str(data_type))
+            self._fetched.add(collection)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return per-field filter usage, recommended and existing indexes."""
+        with self._lock:
+            collections = {}
+            for collection, schemas in self._schemas.items():
+                indexes = self._indexes.get(collection, {})
+                collections[collection] = {
+                    key: {
+                        "uses": sum(counts.values()),
+                        "match_types": dict(self._match_types[collection][key]),
+                        "suggested_index": counts.most_common(1)[0][0],
+                        "index": indexes.get(key),
+                        "recommended": sum(counts.values()) >= self.threshold and key not in indexes,
+                    }
+                    for key, counts in schemas.items()
+                }
+            return {
+                "auto_create": self.auto_create,
+                "threshold": self.threshold,
+                "created": self._created,
+                "failed": self._failed,
+                "collections": collections,
+            }
@@ -0,0 +1,174 @@
+import os
+import asyncio
+import logging
+import numpy as np
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from dotenv import load_dotenv
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Batch, PointStruct, SparseVector
+from .collection_cache import CollectionInfo
+
+# Called after each batch with (batch number, texts done, total texts)
+ProgressCallback = Callable[[int, int, int], Awaitable[None]]
+
+# Builds the points (or a columnar batch) for the half-open range [start, end) of the input
+BatchBuilder = Callable[[int, int], Union[Batch, List[PointStruct]]]
+
+# Called with the index of each batch once it is upserted
+BatchCallback = Callable[[int], Awaitable[None]]
+
+
+async def stream_texts(
+    client: AsyncQdrantClient,
+    collection: str,
+    info: CollectionInfo,
+    texts: List[str],
+    payloads: List[Dict[str, Any]],
+    point_ids: List[Any],
+    embed: Callable[[List[str]], Awaitable[np.ndarray]],
+    chunk_size: int,
+    logger: logging.Logger,
+    on_progress: Optional[ProgressCallback] = None,
+    embed_sparse: Optional[Callable[[List[str]], Awaitable[List[SparseVector]]]] = None
+) -> int:
+    """
+    Embed and upsert texts chunk by chunk, overlapping the embedding of the
+    next chunk with the upsert of the current one. With `embed_sparse`, each
+    chunk's sparse vectors are computed alongside the dense ones and stored
+    as the collection's sparse vector.
+
+    Each chunk's embeddings stay one float32 matrix until they are written
+    into a columnar upsert batch, and at most two chunks are alive at any
+    time, so memory stays bounded regardless of the number of texts.
+    Returns the number of batches.
+    """
+    starts = list(range(0, len(texts), chunk_size))
+    if not starts:
+        return 0
+
+    async def embed_chunk(chunk: List[str]) -> Tuple[np.ndarray, Optional[List[SparseVector]]]:
+        if embed_sparse is None:
+            return await embed(chunk), None
+        dense, sparse = await asyncio.gather(embed(chunk), embed_sparse(chunk))
+        return dense, sparse
+
+    next_vectors = asyncio.ensure_future(embed_chunk(texts[0:chunk_size]))
+    try:
+        for batch, start in enumerate(starts, 1):
+            vectors, sparse_vectors = await next_vectors
+            end = min(start + chunk_size, len(texts))
+            if end < len(texts):
+                next_vectors = asyncio.ensure_future(embed_chunk(texts[end:end + chunk_size]))
+
+            batch_points = Batch(
+                ids=point_ids[start:end],
+                vectors=info.vector_input(vectors.tolist(), sparse_vectors),
+                payloads=payloads[start:end]
+            )
+            del vectors, sparse_vectors
+            await client.upsert(collection_name=collection, points=batch_points)
+
+            logger.info(f"Stored batch {batch}/{len(starts)} ({end}/{len(texts)} texts) in {collection}")
+            if on_progress is not None:
+                await on_progress(batch, end, len(texts))
+    except BaseException:
+        next_vectors.cancel()
+        raise
+
+    return len(starts)
+
+
+class UpsertReport:
+    """Outcome of a batched upsert, with the batches that still failed after retries."""
+
+    def __init__(self, total: int, batch_size: int):
+        self.total = total
+        self.batch_size = batch_size
+        self.batches = (total + batch_size - 1) // batch_size
+        self.retried = 0
+        # Batch index -> last error message
+        self.failed: Dict[int, str] = {}
+
+    @property
+    def succeeded(self) -> int:
+        return self.batches - len(self.failed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "points": self.total,
+            "batches": self.batches,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": [
+                {
+                    "batch": index,
+                    "start": index * self.batch_size,
+                    "end": min((index + 1) * self.batch_size, self.total),
+                    "error": error
+                }
+                for index, error in sorted(self.failed.items())
+            ],
+        }
+
+
+def get_upsert_settings() -> Dict[str, int]:
+    """Read the default batch size, parallelism and retry count for batched upserts."""
+    load_dotenv()
+    return {
+        "batch_size": int(os.getenv("UPSERT_BATCH_SIZE", "256")),
+        "parallel": int(os.getenv("UPSERT_PARALLEL", "4")),
+        "max_retries": int(os.getenv("UPSERT_MAX_RETRIES", "2")),
+    }
+
+
+async def upsert_batches(
+    client: AsyncQdrantClient,
+    collection: str,
+    total: int,
+    build_batch: BatchBuilder,
+    batch_size: int,
+    parallel: int,
+    max_retries: int,
+    logger: logging.Logger,
+    batches: Optional[List[int]] = None,
+    on_batch: Optional[BatchCallback] = None
+) -> UpsertReport:
+    """
+    Upsert `total` points in batches of `batch_size`, with up to `parallel`
+    requests in flight.
+
+    Failed batches are retried (only those batches) up to `max_retries` times
+    with exponential backoff. Pass `batches` to upload only those batch indexes,
+    and `on_batch` to be told as soon as each batch is stored.
+    """
+    report = UpsertReport(total, batch_size)
+    semaphore = asyncio.Semaphore(max(parallel, 1))
+
+    async def upload(index: int) -> Optional[str]:
+        async with semaphore:
+            start = index * batch_size
+            end = min(start + batch_size, total)
+            try:
+                await client.upsert(collection_name=collection, points=build_batch(start, end))
+            except Exception as e:
+                logger.warning(f"Batch {index} ({start}-{end}) failed to upsert into {collection}: {e}")
+                return str(e)
+            if on_batch is not None:
+                await on_batch(index)
+            return None
+
+    pending = list(range(report.batches)) if batches is None else list(batches)
+    report.batches = len(pending)
+    for attempt in range(max_retries + 1):
+        if attempt > 0:
+            report.retried += len(pending)
+            await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+            logger.info(f"Retrying {len(pending)} failed batches (attempt {attempt + 1})")
+
+        errors = await asyncio.gather(*(upload(index) for index in pending))
+        report.failed = {index: error for index, error in zip(pending, errors) if error is not None}
+        pending = list(report.failed)
+        if not pending:
+            break
+
+    return report
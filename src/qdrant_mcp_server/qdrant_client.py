@@ -1,18 +1,67 @@
 import logging
 import os
+import threading
+from typing import Any, Dict, Optional
+import httpx
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient
-from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client import AsyncQdrantClient
+from .collection_cache import CollectionCache
+from .filter_cache import FilterCache
+from .index_advisor import PayloadIndexAdvisor
+from .result_cache import CollectionVersions, ResultCache, create_count_cache
+from .serialization import ResponseSerializer
 
-class QdrantClientWrapper:
-    def __init__(self, logger: logging.Logger):
+
+class _TrackingTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that records whether each request reused a pooled connection."""
+
+    def __init__(self, on_request, **kwargs):
+        super().__init__(**kwargs)
+        self._on_request = on_request
+
+    def _has_available_connection(self) -> Optional[bool]:
+        try:
+            return any(conn.is_available() for conn in self._pool.connections)
+        except AttributeError:
+            return None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._on_request(self._has_available_connection())
+        return await super().handle_async_request(request)
+
+
+class QdrantConnectionPool:
+    """
+    Owns the single async Qdrant client (and its HTTP connection pool) shared by all tool classes.
+    """
+
+    def __init__(self, logger: logging.Logger, **overrides: Any):
         self.logger = logger
+        self.config = self._get_qdrant_config()
+        self.config.update(overrides)
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._unknown = 0
+        self._consumers = 0
+        self._transport: Optional[_TrackingTransport] = None
+
         self.client = self._create_qdrant_client()
-        # Get default collection name from environment
-        self.default_collection = os.getenv("DEFAULT_COLLECTION_NAME", "default_collection")
-        self.logger.info(f"Using default collection: {self.default_collection}")
 
-    def _get_qdrant_config(self):
+        # Write counters and cached search results for this Qdrant backend,
+        # shared by every tool so writes through any tool invalidate reads
+        self.versions = CollectionVersions()
+        self.result_cache = ResultCache(self.versions, logger)
+        self.count_cache = create_count_cache(self.versions, logger)
+        # Filter usage per payload field, and the indexes it calls for
+        self.index_advisor = PayloadIndexAdvisor(self.client, logger)
+        # Parsed filter_json arguments, shared so repeated filters are validated once
+        self.filter_cache = FilterCache(logger)
+        # Collection existence and vector layout, so writes need a single round-trip
+        self.collections = CollectionCache(self.client, logger)
+
+    def _get_qdrant_config(self) -> Dict[str, Any]:
         """Get Qdrant configuration from environment variables."""
         # Load environment variables from .env file
         load_dotenv()
@@ -20,19 +69,46 @@ class QdrantClientWrapper:
             "host": os.getenv("QDRANT_HOST", "localhost"),
             "port": os.getenv("QDRANT_PORT", 6333),
             "api_key": os.getenv("QDRANT_API_KEY", ""),
-            "verify_ssl": os.getenv("QDRANT_VERIFY_SSL", "True").lower() in ("true", "1", "yes")
+            "verify_ssl": os.getenv("QDRANT_VERIFY_SSL", "True").lower() in ("true", "1", "yes"),
+            # Use ":memory:" or a local path to run Qdrant in local mode instead of connecting to a server
+            "location": os.getenv("QDRANT_LOCATION", ""),
+            "pool_size": int(os.getenv("QDRANT_POOL_SIZE", "10")),
+            "keepalive_expiry": float(os.getenv("QDRANT_KEEPALIVE_EXPIRY", "30")),
         }
-        
+
         return config
 
-    def _create_qdrant_client(self) -> QdrantClient:
-        """Create and return a Qdrant client using configuration from environment."""
-        config = self._get_qdrant_config()
-        
+    def _record_request(self, reused: Optional[bool]):
+        with self._lock:
+            if reused is None:
+                self._unknown += 1
+            elif reused:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _create_transport(self, verify: bool) -> httpx.AsyncHTTPTransport:
+        """Create the pooled HTTP transport used for every REST call to Qdrant."""
+        limits = httpx.Limits(
+            max_connections=self.config["pool_size"],
+            max_keepalive_connections=self.config["pool_size"],
+            keepalive_expiry=self.config["keepalive_expiry"]
+        )
+        self._transport = _TrackingTransport(self._record_request, verify=verify, limits=limits)
+        return self._transport
+
+    def _create_qdrant_client(self) -> AsyncQdrantClient:
+        """Create and return an async Qdrant client using configuration from environment."""
+        config = self.config
+
+        if config["location"]:
+            self.logger.info(f"Using local Qdrant storage at {config['location']}")
+            return AsyncQdrantClient(location=config["location"])
+
         client_kwargs = {
             "host": config["host"],
         }
-        
+
         # Add port if specified (could be empty for cloud services)
         use_https = False
         if config["port"] and str(config["port"]).strip():
@@ -44,7 +120,7 @@ class QdrantClientWrapper:
                     use_https = True
             except (ValueError, TypeError):
                 self.logger.warning(f"Invalid port value: {config['port']}, ignoring")
-        
+
         # Determine if we should use HTTPS
         # 1. If host starts with https://, use HTTPS
         if client_kwargs["host"].startswith("https://"):
@@ -55,27 +131,93 @@ class QdrantClientWrapper:
             use_https = False
             # Remove the protocol from the host
             client_kwargs["host"] = client_kwargs["host"].replace("http://", "")
-        
+
         # Set https parameter
         client_kwargs["https"] = use_https
-        
+
         # Set verify parameter for SSL verification
         client_kwargs["verify"] = config["verify_ssl"]
-        
+
+        # Route every REST call through one keep-alive connection pool
+        client_kwargs["transport"] = self._create_transport(config["verify_ssl"])
+
         # Add API key if provided
         if config["api_key"]:
             client_kwargs["api_key"] = config["api_key"]
-            
+
         try:
-            self.logger.info(f"Connecting to Qdrant at {config['host']} (HTTPS: {use_https}, Verify SSL: {config['verify_ssl']})")
-            client = QdrantClient(**client_kwargs)
-            # Test connection
-            client.get_collections()
-            self.logger.info("Successfully connected to Qdrant")
-            return client
-        except UnexpectedResponse as e:
-            self.logger.error(f"Failed to connect to Qdrant: {e}")
-            raise e
+            self.logger.info(
+                f"Connecting to Qdrant at {config['host']} (HTTPS: {use_https}, Verify SSL: {config['verify_ssl']}, "
+                f"pool size: {config['pool_size']}, keep-alive: {config['keepalive_expiry']}s)"
+            )
+            # Connections are opened lazily by the first request on the event loop
+            return AsyncQdrantClient(**client_kwargs)
         except Exception as e:
             self.logger.error(f"Error creating Qdrant client: {e}")
-            raise e 
\ No newline at end of file
+            raise e
+
+    async def check_connection(self):
+        """Make one request to Qdrant, so a wrong host or API key fails at startup rather than on the first tool call."""
+        try:
+            response = await self.client.get_collections()
+        except Exception as e:
+            self.logger.error(f"Failed to connect to Qdrant: {e}")
+            raise
+        self.logger.info(f"Successfully connected to Qdrant ({len(response.collections)} collections)")
+
+    def attach(self) -> AsyncQdrantClient:
+        """Register a consumer of the shared client and return it."""
+        with self._lock:
+            self._consumers += 1
+        return self.client
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return connection reuse statistics for sizing the pool."""
+        with self._lock:
+            requests = self._hits + self._misses
+            stats = {
+                "pool_size": self.config["pool_size"],
+                "keepalive_expiry": self.config["keepalive_expiry"],
+                "consumers": self._consumers,
+                "hits": self._hits,
+                "misses": self._misses,
+                "untracked": self._unknown,
+                "hit_rate": self._hits / requests if requests else 0.0,
+            }
+
+        connections = getattr(getattr(self._transport, "_pool", None), "connections", None)
+        if connections is not None:
+            stats["open_connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for conn in connections if conn.is_idle())
+        return stats
+
+
+_shared_pool: Optional[QdrantConnectionPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_connection_pool(logger: logging.Logger) -> QdrantConnectionPool:
+    """Return the process-wide connection pool, creating it on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = QdrantConnectionPool(logger)
+        return _shared_pool
+
+
+class QdrantClientWrapper:
+    def __init__(self, logger: logging.Logger, pool: Optional[QdrantConnectionPool] = None):
+        self.logger = logger
+        self.pool = pool or get_connection_pool(logger)
+        self.client = self.pool.attach()
+        self.versions = self.pool.versions
+        self.result_cache = self.pool.result_cache
+        self.count_cache = self.pool.count_cache
+        self.index_advisor = self.pool.index_advisor
+        self.filter_cache = self.pool.filter_cache
+        self.collections = self.pool.collections
+        # Renders tool results as compact, size-capped JSON
+        self.serializer = ResponseSerializer(logger)
+        # Get default collection name from environment
+        self.default_collection = os.getenv("DEFAULT_COLLECTION_NAME", "default_collection")
+        self.logger.info(f"Using default collection: {self.default_collection}")
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+
+class CollectionVersions:
+    """
+    Per-collection write counters.
+
+    Every write path bumps the collection's version once the write finishes
+    (or fails, since it may have been partially applied), so cached reads
+    taken at an older version are known to be stale.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection: str) -> int:
+        with self._lock:
+            return self._versions.get(collection, 0)
+
+    def bump(self, collection: str) -> int:
+        with self._lock:
+            version = self._versions.get(collection, 0) + 1
+            self._versions[collection] = version
+            return version
+
+
+class ResultCache:
+    """
+    LRU cache of tool responses keyed by a hash of the tool's inputs.
+
+    Each entry records the collection version it was computed at and is a
+    miss once that collection is written to, once it is older than `ttl`
+    seconds, or after it is evicted to stay within `max_bytes`. Disabled
+    when `max_bytes` is 0.
+    """
+
+    def __init__(
+        self,
+        versions: CollectionVersions,
+        logger: logging.Logger = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None
+    ):
+        load_dotenv()
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.versions = versions
+        self.ttl = ttl if ttl is not None else float(os.getenv("RESULT_CACHE_TTL", "60"))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("RESULT_CACHE_MAX_BYTES", "0"))
+
+        # Key -> (collection version, expires at, response, size in bytes)
+        self._entries: "OrderedDict[str, Tuple[int, float, str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl > 0
+
+    @staticmethod
+    def key(tool: str, collection: str, **inputs: Any) -> str:
+        """Return a stable hash of a tool call's inputs."""
+        canonical = json.dumps([tool, collection, inputs], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _drop(self, key: str):
+        self._bytes -= self._entries.pop(key)[3]
+
+    def get(self, collection: str, key: str) -> Optional[str]:
+        """Return the cached response, or None if it is missing, expired or stale."""
+        if not self.enabled:
+            return None
+
+        version = self.versions.get(collection)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry[0] != version or entry[1] < time.monotonic():
+                self._drop(key)
+                self._misses += 1
+                self._stale += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[2]
+
+    def put(self, collection: str, key: str, version: int, response: str):
+        """
+        Store a response computed at `version`, which must be read with
+        `versions.get` before the query ran so concurrent writes aren't missed.
+        """
+        if not self.enabled:
+            return
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if version != self.versions.get(collection):
+            # A write finished while the query ran
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (version, time.monotonic() + self.ttl, response, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit, miss and eviction counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale": self._stale,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+def create_count_cache(versions: CollectionVersions, logger: logging.Logger = None) -> ResultCache:
+    """
+    Create the cache for count_points results.
+
+    Counts are tiny and often polled, so this cache is on by default with a
+    short TTL, which bounds how stale counts can get after writes made by
+    other clients. Writes through this server invalidate it immediately.
+    """
+    load_dotenv()
+    return ResultCache(
+        versions,
+        logger,
+        ttl=float(os.getenv("COUNT_CACHE_TTL", "1")),
+        max_bytes=int(os.getenv("COUNT_CACHE_MAX_BYTES", str(64 * 1024)))
+    )
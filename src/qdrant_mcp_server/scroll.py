@@ -0,0 +1,77 @@
+import json
+import base64
+import hashlib
+import binascii
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Filter, Record
+
+
+def filter_digest(filter_json: Optional[str]) -> str:
+    """Return a short hash identifying a filter, independent of key order and whitespace."""
+    canonical = json.dumps(json.loads(filter_json), sort_keys=True) if filter_json else ""
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(collection: str, filter_json: Optional[str], offset: Any) -> Optional[str]:
+    """
+    Return an opaque continuation token for scrolling from `offset`, or None
+    when there is nothing left to read.
+    """
+    if offset is None:
+        return None
+    state = json.dumps([collection, filter_digest(filter_json), offset], separators=(",", ":"))
+    return base64.urlsafe_b64encode(state.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, collection: str, filter_json: Optional[str]) -> Any:
+    """
+    Return the scroll offset stored in a continuation token.
+
+    Raises ValueError if the token is malformed or was issued for another
+    collection or filter.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_collection, digest, offset = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if cursor_collection != collection or digest != filter_digest(filter_json):
+        raise ValueError("Cursor was issued for a different collection or filter")
+    return offset
+
+
+async def scroll_pages(
+    client: AsyncQdrantClient,
+    collection: str,
+    scroll_filter: Optional[Filter] = None,
+    page_size: int = 256,
+    offset: Any = None,
+    max_points: Optional[int] = None,
+    with_payload: Any = True,
+    with_vectors: Any = False
+) -> AsyncIterator[Tuple[List[Record], Any]]:
+    """
+    Walk the points matching a filter page by page, yielding (points, next offset).
+
+    Only one page is held at a time, so memory stays bounded however many
+    points match. The next offset is None after the last page; resuming a
+    scroll from it (or from the id of any point not yet processed) continues
+    where this one stopped.
+    """
+    remaining = max_points
+    while remaining is None or remaining > 0:
+        limit = page_size if remaining is None else min(page_size, remaining)
+        points, offset = await client.scroll(
+            collection_name=collection,
+            scroll_filter=scroll_filter,
+            limit=limit,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=with_vectors
+        )
+        if remaining is not None:
+            remaining -= len(points)
+        yield points, offset
+        if offset is None:
+            break
@@ -0,0 +1,134 @@
+import os
+import json
+from typing import Any, Dict, List, Optional, Union
+from dotenv import load_dotenv
+from qdrant_client.http.models import (
+    PayloadSelectorExclude,
+    PayloadSelectorInclude,
+    QuantizationSearchParams,
+    SearchParams,
+)
+
+# Search options accepted by the search tools and the configured defaults,
+# mapped to the environment variable holding their server-wide default
+SEARCH_OPTIONS = {
+    "hnsw_ef": "SEARCH_HNSW_EF",
+    "exact": "SEARCH_EXACT",
+    "indexed_only": "SEARCH_INDEXED_ONLY",
+    "ignore_quantization": "SEARCH_IGNORE_QUANTIZATION",
+    "rescore": "SEARCH_RESCORE",
+    "oversampling": "SEARCH_OVERSAMPLING",
+}
+
+# Key of the server-wide defaults in the mapping returned by get_search_defaults
+ALL_COLLECTIONS = "*"
+
+
+def _parse_option(name: str, value: str) -> Any:
+    if name == "hnsw_ef":
+        return int(value)
+    if name == "oversampling":
+        return float(value)
+    return value.lower() in ("true", "1", "yes")
+
+
+def _check_options(options: Dict[str, Any], source: str):
+    unknown = set(options) - set(SEARCH_OPTIONS)
+    if unknown:
+        raise ValueError(
+            f"Unknown search options in {source}: {', '.join(sorted(unknown))} "
+            f"(expected {', '.join(SEARCH_OPTIONS)})"
+        )
+    # Validates value types
+    build_search_params(options)
+
+
+def get_search_defaults() -> Dict[str, Dict[str, Any]]:
+    """
+    Read default search options, keyed by collection name.
+
+    Server-wide defaults come from the SEARCH_* variables and are stored under
+    "*"; SEARCH_COLLECTION_PARAMS holds a JSON object of per-collection
+    overrides, e.g. {"docs": {"hnsw_ef": 128}, "logs": {"exact": true}}.
+    """
+    load_dotenv()
+    defaults = {ALL_COLLECTIONS: {
+        name: _parse_option(name, os.environ[variable])
+        for name, variable in SEARCH_OPTIONS.items()
+        if os.getenv(variable)
+    }}
+
+    per_collection = json.loads(os.getenv("SEARCH_COLLECTION_PARAMS") or "{}")
+    if not isinstance(per_collection, dict):
+        raise ValueError("SEARCH_COLLECTION_PARAMS must be a JSON object keyed by collection name")
+    for collection, options in per_collection.items():
+        defaults.setdefault(collection, {}).update(options)
+
+    for collection, options in defaults.items():
+        _check_options(options, f"search defaults for {collection}")
+    return defaults
+
+
+def build_search_params(options: Dict[str, Any]) -> Optional[SearchParams]:
+    """
+    Build search parameters from search options.
+
+    Returns None when no option is set, so Qdrant applies its own defaults.
+    """
+    options = {name: value for name, value in options.items() if value is not None}
+    if not options:
+        return None
+
+    quantization = None
+    if any(name in options for name in ("ignore_quantization", "rescore", "oversampling")):
+        quantization = QuantizationSearchParams(
+            ignore=options.get("ignore_quantization"),
+            rescore=options.get("rescore"),
+            oversampling=options.get("oversampling")
+        )
+    return SearchParams(
+        hnsw_ef=options.get("hnsw_ef"),
+        exact=options.get("exact"),
+        indexed_only=options.get("indexed_only"),
+        quantization=quantization
+    )
+
+
+def resolve_search_params(
+    defaults: Dict[str, Dict[str, Any]],
+    collection: str,
+    **options: Any
+) -> Optional[SearchParams]:
+    """
+    Build search parameters for a collection.
+
+    Options passed explicitly (not None) override the collection's defaults,
+    which override the server-wide defaults.
+    """
+    merged = dict(defaults.get(ALL_COLLECTIONS, {}))
+    merged.update(defaults.get(collection, {}))
+    merged.update({name: value for name, value in options.items() if value is not None})
+    return build_search_params(merged)
+
+
+def build_payload_selector(
+    with_payload: bool = True,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None
+) -> Union[bool, PayloadSelectorInclude, PayloadSelectorExclude]:
+    """
+    Build the payload selector sent to Qdrant, so unrequested payload fields
+    never leave the database.
+
+    Fields may use dotted paths into nested objects, e.g. "meta.author".
+    Raises ValueError if both include and exclude are given.
+    """
+    if not with_payload:
+        return False
+    if include is not None and exclude:
+        raise ValueError("Use either payload_include or payload_exclude, not both")
+    if include is not None:
+        return PayloadSelectorInclude(include=include)
+    if exclude:
+        return PayloadSelectorExclude(exclude=exclude)
+    return True
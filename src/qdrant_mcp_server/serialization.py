@@ -0,0 +1,120 @@
+import os
+import json
+import logging
+from typing import Any, Dict, List, Optional
+import numpy as np
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from qdrant_client.http.models import Record, ScoredPoint, SparseVector
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up, installed with the "fast" extra
+    orjson = None
+
+
+class ResponseSerializer:
+    """
+    Renders tool results as compact JSON.
+
+    Points are reduced to their id, score, payload and vector; vectors can be
+    dropped or rounded to save bytes and tokens. Responses larger than
+    `max_bytes` are truncated to the leading items of their result list,
+    with metadata telling the caller how many items were left out. orjson is
+    used when it is installed, otherwise the standard library encoder.
+    """
+
+    def __init__(self, logger: logging.Logger = None):
+        load_dotenv()
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.omit_vectors = os.getenv("RESPONSE_OMIT_VECTORS", "False").lower() in ("true", "1", "yes")
+        precision = os.getenv("RESPONSE_VECTOR_PRECISION", "")
+        self.vector_precision: Optional[int] = int(precision) if precision else None
+        self.max_bytes = int(os.getenv("RESPONSE_MAX_BYTES", str(1024 * 1024)))
+
+    @property
+    def backend(self) -> str:
+        return "orjson" if orjson is not None else "json"
+
+    def encode(self, data: Any) -> bytes:
+        """Encode JSON-ready data as compact UTF-8 JSON."""
+        if orjson is not None:
+            return orjson.dumps(data, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+    def _round(self, vector: Any) -> Any:
+        if isinstance(vector, dict):
+            return {name: self._round(value) for name, value in vector.items()}
+        if isinstance(vector, SparseVector):
+            return {"indices": vector.indices, "values": self._round(vector.values)}
+        return np.round(np.asarray(vector, dtype=np.float64), self.vector_precision).tolist()
+
+    def format_point(self, point: Any) -> Dict[str, Any]:
+        """Return a JSON-ready dict for a search hit or retrieved record."""
+        result: Dict[str, Any] = {"id": point.id}
+        if isinstance(point, ScoredPoint):
+            result["score"] = point.score
+        if point.payload is not None:
+            result["payload"] = point.payload
+        if point.vector is not None and not self.omit_vectors:
+            result["vector"] = self._round(point.vector) if self.vector_precision is not None else point.vector
+        return result
+
+    def to_jsonable(self, data: Any) -> Any:
+        """Convert points, pydantic models and containers into JSON-ready values."""
+        if isinstance(data, (ScoredPoint, Record)):
+            return self.format_point(data)
+        if isinstance(data, BaseModel):
+            return data.model_dump(mode="json", exclude_none=True)
+        if isinstance(data, dict):
+            return {key: self.to_jsonable(value) for key, value in data.items()}
+        if isinstance(data, (list, tuple)):
+            return [self.to_jsonable(item) for item in data]
+        if isinstance(data, np.ndarray):
+            return data.tolist()
+        return data
+
+    def _fitting_items(self, items: List[Any], budget: int) -> int:
+        """Return how many leading items fit into `budget` bytes."""
+        used = 0
+        for count, item in enumerate(items):
+            # Each item is followed by a separator
+            used += len(self.encode(item)) + 1
+            if used > budget:
+                return count
+        return len(items)
+
+    def serialize(self, data: Any) -> str:
+        """
+        Serialize a tool result to compact JSON.
+
+        When a list result exceeds the size cap, it is cut to the items that
+        fit and wrapped as {"results": [...], "truncated", "returned", "total"}.
+        """
+        data = self.to_jsonable(data)
+        encoded = self.encode(data)
+        if self.max_bytes <= 0 or len(encoded) <= self.max_bytes:
+            return encoded.decode("utf-8")
+
+        if not isinstance(data, list):
+            self.logger.warning(f"Response of {len(encoded)} bytes exceeds the cap but has no list to truncate")
+            return encoded.decode("utf-8")
+
+        wrapper = {"results": [], "truncated": True, "returned": 0, "total": len(data)}
+        # Room left for the items once the rest of the response is accounted for
+        budget = self.max_bytes - len(self.encode(wrapper)) - len(str(len(data)))
+        count = self._fitting_items(data, budget)
+        wrapper.update({"results": data[:count], "returned": count})
+
+        self.logger.info(f"Truncated response from {len(data)} to {count} items ({len(encoded)} bytes)")
+        return self.encode(wrapper).decode("utf-8")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the active serialization settings."""
+        return {
+            "backend": self.backend,
+            "omit_vectors": self.omit_vectors,
+            "vector_precision": self.vector_precision,
+            "max_bytes": self.max_bytes,
+        }
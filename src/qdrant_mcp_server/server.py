@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
+import time
 import logging
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
 from .tools.vector import VectorTools
 from .tools.point import PointTools
 from .tools.text import TextTools
+from .tools.stats import StatsTools
+from .tools.transfer import TransferTools
+from .qdrant_client import get_connection_pool
 
 class QdrantMCPServer:
     def __init__(self):
+        start = time.perf_counter()
         self.name = "qdrant_mcp_server"
-        self.mcp = FastMCP(self.name)
+        self.mcp = FastMCP(self.name, lifespan=self._lifespan)
         
         # Configure logging
         logging.basicConfig(
@@ -19,18 +25,45 @@ class QdrantMCPServer:
         
         # Initialize tools
         self._register_tools()
+        
+        self.startup_time = time.perf_counter() - start
+        self.stats_tools.startup_time = self.startup_time
+        self.logger.info(f"Server initialized in {self.startup_time * 1000:.0f} ms")
 
     def _register_tools(self):
         """Register all MCP tools."""
+        # All tool classes share one Qdrant client and connection pool
+        self.pool = get_connection_pool(self.logger)
+        
         # Initialize tool classes
-        vector_tools = VectorTools(self.logger)
-        point_tools = PointTools(self.logger)
-        text_tools = TextTools(self.logger)
+        vector_tools = VectorTools(self.logger, pool=self.pool)
+        point_tools = PointTools(self.logger, pool=self.pool)
+        text_tools = TextTools(self.logger, pool=self.pool)
+        transfer_tools = TransferTools(
+            self.logger,
+            pool=self.pool,
+            embedding_model=text_tools.embedding_model,
+            sparse_model=text_tools.sparse_model
+        )
+        self.stats_tools = StatsTools(
+            self.logger,
+            pool=self.pool,
+            embedding_model=text_tools.embedding_model,
+            sparse_model=text_tools.sparse_model
+        )
         
         # Register tools from each module
         vector_tools.register_tools(self.mcp)
         point_tools.register_tools(self.mcp)
         text_tools.register_tools(self.mcp)
+        transfer_tools.register_tools(self.mcp)
+        self.stats_tools.register_tools(self.mcp)
+
+    @asynccontextmanager
+    async def _lifespan(self, server: FastMCP):
+        """Check the Qdrant connection once the event loop is running, before serving tools."""
+        await self.pool.check_connection()
+        yield
 
     def run(self):
         """Run the MCP server."""
@@ -0,0 +1,132 @@
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from qdrant_client.http.models import Modifier, SparseVector, SparseVectorParams
+from .embedding_executor import EmbeddingExecutor
+
+# Sparse models owned by each worker when embeddings run in a process pool, by name
+_worker_models: Dict[str, Any] = {}
+
+
+def _to_vector(embedding: Any) -> SparseVector:
+    return SparseVector(indices=embedding.indices.tolist(), values=embedding.values.tolist())
+
+
+def _embed_with(model: Any, texts: List[str], query: bool) -> List[SparseVector]:
+    embeddings = model.query_embed(texts) if query else model.embed(texts)
+    return [_to_vector(embedding) for embedding in embeddings]
+
+
+def _worker_embed_sparse(model_name: str, texts: List[str], query: bool) -> List[SparseVector]:
+    """Embed texts with the worker process's sparse model, loading it on first use."""
+    model = _worker_models.get(model_name)
+    if model is None:
+        from fastembed import SparseTextEmbedding
+        model = _worker_models[model_name] = SparseTextEmbedding(model_name=model_name)
+    return _embed_with(model, texts, query)
+
+
+class SparseEmbeddingModel:
+    """
+    Optional fastembed sparse model (e.g. Qdrant/bm25 or a SPLADE model) whose
+    vectors are stored next to the dense ones for hybrid search.
+
+    Disabled unless SPARSE_EMBEDDING_MODEL is set. Like the dense model, it is
+    loaded on first use. Inference runs in the dense model's embedding
+    executor, so both models share its bounded queue, workers and statistics.
+    """
+
+    def __init__(self, logger: logging.Logger = None, executor: Optional[EmbeddingExecutor] = None):
+        load_dotenv()
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.model_name = os.getenv("SPARSE_EMBEDDING_MODEL", "")
+        if self.model_name:
+            self.logger.info(f"Using sparse embedding model: {self.model_name} (loaded on first use)")
+        if executor is None:
+            from .embedding import EmbeddingModel
+            executor = EmbeddingModel(self.logger).executor
+        self.executor = executor
+        self.chunk_size = int(os.getenv("EMBEDDING_CHUNK_SIZE", "64"))
+
+        self._model = None
+        self._load_lock = threading.Lock()
+        self.load_time: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.model_name)
+
+    @property
+    def model(self):
+        """The fastembed sparse model, loaded on first access."""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        self.logger.info(f"Loading sparse embedding model: {self.model_name}")
+        start = time.perf_counter()
+        try:
+            from fastembed import SparseTextEmbedding
+            model = SparseTextEmbedding(model_name=self.model_name)
+        except Exception as e:
+            self.logger.error(f"Error loading sparse embedding model: {e}")
+            raise
+        self.load_time = time.perf_counter() - start
+        self.logger.info(f"Sparse model loaded successfully in {self.load_time * 1000:.0f} ms")
+        return model
+
+    @property
+    def requires_idf(self) -> bool:
+        """Whether the model's weights must be combined with collection-wide IDF (BM25 and similar)."""
+        from fastembed import SparseTextEmbedding
+        for description in SparseTextEmbedding.list_supported_models():
+            if description["model"].lower() == self.model_name.lower():
+                return bool(description.get("requires_idf"))
+        return False
+
+    def vector_params(self) -> SparseVectorParams:
+        """Sparse vector configuration for collections created with this model."""
+        return SparseVectorParams(modifier=Modifier.IDF if self.requires_idf else None)
+
+    def _embed(self, texts: List[str], query: bool) -> List[SparseVector]:
+        # Runs in the worker, which also loads the model on first use
+        return _embed_with(self.model, texts, query)
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        """Embed texts to be stored."""
+        return self._embed(texts, query=False)
+
+    def embed_query(self, query: str) -> SparseVector:
+        """Embed a search query; for BM25 this weighs each query term once."""
+        return self._embed([query], query=True)[0]
+
+    async def _embed_in_executor(self, texts: List[str], query: bool) -> List[SparseVector]:
+        if self.executor.kind == "process":
+            return await self.executor.run(_worker_embed_sparse, self.model_name, texts, query)
+        return await self.executor.run(self._embed, texts, query)
+
+    async def aembed_documents(self, texts: List[str]) -> List[SparseVector]:
+        """Embed texts to be stored in the embedding executor, in chunks so large ingests don't starve queries."""
+        vectors: List[SparseVector] = []
+        for start in range(0, len(texts), self.chunk_size):
+            vectors.extend(await self._embed_in_executor(texts[start:start + self.chunk_size], query=False))
+        return vectors
+
+    async def aembed_query(self, query: str) -> SparseVector:
+        """Embed a search query in the embedding executor."""
+        return (await self._embed_in_executor([query], query=True))[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the sparse model and whether it is loaded."""
+        return {
+            "model": self.model_name or None,
+            "model_loaded": self._model is not None,
+            "model_load_ms": self.load_time * 1000 if self.load_time is not None else None,
+        }
@@ -2,5 +2,7 @@
 from .vector import VectorTools
 from .point import PointTools
 from .text import TextTools
+from .stats import StatsTools
+from .transfer import TransferTools
 
-__all__ = ["VectorTools", "PointTools", "TextTools"] 
\ No newline at end of file
+__all__ = ["VectorTools", "PointTools", "TextTools", "StatsTools", "TransferTools"] 
\ No newline at end of file
@@ -2,6 +2,8 @@ import logging
 import json
 from typing import Dict, Any, List, Optional
 from ..qdrant_client import QdrantClientWrapper
+from ..search_params import build_payload_selector
+from ..scroll import filter_digest
 from mcp.types import TextContent
 
 class PointTools(QdrantClientWrapper):
@@ -12,7 +14,10 @@ class PointTools(QdrantClientWrapper):
         async def get_points(
             collection_name: str,
             ids: List[str],
-            with_vectors: bool = False
+            with_vectors: bool = False,
+            with_payload: bool = True,
+            payload_include: Optional[List[str]] = None,
+            payload_exclude: Optional[List[str]] = None
         ) -> list[TextContent]:
             """
             Get points by their IDs from a collection.
@@ -21,15 +26,19 @@ class PointTools(QdrantClientWrapper):
                 collection_name: Name of the collection
                 ids: List of point IDs to retrieve
                 with_vectors: Whether to include vector data in the response
+                with_payload: Whether to include payloads in the response
+                payload_include: Only return these payload fields (dotted paths allowed)
+                payload_exclude: Return all payload fields except these
             """
             self.logger.info(f"Getting points from collection {collection_name} with IDs: {ids}")
             try:
-                points = self.client.retrieve(
+                points = await self.client.retrieve(
                     collection_name=collection_name,
                     ids=ids,
-                    with_vectors=with_vectors
+                    with_vectors=with_vectors,
+                    with_payload=build_payload_selector(with_payload, payload_include, payload_exclude)
                 )
-                return [TextContent(type="text", text=str(points))]
+                return [TextContent(type="text", text=self.serializer.serialize(points))]
             except Exception as e:
                 self.logger.error(f"Error getting points: {e}")
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -48,7 +57,7 @@ class PointTools(QdrantClientWrapper):
             """
             self.logger.info(f"Deleting points from collection {collection_name} with IDs: {ids}")
             try:
-                operation_info = self.client.delete(
+                operation_info = await self.client.delete(
                     collection_name=collection_name,
                     points_selector=ids
                 )
@@ -56,19 +65,46 @@ class PointTools(QdrantClientWrapper):
             except Exception as e:
                 self.logger.error(f"Error deleting points: {e}")
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
+            finally:
+                self.versions.bump(collection_name)
                 
         @mcp.tool(description="Count points in a collection")
-        async def count_points(collection_name: str) -> list[TextContent]:
+        async def count_points(
+            collection_name: str,
+            exact: bool = True,
+            filter_json: Optional[str] = None
+        ) -> list[TextContent]:
             """
             Count the number of points in a collection.
             
             Args:
                 collection_name: Name of the collection
+                exact: Count exactly; with false Qdrant returns a fast estimate
+                filter_json: Optional JSON filter; only matching points are counted
             """
             self.logger.info(f"Counting points in collection: {collection_name}")
             try:
-                count = self.client.count(collection_name=collection_name)
-                return [TextContent(type="text", text=f"Count: {count.count}")]
+                count_filter = self.filter_cache.parse(filter_json)
+            except ValueError as e:
+                self.logger.error(f"Invalid filter: {e}")
+                return [TextContent(type="text", text=f"Error: Invalid filter - {str(e)}")]
+            
+            cache_key = self.count_cache.key("count_points", collection_name, exact=exact, filter=filter_digest(filter_json))
+            cached = self.count_cache.get(collection_name, cache_key)
+            if cached is not None:
+                return [TextContent(type="text", text=cached)]
+            version = self.versions.get(collection_name)
+            
+            try:
+                await self.index_advisor.observe(collection_name, count_filter)
+                count = await self.client.count(
+                    collection_name=collection_name,
+                    count_filter=count_filter,
+                    exact=exact
+                )
+                result = f"Count: {count.count}"
+                self.count_cache.put(collection_name, cache_key, version, result)
+                return [TextContent(type="text", text=result)]
             except Exception as e:
                 self.logger.error(f"Error counting points: {e}")
                 return [TextContent(type="text", text=f"Error: {str(e)}")] 
\ No newline at end of file
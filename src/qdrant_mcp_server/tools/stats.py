@@ -0,0 +1,49 @@
+import logging
+from typing import Any, Optional
+from ..qdrant_client import QdrantClientWrapper, QdrantConnectionPool
+from ..embedding import EmbeddingModel
+from ..sparse_embedding import SparseEmbeddingModel
+from mcp.types import TextContent
+
+class StatsTools(QdrantClientWrapper):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        pool: Optional[QdrantConnectionPool] = None,
+        embedding_model: Optional[EmbeddingModel] = None,
+        sparse_model: Optional[SparseEmbeddingModel] = None
+    ):
+        super().__init__(logger, pool)
+        self.embedding_model = embedding_model
+        self.sparse_model = sparse_model
+        # Set by the server once all tools are initialized
+        self.startup_time: Optional[float] = None
+        
+    def register_tools(self, mcp: Any):
+        """Register server statistics tools."""
+        
+        @mcp.tool(description="Get server runtime statistics")
+        async def get_server_stats() -> list[TextContent]:
+            """
+            Get runtime statistics of the server, such as startup time, connection
+            pool usage and embedding queue depth.
+            """
+            self.logger.info("Collecting server statistics")
+            try:
+                stats = {
+                    "startup_ms": self.startup_time * 1000 if self.startup_time is not None else None,
+                    "connection_pool": self.pool.get_stats(),
+                    "result_cache": self.result_cache.get_stats(),
+                    "count_cache": self.count_cache.get_stats(),
+                    "payload_indexes": self.index_advisor.get_stats(),
+                    "filter_cache": self.filter_cache.get_stats(),
+                    "serialization": self.serializer.get_stats()
+                }
+                if self.embedding_model is not None:
+                    stats["embedding"] = self.embedding_model.get_stats()
+                if self.sparse_model is not None and self.sparse_model.enabled:
+                    stats["sparse_embedding"] = self.sparse_model.get_stats()
+                return [TextContent(type="text", text=self.serializer.serialize(stats))]
+            except Exception as e:
+                self.logger.error(f"Error collecting server statistics: {e}")
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
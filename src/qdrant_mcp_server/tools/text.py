@@ -1,18 +1,62 @@
+import os
+import asyncio
 import logging
-import json
 import uuid
 from typing import Dict, Any, List, Optional
-from ..qdrant_client import QdrantClientWrapper
+from ..qdrant_client import QdrantClientWrapper, QdrantConnectionPool
 from ..embedding import EmbeddingModel
+from ..sparse_embedding import SparseEmbeddingModel
+from ..collection_cache import SPARSE_VECTOR_NAME, CollectionInfo
+from ..ingest import stream_texts
+from ..search_params import build_payload_selector, get_search_defaults, resolve_search_params
+from fastmcp import Context
 from mcp.types import TextContent
-from qdrant_client.http.models import PointStruct
-from qdrant_client.http.models import Filter
+from qdrant_client.http.models import Fusion, FusionQuery, PointStruct, Prefetch, QueryRequest, ScoredPoint
 
 class TextTools(QdrantClientWrapper):
-    def __init__(self, logger: logging.Logger):
-        super().__init__(logger)
+    def __init__(self, logger: logging.Logger, pool: Optional[QdrantConnectionPool] = None):
+        super().__init__(logger, pool)
         # Initialize the embedding model
         self.embedding_model = EmbeddingModel(logger)
+        # Optional sparse model (SPARSE_EMBEDDING_MODEL) for hybrid search
+        self.sparse_model = SparseEmbeddingModel(logger, executor=self.embedding_model.executor)
+        self.ingest_chunk_size = int(os.getenv("INGEST_CHUNK_SIZE", "256"))
+        self.search_defaults = get_search_defaults()
+        
+    @staticmethod
+    def _payload_selector(
+        include: Optional[List[str]],
+        exclude: Optional[List[str]],
+        include_text: bool
+    ) -> Any:
+        """Payload selector for text searches, adding or removing the stored text field."""
+        if include is not None:
+            include = [field for field in include if field != "text"] + (["text"] if include_text else [])
+        elif not include_text:
+            exclude = (exclude or []) + ["text"]
+        return build_payload_selector(include=include, exclude=exclude)
+        
+    @staticmethod
+    def _format_results(points: List[ScoredPoint], include_text: bool = True) -> List[Dict[str, Any]]:
+        """Split each hit's payload into the stored text and the remaining metadata."""
+        results = []
+        for res in points:
+            payload = res.payload or {}
+            result = {"id": res.id, "score": res.score}
+            if include_text:
+                result["text"] = payload.get("text", "No text available")
+            result["metadata"] = {k: v for k, v in payload.items() if k != "text"}
+            results.append(result)
+        return results
+        
+    async def _ensure_collection(self, collection: str) -> CollectionInfo:
+        """Return the collection's layout, creating it (with the sparse vector if enabled) if absent."""
+        sparse = self.sparse_model.vector_params() if self.sparse_model.enabled else None
+        return await self.collections.ensure(collection, self.embedding_model.vector_size, sparse)
+        
+    def _stores_sparse(self, info: CollectionInfo) -> bool:
+        # Collections created before the sparse model was configured only get dense vectors
+        return self.sparse_model.enabled and info.has_sparse
         
     def register_tools(self, mcp: Any):
         """Register text-related tools."""
@@ -37,7 +81,7 @@ class TextTools(QdrantClientWrapper):
             
             # Generate embedding for the text
             self.logger.info(f"Generating embedding for text: {text[:50]}...")
-            vector = self.embedding_model.embed_text(text)[0]
+            vector = (await self.embedding_model.aembed_array(text))[0]
             
             # Create metadata if not provided
             if metadata is None:
@@ -51,28 +95,19 @@ class TextTools(QdrantClientWrapper):
                 point_id = str(uuid.uuid4())
                 
             try:
-                # Ensure collection exists (create if needed)
-                try:
-                    self.client.get_collection(collection)
-                except Exception:
-                    self.logger.info(f"Collection {collection} not found, creating...")
-                    self.client.recreate_collection(
-                        collection_name=collection,
-                        vectors_config={
-                            "default": {
-                                "size": self.embedding_model.vector_size,
-                                "distance": "Cosine"
-                            }
-                        }
-                    )
+                # Ensure collection exists (cached, created if absent)
+                info = await self._ensure_collection(collection)
+                sparse_vector = None
+                if self._stores_sparse(info):
+                    sparse_vector = (await self.sparse_model.aembed_documents([text]))[0]
                 
                 # Store the point
-                self.client.upsert(
+                await self.client.upsert(
                     collection_name=collection,
                     points=[
                         PointStruct(
                             id=point_id,
-                            vector=vector,
+                            vector=info.vector_input(vector.tolist(), sparse_vector),
                             payload=metadata
                         )
                     ]
@@ -80,15 +115,27 @@ class TextTools(QdrantClientWrapper):
                 
                 return [TextContent(type="text", text=f"Text stored successfully with ID: {point_id}")]
             except Exception as e:
+                self.collections.invalidate(collection)
                 self.logger.error(f"Error storing text: {e}")
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
+            finally:
+                self.versions.bump(collection)
                 
         @mcp.tool(description="Search for similar text")
         async def search_similar_text(
             query: str,
             limit: int = 10,
             collection_name: Optional[str] = None,
-            filter_json: Optional[str] = None
+            filter_json: Optional[str] = None,
+            hnsw_ef: Optional[int] = None,
+            exact: Optional[bool] = None,
+            indexed_only: Optional[bool] = None,
+            ignore_quantization: Optional[bool] = None,
+            rescore: Optional[bool] = None,
+            oversampling: Optional[float] = None,
+            payload_include: Optional[List[str]] = None,
+            payload_exclude: Optional[List[str]] = None,
+            include_text: bool = True
         ) -> list[TextContent]:
             """
             Convert query text to an embedding and find similar vectors.
@@ -98,69 +145,324 @@ class TextTools(QdrantClientWrapper):
                 limit: Maximum number of results to return
                 collection_name: Collection name (uses default if not provided)
                 filter_json: Optional JSON filter to apply to search
+                hnsw_ef: Size of the HNSW candidate list; higher is more accurate but slower
+                exact: Run an exact (brute-force) search instead of using the HNSW index
+                indexed_only: Only search segments whose vectors are already indexed
+                ignore_quantization: Search the original vectors instead of quantized ones
+                rescore: Re-score quantized candidates with the original vectors
+                oversampling: Fetch limit * oversampling quantized candidates before rescoring
+                payload_include: Only return these metadata fields (dotted paths allowed)
+                payload_exclude: Return all metadata fields except these
+                include_text: Whether to return the stored text of each result
+                
+            Options left unset use the collection's configured search defaults.
             """
             collection = collection_name or self.default_collection
             
             self.logger.info(f"Searching for text similar to: {query[:50]}...")
+            search_options = dict(
+                hnsw_ef=hnsw_ef,
+                exact=exact,
+                indexed_only=indexed_only,
+                ignore_quantization=ignore_quantization,
+                rescore=rescore,
+                oversampling=oversampling
+            )
+            cache_key = self.result_cache.key(
+                "search_similar_text", collection,
+                query=query, limit=limit, filter_json=filter_json, payload_include=payload_include,
+                payload_exclude=payload_exclude, include_text=include_text, **search_options
+            )
+            cached = self.result_cache.get(collection, cache_key)
+            if cached is not None:
+                return [TextContent(type="text", text=cached)]
+            version = self.versions.get(collection)
             
             try:
+                # Parse filter if provided (cached across calls), before paying for the embedding
+                try:
+                    search_filter = self.filter_cache.parse(filter_json)
+                except ValueError as e:
+                    self.logger.error(f"Error parsing filter JSON: {e}")
+                    return [TextContent(type="text", text=f"Error parsing filter: {str(e)}")]
+                
+                info = await self.collections.get(collection)
+                if info is None:
+                    return [TextContent(type="text", text=f"Error: Collection {collection} not found")]
+                
+                await self.index_advisor.observe(collection, search_filter)
+                
                 # Generate embedding for query
-                query_vector = self.embedding_model.embed_text(query)[0]
-                
-                # Parse filter if provided
-                search_filter = None
-                if filter_json:
-                    try:
-                        filter_dict = json.loads(filter_json)
-                        search_filter = Filter(**filter_dict)
-                    except Exception as e:
-                        self.logger.error(f"Error parsing filter JSON: {e}")
-                        return [TextContent(type="text", text=f"Error parsing filter: {str(e)}")]
+                query_vector = (await self.embedding_model.aembed_array(query))[0]
                 
                 # Search for similar vectors
-                results = self.client.search(
+                response = await self.client.query_points(
                     collection_name=collection,
-                    query_vector=query_vector,
+                    query=query_vector,
+                    using=info.vector_name,
                     limit=limit,
-                    filter=search_filter
+                    query_filter=search_filter,
+                    search_params=resolve_search_params(self.search_defaults, collection, **search_options),
+                    with_payload=self._payload_selector(payload_include, payload_exclude, include_text)
                 )
                 
                 # Format results nicely
-                formatted_results = []
-                for i, res in enumerate(results):
-                    formatted_results.append({
-                        "id": res.id,
-                        "score": res.score,
-                        "text": res.payload.get("text", "No text available"),
-                        "metadata": {k: v for k, v in res.payload.items() if k != "text"}
-                    })
-                
-                return [TextContent(type="text", text=json.dumps(formatted_results, indent=2))]
+                formatted_results = self._format_results(response.points, include_text)
+                
+                result = self.serializer.serialize(formatted_results)
+                self.result_cache.put(collection, cache_key, version, result)
+                return [TextContent(type="text", text=result)]
             except Exception as e:
+                self.collections.invalidate(collection)
                 self.logger.error(f"Error searching for similar text: {e}")
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
                 
+        @mcp.tool(description="Search for similar text for many queries at once")
+        async def search_similar_texts(
+            queries: List[str],
+            limit: int = 10,
+            collection_name: Optional[str] = None,
+            filter_json: Optional[str] = None,
+            hnsw_ef: Optional[int] = None,
+            exact: Optional[bool] = None,
+            indexed_only: Optional[bool] = None,
+            ignore_quantization: Optional[bool] = None,
+            rescore: Optional[bool] = None,
+            oversampling: Optional[float] = None,
+            payload_include: Optional[List[str]] = None,
+            payload_exclude: Optional[List[str]] = None,
+            include_text: bool = True
+        ) -> list[TextContent]:
+            """
+            Embed several text queries in one model pass and search for all of them
+            with a single batched request.
+            
+            Args:
+                queries: The text queries to search for
+                limit: Maximum number of results to return per query
+                collection_name: Collection name (uses default if not provided)
+                filter_json: Optional JSON filter applied to every query
+                hnsw_ef: Size of the HNSW candidate list; higher is more accurate but slower
+                exact: Run an exact (brute-force) search instead of using the HNSW index
+                indexed_only: Only search segments whose vectors are already indexed
+                ignore_quantization: Search the original vectors instead of quantized ones
+                rescore: Re-score quantized candidates with the original vectors
+                oversampling: Fetch limit * oversampling quantized candidates before rescoring
+                payload_include: Only return these metadata fields (dotted paths allowed)
+                payload_exclude: Return all metadata fields except these
+                include_text: Whether to return the stored text of each result
+                
+            Returns a JSON list with one entry per query, in the order of `queries`.
+            """
+            collection = collection_name or self.default_collection
+            
+            self.logger.info(f"Searching for text similar to {len(queries)} queries...")
+            search_options = dict(
+                hnsw_ef=hnsw_ef,
+                exact=exact,
+                indexed_only=indexed_only,
+                ignore_quantization=ignore_quantization,
+                rescore=rescore,
+                oversampling=oversampling
+            )
+            cache_key = self.result_cache.key(
+                "search_similar_texts", collection,
+                queries=queries, limit=limit, filter_json=filter_json, payload_include=payload_include,
+                payload_exclude=payload_exclude, include_text=include_text, **search_options
+            )
+            cached = self.result_cache.get(collection, cache_key)
+            if cached is not None:
+                return [TextContent(type="text", text=cached)]
+            version = self.versions.get(collection)
+            
+            try:
+                # Parse filter if provided (cached across calls)
+                try:
+                    search_filter = self.filter_cache.parse(filter_json)
+                except ValueError as e:
+                    self.logger.error(f"Error parsing filter JSON: {e}")
+                    return [TextContent(type="text", text=f"Error parsing filter: {str(e)}")]
+                
+                info = await self.collections.get(collection)
+                if info is None:
+                    return [TextContent(type="text", text=f"Error: Collection {collection} not found")]
+                
+                await self.index_advisor.observe(collection, search_filter)
+                
+                # One embedding pass for all queries
+                query_vectors = await self.embedding_model.aembed_array(queries)
+                
+                search_params = resolve_search_params(self.search_defaults, collection, **search_options)
+                with_payload = self._payload_selector(payload_include, payload_exclude, include_text)
+                responses = await self.client.query_batch_points(
+                    collection_name=collection,
+                    requests=[
+                        QueryRequest(
+                            query=query_vector,
+                            using=info.vector_name,
+                            filter=search_filter,
+                            limit=limit,
+                            params=search_params,
+                            with_payload=with_payload
+                        )
+                        for query_vector in query_vectors
+                    ]
+                )
+                
+                formatted_results = [
+                    {"query": query, "results": self._format_results(response.points, include_text)}
+                    for query, response in zip(queries, responses)
+                ]
+                result = self.serializer.serialize(formatted_results)
+                self.result_cache.put(collection, cache_key, version, result)
+                return [TextContent(type="text", text=result)]
+            except Exception as e:
+                self.collections.invalidate(collection)
+                self.logger.error(f"Error searching for similar texts: {e}")
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
+                
+        @mcp.tool(description="Hybrid dense + sparse (keyword) text search, fused with RRF")
+        async def hybrid_search(
+            query: str,
+            limit: int = 10,
+            collection_name: Optional[str] = None,
+            filter_json: Optional[str] = None,
+            prefetch_limit: Optional[int] = None,
+            hnsw_ef: Optional[int] = None,
+            exact: Optional[bool] = None,
+            indexed_only: Optional[bool] = None,
+            ignore_quantization: Optional[bool] = None,
+            rescore: Optional[bool] = None,
+            oversampling: Optional[float] = None,
+            payload_include: Optional[List[str]] = None,
+            payload_exclude: Optional[List[str]] = None,
+            include_text: bool = True
+        ) -> list[TextContent]:
+            """
+            Search with both the dense embedding and the sparse (keyword) vector of
+            the query, and fuse the two candidate lists with Reciprocal Rank Fusion.
+            Both searches and the fusion run in Qdrant in a single request. Requires
+            SPARSE_EMBEDDING_MODEL and a collection storing sparse vectors.
+            
+            Args:
+                query: The text query to search for
+                limit: Maximum number of results to return
+                collection_name: Collection name (uses default if not provided)
+                filter_json: Optional JSON filter applied to both searches
+                prefetch_limit: Candidates taken from each search before fusion (defaults to 4 * limit)
+                hnsw_ef: Size of the HNSW candidate list of the dense search
+                exact: Run an exact (brute-force) dense search instead of using the HNSW index
+                indexed_only: Only search segments whose vectors are already indexed
+                ignore_quantization: Search the original dense vectors instead of quantized ones
+                rescore: Re-score quantized candidates with the original vectors
+                oversampling: Fetch limit * oversampling quantized candidates before rescoring
+                payload_include: Only return these metadata fields (dotted paths allowed)
+                payload_exclude: Return all metadata fields except these
+                include_text: Whether to return the stored text of each result
+                
+            Scores are RRF scores, which rank results but are not similarities.
+            """
+            collection = collection_name or self.default_collection
+            if not self.sparse_model.enabled:
+                return [TextContent(type="text", text="Error: Hybrid search requires SPARSE_EMBEDDING_MODEL to be set")]
+            
+            self.logger.info(f"Hybrid search for: {query[:50]}...")
+            search_options = dict(
+                hnsw_ef=hnsw_ef,
+                exact=exact,
+                indexed_only=indexed_only,
+                ignore_quantization=ignore_quantization,
+                rescore=rescore,
+                oversampling=oversampling
+            )
+            cache_key = self.result_cache.key(
+                "hybrid_search", collection,
+                query=query, limit=limit, filter_json=filter_json, prefetch_limit=prefetch_limit,
+                payload_include=payload_include, payload_exclude=payload_exclude,
+                include_text=include_text, **search_options
+            )
+            cached = self.result_cache.get(collection, cache_key)
+            if cached is not None:
+                return [TextContent(type="text", text=cached)]
+            version = self.versions.get(collection)
+            
+            try:
+                try:
+                    search_filter = self.filter_cache.parse(filter_json)
+                except ValueError as e:
+                    self.logger.error(f"Error parsing filter JSON: {e}")
+                    return [TextContent(type="text", text=f"Error parsing filter: {str(e)}")]
+                
+                info = await self.collections.get(collection)
+                if info is None:
+                    return [TextContent(type="text", text=f"Error: Collection {collection} not found")]
+                if not info.has_sparse:
+                    return [TextContent(
+                        type="text",
+                        text=f"Error: Collection {collection} has no {SPARSE_VECTOR_NAME!r} sparse vector"
+                    )]
+                
+                await self.index_advisor.observe(collection, search_filter)
+                
+                # Dense and sparse query embeddings are computed concurrently
+                dense_vectors, sparse_vector = await asyncio.gather(
+                    self.embedding_model.aembed_array(query),
+                    self.sparse_model.aembed_query(query)
+                )
+                candidates = prefetch_limit or limit * 4
+                response = await self.client.query_points(
+                    collection_name=collection,
+                    prefetch=[
+                        Prefetch(
+                            query=dense_vectors[0].tolist(),
+                            using=info.vector_name,
+                            filter=search_filter,
+                            params=resolve_search_params(self.search_defaults, collection, **search_options),
+                            limit=candidates
+                        ),
+                        Prefetch(
+                            query=sparse_vector,
+                            using=SPARSE_VECTOR_NAME,
+                            filter=search_filter,
+                            limit=candidates
+                        ),
+                    ],
+                    query=FusionQuery(fusion=Fusion.RRF),
+                    limit=limit,
+                    with_payload=self._payload_selector(payload_include, payload_exclude, include_text)
+                )
+                
+                result = self.serializer.serialize(self._format_results(response.points, include_text))
+                self.result_cache.put(collection, cache_key, version, result)
+                return [TextContent(type="text", text=result)]
+            except Exception as e:
+                self.collections.invalidate(collection)
+                self.logger.error(f"Error in hybrid search: {e}")
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
+                
         @mcp.tool(description="Bulk store texts in the vector database")
         async def store_texts(
             texts: List[str],
             metadatas: Optional[List[Dict[str, Any]]] = None,
             collection_name: Optional[str] = None,
-            point_ids: Optional[List[str]] = None
+            point_ids: Optional[List[str]] = None,
+            chunk_size: Optional[int] = None,
+            ctx: Optional[Context] = None
         ) -> list[TextContent]:
             """
             Convert multiple texts to embedding vectors and store them in the database.
+            Texts are embedded and upserted in chunks, with the embedding of the next
+            chunk overlapping the upsert of the current one.
             
             Args:
                 texts: List of texts to embed and store
                 metadatas: Optional list of metadata dicts (one per text)
                 collection_name: Collection name (uses default if not provided)
                 point_ids: Custom IDs for the points (generates UUIDs if not provided)
+                chunk_size: Number of texts per embedding/upsert batch (uses INGEST_CHUNK_SIZE if not provided)
             """
             collection = collection_name or self.default_collection
-            
-            # Generate embeddings for all texts
-            self.logger.info(f"Generating embeddings for {len(texts)} texts...")
-            vectors = self.embedding_model.embed_text(texts)
+            chunk_size = chunk_size or self.ingest_chunk_size
             
             # Create metadata list if not provided
             if metadatas is None:
@@ -171,44 +473,39 @@ class TextTools(QdrantClientWrapper):
                 point_ids = [str(uuid.uuid4()) for _ in range(len(texts))]
                 
             # Add the original texts to metadata
+            payloads = []
             for i, text in enumerate(texts):
-                if i < len(metadatas):
-                    metadatas[i]["text"] = text
+                payload = metadatas[i] if i < len(metadatas) else {}
+                payload["text"] = text
+                payloads.append(payload)
+            
+            async def report_progress(batch: int, done: int, total: int):
+                if ctx is not None:
+                    await ctx.report_progress(done, total, f"Stored batch {batch}")
                 
             try:
-                # Ensure collection exists (create if needed)
-                try:
-                    self.client.get_collection(collection)
-                except Exception:
-                    self.logger.info(f"Collection {collection} not found, creating...")
-                    self.client.recreate_collection(
-                        collection_name=collection,
-                        vectors_config={
-                            "default": {
-                                "size": self.embedding_model.vector_size,
-                                "distance": "Cosine"
-                            }
-                        }
-                    )
-                
-                # Create points
-                points = []
-                for i in range(len(texts)):
-                    points.append(
-                        PointStruct(
-                            id=point_ids[i],
-                            vector=vectors[i],
-                            payload=metadatas[i] if i < len(metadatas) else {"text": texts[i]}
-                        )
-                    )
+                # Ensure collection exists (cached, created if absent)
+                info = await self._ensure_collection(collection)
                 
-                # Store the points
-                self.client.upsert(
-                    collection_name=collection,
-                    points=points
+                self.logger.info(f"Storing {len(texts)} texts in chunks of {chunk_size}...")
+                batches = await stream_texts(
+                    self.client,
+                    collection,
+                    info,
+                    texts,
+                    payloads,
+                    point_ids,
+                    self.embedding_model.aembed_array,
+                    chunk_size,
+                    self.logger,
+                    on_progress=report_progress,
+                    embed_sparse=self.sparse_model.aembed_documents if self._stores_sparse(info) else None
                 )
                 
-                return [TextContent(type="text", text=f"{len(texts)} texts stored successfully")]
+                return [TextContent(type="text", text=f"{len(texts)} texts stored successfully in {batches} batches")]
             except Exception as e:
+                self.collections.invalidate(collection)
                 self.logger.error(f"Error storing texts: {e}")
-                return [TextContent(type="text", text=f"Error: {str(e)}")] 
\ No newline at end of file
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
+            finally:
+                self.versions.bump(collection)
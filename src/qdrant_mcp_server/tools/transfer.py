@@ -0,0 +1,180 @@
+import os
+import logging
+from typing import Any, Optional
+from ..qdrant_client import QdrantClientWrapper, QdrantConnectionPool
+from ..embedding import EmbeddingModel
+from ..sparse_embedding import SparseEmbeddingModel
+from ..export import export_collection as run_export
+from ..importer import VECTOR_FORMATS, import_file as run_import
+from ..ingest import get_upsert_settings
+from fastmcp import Context
+from mcp.types import TextContent
+
+class TransferTools(QdrantClientWrapper):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        pool: Optional[QdrantConnectionPool] = None,
+        embedding_model: Optional[EmbeddingModel] = None,
+        sparse_model: Optional[SparseEmbeddingModel] = None
+    ):
+        super().__init__(logger, pool)
+        # Shared with the text tools; only needed to import texts
+        self.embedding_model = embedding_model
+        self.sparse_model = sparse_model
+        self.upsert_settings = get_upsert_settings()
+        # Clients may only name files below this directory
+        self.transfer_dir = os.path.realpath(os.getenv("TRANSFER_DIR", "transfers"))
+        self.logger.info(f"Transfer directory: {self.transfer_dir}")
+
+    def _resolve_path(self, path: str) -> str:
+        """
+        Resolve a client-supplied path against the transfer directory.
+
+        Raises ValueError for paths leading outside it, whether through "..",
+        an absolute path or a symlink.
+        """
+        resolved = os.path.realpath(os.path.join(self.transfer_dir, path))
+        if os.path.commonpath([resolved, self.transfer_dir]) != self.transfer_dir:
+            raise ValueError(f"{path} is outside the transfer directory")
+        return resolved
+
+    def register_tools(self, mcp: Any):
+        """Register tools moving collection data to and from files."""
+
+        @mcp.tool(description="Export a collection to NDJSON/Parquet payload files and .npy vector files")
+        async def export_collection(
+            collection_name: str,
+            output_dir: str,
+            payload_format: str = "ndjson",
+            with_vectors: bool = True,
+            filter_json: Optional[str] = None,
+            page_size: int = 1000,
+            resume: bool = True,
+            ctx: Optional[Context] = None
+        ) -> list[TextContent]:
+            """
+            Export the points of a collection to files in the server's transfer directory.
+
+            Payloads are written to points.ndjson (or Parquet parts under points/)
+            and dense vectors to float32 .npy files whose rows follow the payload
+            order. Points are streamed page by page, so large collections are
+            exported with bounded memory, and an interrupted export continues
+            where it stopped when called again with resume=True.
+
+            Args:
+                collection_name: Name of the collection
+                output_dir: Directory for the exported files and the export.json manifest, relative to TRANSFER_DIR
+                payload_format: "ndjson" or "parquet" (requires pyarrow)
+                with_vectors: Whether to export dense vectors
+                filter_json: Optional JSON filter selecting the points to export
+                page_size: Points read per scroll request
+                resume: Continue a previous export in output_dir instead of starting over
+            """
+            self.logger.info(f"Exporting collection {collection_name} to {output_dir} as {payload_format}")
+            try:
+                async def on_progress(done: int, total: int):
+                    if ctx is not None:
+                        await ctx.report_progress(done, total, f"Exported {done}/{total} points")
+
+                report = await run_export(
+                    self.client,
+                    collection_name,
+                    self._resolve_path(output_dir),
+                    self.logger,
+                    payload_format=payload_format,
+                    with_vectors=with_vectors,
+                    filter_json=filter_json,
+                    page_size=page_size,
+                    resume=resume,
+                    on_progress=on_progress
+                )
+                return [TextContent(type="text", text=self.serializer.serialize(report.to_dict()))]
+            except Exception as e:
+                self.logger.error(f"Error exporting collection: {e}")
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+        @mcp.tool(description="Import texts (JSONL/CSV/Parquet) or .npy vectors from a file into a collection")
+        async def import_file(
+            path: str,
+            collection_name: Optional[str] = None,
+            payload_path: Optional[str] = None,
+            text_field: str = "text",
+            id_field: Optional[str] = None,
+            payload_field: Optional[str] = None,
+            batch_size: Optional[int] = None,
+            parallel: Optional[int] = None,
+            resume: bool = True,
+            ctx: Optional[Context] = None
+        ) -> list[TextContent]:
+            """
+            Import points from a file in the server's transfer directory, creating the collection if needed.
+
+            Texts are read from JSONL, CSV or Parquet files and embedded in streaming
+            batches; vectors are memory-mapped from .npy files. Batches are upserted
+            in parallel and checkpointed next to the file, so calling again with
+            resume=True after an interruption skips the batches already stored.
+
+            Args:
+                path: JSONL, CSV or Parquet file of texts, or .npy file of vectors, relative to TRANSFER_DIR
+                collection_name: Collection name (uses default if not provided)
+                payload_path: JSONL/CSV/Parquet file with one payload row per vector of a .npy file, relative to TRANSFER_DIR
+                text_field: Field holding the text to embed
+                id_field: Field holding the point id (ids are derived from row numbers if not provided)
+                payload_field: Field holding the payload object (all other fields are stored if not provided)
+                batch_size: Points per upsert request (uses UPSERT_BATCH_SIZE if not provided)
+                parallel: Maximum concurrent upsert requests (uses UPSERT_PARALLEL if not provided)
+                resume: Skip batches stored by a previous, interrupted import of the same file
+            """
+            collection = collection_name or self.default_collection
+            self.logger.info(f"Importing {path} into collection {collection}")
+            try:
+                path = self._resolve_path(path)
+                payload_path = self._resolve_path(payload_path) if payload_path else None
+                # The checkpoint goes next to the file, and must not escape the directory through a symlink either
+                checkpoint_path = self._resolve_path(path + ".import.json")
+
+                embed, vector_size, embed_sparse, sparse_params = None, None, None, None
+                if os.path.splitext(path)[1].lower() not in VECTOR_FORMATS and self.embedding_model is not None:
+                    embed, vector_size = self.embedding_model.aembed_array, self.embedding_model.vector_size
+                    if self.sparse_model is not None and self.sparse_model.enabled:
+                        embed_sparse, sparse_params = self.sparse_model.aembed_documents, self.sparse_model.vector_params()
+
+                async def on_progress(done: int, total: Optional[int]):
+                    if ctx is not None:
+                        await ctx.report_progress(done, total, f"Imported {done} points")
+
+                report = await run_import(
+                    self.client,
+                    self.collections,
+                    collection,
+                    path,
+                    self.logger,
+                    embed=embed,
+                    vector_size=vector_size,
+                    embed_sparse=embed_sparse,
+                    sparse_params=sparse_params,
+                    payload_path=payload_path,
+                    text_field=text_field,
+                    id_field=id_field,
+                    payload_field=payload_field,
+                    batch_size=batch_size or self.upsert_settings["batch_size"],
+                    parallel=parallel or self.upsert_settings["parallel"],
+                    max_retries=self.upsert_settings["max_retries"],
+                    checkpoint_path=checkpoint_path,
+                    resume=resume,
+                    on_progress=on_progress
+                )
+
+                if report.failed:
+                    return [TextContent(
+                        type="text",
+                        text=f"Error: {len(report.failed)} batches failed: {self.serializer.serialize(report.to_dict())}"
+                    )]
+                return [TextContent(type="text", text=self.serializer.serialize(report.to_dict()))]
+            except Exception as e:
+                self.collections.invalidate(collection)
+                self.logger.error(f"Error importing file: {e}")
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
+            finally:
+                self.versions.bump(collection)
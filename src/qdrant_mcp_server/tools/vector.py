@@ -1,11 +1,21 @@
 import logging
 import json
+import uuid
 from typing import Dict, Any, List, Optional
-from ..qdrant_client import QdrantClientWrapper
+from ..qdrant_client import QdrantClientWrapper, QdrantConnectionPool
+from ..ingest import get_upsert_settings, upsert_batches
+from ..search_params import build_payload_selector, get_search_defaults, resolve_search_params
+from ..scroll import decode_cursor, encode_cursor, scroll_pages
+from fastmcp import Context
 from mcp.types import TextContent
-from qdrant_client.http.models import PointStruct
+from qdrant_client.http.models import PointStruct, QueryRequest
 
 class VectorTools(QdrantClientWrapper):
+    def __init__(self, logger: logging.Logger, pool: Optional[QdrantConnectionPool] = None):
+        super().__init__(logger, pool)
+        self.upsert_settings = get_upsert_settings()
+        self.search_defaults = get_search_defaults()
+        
     def register_tools(self, mcp: Any):
         """Register vector search related tools."""
         
@@ -14,7 +24,16 @@ class VectorTools(QdrantClientWrapper):
             collection_name: str,
             vector: List[float],
             limit: int = 10,
-            with_vectors: bool = False
+            with_vectors: bool = False,
+            hnsw_ef: Optional[int] = None,
+            exact: Optional[bool] = None,
+            indexed_only: Optional[bool] = None,
+            ignore_quantization: Optional[bool] = None,
+            rescore: Optional[bool] = None,
+            oversampling: Optional[float] = None,
+            with_payload: bool = True,
+            payload_include: Optional[List[str]] = None,
+            payload_exclude: Optional[List[str]] = None
         ) -> list[TextContent]:
             """
             Search for similar vectors in a collection.
@@ -24,93 +43,333 @@ class VectorTools(QdrantClientWrapper):
                 vector: Query vector for similarity search
                 limit: Maximum number of results to return
                 with_vectors: Whether to include vector data in the response
+                hnsw_ef: Size of the HNSW candidate list; higher is more accurate but slower
+                exact: Run an exact (brute-force) search instead of using the HNSW index
+                indexed_only: Only search segments whose vectors are already indexed
+                ignore_quantization: Search the original vectors instead of quantized ones
+                rescore: Re-score quantized candidates with the original vectors
+                oversampling: Fetch limit * oversampling quantized candidates before rescoring
+                with_payload: Whether to include payloads in the response
+                payload_include: Only return these payload fields (dotted paths allowed)
+                payload_exclude: Return all payload fields except these
+                
+            Options left unset use the collection's configured search defaults.
             """
             self.logger.info(f"Searching vectors in collection {collection_name}")
+            search_options = dict(
+                hnsw_ef=hnsw_ef,
+                exact=exact,
+                indexed_only=indexed_only,
+                ignore_quantization=ignore_quantization,
+                rescore=rescore,
+                oversampling=oversampling
+            )
+            cache_key = self.result_cache.key(
+                "search_vectors", collection_name,
+                vector=vector, limit=limit, with_vectors=with_vectors, with_payload=with_payload,
+                payload_include=payload_include, payload_exclude=payload_exclude, **search_options
+            )
+            cached = self.result_cache.get(collection_name, cache_key)
+            if cached is not None:
+                return [TextContent(type="text", text=cached)]
+            version = self.versions.get(collection_name)
+            
             try:
-                results = self.client.search(
+                response = await self.client.query_points(
                     collection_name=collection_name,
-                    query_vector=vector,
+                    query=vector,
                     limit=limit,
-                    with_vectors=with_vectors
+                    with_vectors=with_vectors,
+                    with_payload=build_payload_selector(with_payload, payload_include, payload_exclude),
+                    search_params=resolve_search_params(self.search_defaults, collection_name, **search_options)
                 )
-                return [TextContent(type="text", text=str(results))]
+                result = self.serializer.serialize(response.points)
+                self.result_cache.put(collection_name, cache_key, version, result)
+                return [TextContent(type="text", text=result)]
             except Exception as e:
                 self.logger.error(f"Error searching vectors: {e}")
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
 
+        @mcp.tool(description="Search for similar vectors for many query vectors in one request")
+        async def search_vectors_batch(
+            collection_name: str,
+            vectors: List[List[float]],
+            limit: int = 10,
+            limits: Optional[List[int]] = None,
+            filter_jsons: Optional[List[Optional[str]]] = None,
+            with_vectors: bool = False,
+            hnsw_ef: Optional[int] = None,
+            exact: Optional[bool] = None,
+            indexed_only: Optional[bool] = None,
+            ignore_quantization: Optional[bool] = None,
+            rescore: Optional[bool] = None,
+            oversampling: Optional[float] = None,
+            with_payload: bool = True,
+            payload_include: Optional[List[str]] = None,
+            payload_exclude: Optional[List[str]] = None
+        ) -> list[TextContent]:
+            """
+            Search for similar vectors for several query vectors with a single Qdrant request.
+            
+            Args:
+                collection_name: Name of the collection
+                vectors: Query vectors, one per search
+                limit: Maximum number of results per query when limits is not provided
+                limits: Optional maximum number of results for each query
+                filter_jsons: Optional JSON filter for each query (null for no filter)
+                with_vectors: Whether to include vector data in the response
+                hnsw_ef: Size of the HNSW candidate list; higher is more accurate but slower
+                exact: Run an exact (brute-force) search instead of using the HNSW index
+                indexed_only: Only search segments whose vectors are already indexed
+                ignore_quantization: Search the original vectors instead of quantized ones
+                rescore: Re-score quantized candidates with the original vectors
+                oversampling: Fetch limit * oversampling quantized candidates before rescoring
+                with_payload: Whether to include payloads in the response
+                payload_include: Only return these payload fields (dotted paths allowed)
+                payload_exclude: Return all payload fields except these
+            
+            Search options apply to every query; options left unset use the
+            collection's configured search defaults. Results are returned as a
+            JSON list with one entry per query, in the order of `vectors`.
+            """
+            self.logger.info(f"Searching {len(vectors)} vectors in collection {collection_name}")
+            search_options = dict(
+                hnsw_ef=hnsw_ef,
+                exact=exact,
+                indexed_only=indexed_only,
+                ignore_quantization=ignore_quantization,
+                rescore=rescore,
+                oversampling=oversampling
+            )
+            cache_key = self.result_cache.key(
+                "search_vectors_batch", collection_name,
+                vectors=vectors, limit=limit, limits=limits, filter_jsons=filter_jsons,
+                with_vectors=with_vectors, with_payload=with_payload, payload_include=payload_include,
+                payload_exclude=payload_exclude, **search_options
+            )
+            cached = self.result_cache.get(collection_name, cache_key)
+            if cached is not None:
+                return [TextContent(type="text", text=cached)]
+            version = self.versions.get(collection_name)
+            
+            for name, values in (("limits", limits), ("filter_jsons", filter_jsons)):
+                if values is not None and len(values) != len(vectors):
+                    return [TextContent(
+                        type="text",
+                        text=f"Error: {name} has {len(values)} entries but {len(vectors)} vectors were given"
+                    )]
+            
+            filters = []
+            for i, filter_json in enumerate(filter_jsons or [None] * len(vectors)):
+                try:
+                    filters.append(self.filter_cache.parse(filter_json))
+                except ValueError as e:
+                    self.logger.error(f"Invalid filter for query {i}: {e}")
+                    return [TextContent(type="text", text=f"Error: Invalid filter for query {i} - {str(e)}")]
+            
+            try:
+                for query_filter in filters:
+                    await self.index_advisor.observe(collection_name, query_filter)
+                
+                search_params = resolve_search_params(self.search_defaults, collection_name, **search_options)
+                payload_selector = build_payload_selector(with_payload, payload_include, payload_exclude)
+                requests = [
+                    QueryRequest(
+                        query=vector,
+                        filter=filters[i],
+                        limit=limits[i] if limits is not None else limit,
+                        params=search_params,
+                        with_vector=with_vectors,
+                        with_payload=payload_selector
+                    )
+                    for i, vector in enumerate(vectors)
+                ]
+                responses = await self.client.query_batch_points(
+                    collection_name=collection_name,
+                    requests=requests
+                )
+                
+                results = [
+                    {"query": i, "points": response.points}
+                    for i, response in enumerate(responses)
+                ]
+                result = self.serializer.serialize(results)
+                self.result_cache.put(collection_name, cache_key, version, result)
+                return [TextContent(type="text", text=result)]
+            except Exception as e:
+                self.logger.error(f"Error searching vector batch: {e}")
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
+
         @mcp.tool(description="Upload vectors to a collection")
         async def upsert_vectors(
             collection_name: str,
             vectors: List[List[float]],
             ids: List[str],
-            metadata: Optional[List[Dict[str, Any]]] = None
+            metadata: Optional[List[Dict[str, Any]]] = None,
+            batch_size: Optional[int] = None,
+            parallel: Optional[int] = None,
+            retry_batches: Optional[List[int]] = None
         ) -> list[TextContent]:
             """
-            Upload vectors to a collection.
+            Upload vectors to a collection in parallel batches.
             
             Args:
                 collection_name: Name of the collection
                 vectors: List of vectors to upload
                 ids: List of IDs for the vectors
                 metadata: Optional metadata for each vector
+                batch_size: Points per upsert request (uses UPSERT_BATCH_SIZE if not provided)
+                parallel: Maximum concurrent upsert requests (uses UPSERT_PARALLEL if not provided)
+                retry_batches: Only upload these batch indexes, e.g. the failed batches of a previous call
             """
             self.logger.info(f"Upserting vectors to collection {collection_name}")
+            # Checked once here: inside a batch these would look like transient failures and be retried
+            if len(ids) != len(vectors):
+                return [TextContent(type="text", text=f"Error: got {len(ids)} ids for {len(vectors)} vectors")]
+            if metadata is not None and len(metadata) > len(vectors):
+                return [TextContent(type="text", text=f"Error: got {len(metadata)} metadata entries for {len(vectors)} vectors")]
+            batch_size = batch_size or self.upsert_settings["batch_size"]
+            batch_count = (len(vectors) + batch_size - 1) // batch_size
+            invalid = [index for index in retry_batches or [] if not 0 <= index < batch_count]
+            if invalid:
+                return [TextContent(
+                    type="text",
+                    text=f"Error: retry_batches {invalid} out of range, {len(vectors)} vectors make batches 0-{batch_count - 1}"
+                )]
             try:
-                points = []
-                
                 # Prepare metadata list if not provided
                 if metadata is None:
                     metadata = [{} for _ in range(len(vectors))]
                 
-                # Create point objects
-                for i in range(len(vectors)):
-                    points.append(
+                # Create point objects one batch at a time
+                def build_batch(start: int, end: int) -> List[PointStruct]:
+                    return [
                         PointStruct(
                             id=ids[i],
                             vector=vectors[i],
                             payload=metadata[i] if i < len(metadata) else {}
                         )
-                    )
+                        for i in range(start, end)
+                    ]
                 
-                operation_info = self.client.upsert(
-                    collection_name=collection_name,
-                    points=points
+                report = await upsert_batches(
+                    self.client,
+                    collection_name,
+                    len(vectors),
+                    build_batch,
+                    batch_size,
+                    parallel or self.upsert_settings["parallel"],
+                    self.upsert_settings["max_retries"],
+                    self.logger,
+                    batches=retry_batches
                 )
                 
-                return [TextContent(type="text", text=f"Vectors uploaded successfully: {operation_info}")]
+                if report.failed:
+                    return [TextContent(
+                        type="text",
+                        text=f"Error: {len(report.failed)} of {report.batches} batches failed: {self.serializer.serialize(report.to_dict())}"
+                    )]
+                return [TextContent(type="text", text=f"Vectors uploaded successfully: {self.serializer.serialize(report.to_dict())}")]
             except Exception as e:
                 self.logger.error(f"Error upserting vectors: {e}")
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
+            finally:
+                self.versions.bump(collection_name)
                 
-        @mcp.tool(description="Search collection with filter")
+        @mcp.tool(description="Search collection with filter, page by page")
         async def filter_search(
             collection_name: str,
             filter_json: str,
-            limit: int = 10
+            limit: int = 10,
+            cursor: Optional[str] = None,
+            stream: bool = False,
+            max_points: Optional[int] = None,
+            with_vectors: bool = False,
+            with_payload: bool = True,
+            payload_include: Optional[List[str]] = None,
+            payload_exclude: Optional[List[str]] = None,
+            ctx: Optional[Context] = None
         ) -> list[TextContent]:
             """
             Search for points in a collection using filters.
             
+            Returns {"points": [...], "next_cursor": ...}. Pass next_cursor back with
+            the same collection and filter to get the next page; it is null once all
+            matching points have been returned.
+            
             Args:
                 collection_name: Name of the collection
                 filter_json: JSON string representing the filter condition
-                limit: Maximum number of results to return
+                limit: Maximum number of results per page
+                cursor: Continuation token from a previous call
+                stream: Keep reading pages of `limit` points until all matches, `max_points`
+                    or the response size limit are reached, reporting progress per page
+                max_points: Maximum number of points to return in stream mode
+                with_vectors: Whether to include vector data in the response
+                with_payload: Whether to include payloads in the response
+                payload_include: Only return these payload fields (dotted paths allowed)
+                payload_exclude: Return all payload fields except these
             """
             self.logger.info(f"Searching with filter in collection {collection_name}")
             try:
-                # Parse filter JSON string to dict
-                filter_dict = json.loads(filter_json)
-                
-                results = self.client.scroll(
-                    collection_name=collection_name,
-                    limit=limit,
-                    filter=filter_dict
-                )
-                
-                return [TextContent(type="text", text=str(results))]
+                # Parse filter JSON string into a typed filter
+                scroll_filter = self.filter_cache.parse(filter_json)
+                offset = decode_cursor(cursor, collection_name, filter_json) if cursor else None
             except json.JSONDecodeError as e:
                 self.logger.error(f"Invalid filter JSON: {e}")
                 return [TextContent(type="text", text=f"Error: Invalid filter JSON - {str(e)}")]
+            except ValueError as e:
+                self.logger.error(f"Invalid filter or cursor: {e}")
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
+            
+            try:
+                await self.index_advisor.observe(collection_name, scroll_filter)
+                
+                # Pages are added until the response would exceed the size cap; the
+                # cursor then resumes at the first point left out, so none are skipped
+                budget = None
+                if self.serializer.max_bytes > 0:
+                    widest_cursor = encode_cursor(collection_name, filter_json, str(uuid.UUID(int=0)))
+                    budget = self.serializer.max_bytes - len(self.serializer.encode(
+                        {"points": [], "next_cursor": widest_cursor, "pages": 10 ** 9}
+                    ))
+                
+                points: List[Any] = []
+                used = 0
+                pages = 0
+                next_offset = offset
+                full = False
+                async for page, page_offset in scroll_pages(
+                    self.client,
+                    collection_name,
+                    scroll_filter,
+                    page_size=limit,
+                    offset=offset,
+                    max_points=max_points if stream else limit,
+                    with_payload=build_payload_selector(with_payload, payload_include, payload_exclude),
+                    with_vectors=with_vectors
+                ):
+                    pages += 1
+                    next_offset = page_offset
+                    for point in page:
+                        item = self.serializer.to_jsonable(point)
+                        size = len(self.serializer.encode(item)) + 1
+                        if budget is not None and points and used + size > budget:
+                            next_offset = point.id
+                            full = True
+                            break
+                        points.append(item)
+                        used += size
+                    
+                    if full or not stream:
+                        break
+                    if ctx is not None:
+                        await ctx.report_progress(len(points), max_points, f"Read page {pages}")
+                
+                response = {"points": points, "next_cursor": encode_cursor(collection_name, filter_json, next_offset)}
+                if stream:
+                    response["pages"] = pages
+                return [TextContent(type="text", text=self.serializer.encode(response).decode("utf-8"))]
             except Exception as e:
                 self.logger.error(f"Error searching with filter: {e}")
-                return [TextContent(type="text", text=f"Error: {str(e)}")] 
\ No newline at end of file
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark the embedding-to-upsert path: per-vector Python lists and PointStructs
+(the previous path) against one float32 matrix written into a columnar Batch.
+
+Embeddings are synthetic, so no model download or Qdrant server is needed;
+upserts go to Qdrant's in-memory local mode.
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import time
+import tracemalloc
+import uuid
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Batch, PointStruct, VectorParams, Distance
+from qdrant_mcp_server.embedding import _to_matrix
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("bench_vector_path")
+
+def fake_embeddings(count: int, dim: int):
+    """Return per-text float32 vectors the way fastembed yields them."""
+    return list(np.random.default_rng(0).random((count, dim), dtype=np.float32))
+
+def build_list_path(ids, payloads, embeddings):
+    """Previous path: one Python list and one PointStruct per vector."""
+    vectors = [emb.tolist() for emb in embeddings]
+    return [
+        PointStruct(id=ids[i], vector={"default": vectors[i]}, payload=payloads[i])
+        for i in range(len(ids))
+    ]
+
+def build_array_path(ids, payloads, embeddings):
+    """Array path: one contiguous matrix converted once into a columnar batch."""
+    matrix = _to_matrix(embeddings, len(ids))
+    return Batch(ids=ids, vectors={"default": matrix.tolist()}, payloads=payloads)
+
+def measure_build(build, ids, payloads, embeddings):
+    """Return (seconds, allocated blocks still alive, peak bytes) for building one request."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    request = build(ids, payloads, embeddings)
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del request
+    return elapsed, blocks, peak
+
+async def measure_ingest(build, ids, payloads, embeddings, batch_size):
+    """Return points per second for building and upserting all points in batches."""
+    client = AsyncQdrantClient(location=":memory:")
+    await client.create_collection(
+        collection_name="bench",
+        vectors_config={"default": VectorParams(size=len(embeddings[0]), distance=Distance.COSINE)}
+    )
+    start = time.perf_counter()
+    for offset in range(0, len(ids), batch_size):
+        end = offset + batch_size
+        request = build(ids[offset:end], payloads[offset:end], embeddings[offset:end])
+        await client.upsert(collection_name="bench", points=request)
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return len(ids) / elapsed
+
+def main():
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=5000, help="Number of vectors")
+    parser.add_argument("--dim", type=int, default=384, help="Vector dimension")
+    parser.add_argument("--batch-size", type=int, default=256, help="Points per upsert")
+    args = parser.parse_args()
+
+    ids = [str(uuid.uuid4()) for _ in range(args.count)]
+    payloads = [{"text": f"document {i}"} for i in range(args.count)]
+    embeddings = fake_embeddings(args.count, args.dim)
+
+    results = {}
+    for name, build in (("list", build_list_path), ("array", build_array_path)):
+        elapsed, blocks, peak = measure_build(build, ids, payloads, embeddings)
+        throughput = asyncio.run(measure_ingest(build, ids, payloads, embeddings, args.batch_size))
+        results[name] = (elapsed, blocks, peak, throughput)
+        logger.info(
+            f"{name:>5} path: build {elapsed * 1000:.1f} ms, {blocks} live allocations, "
+            f"peak {peak / 2 ** 20:.1f} MiB, ingest {throughput:.0f} points/s"
+        )
+
+    list_result, array_result = results["list"], results["array"]
+    logger.info(
+        f"array vs list: {list_result[0] / array_result[0]:.2f}x faster build, "
+        f"{list_result[1] / max(array_result[1], 1):.2f}x fewer allocations, "
+        f"{array_result[3] / list_result[3]:.2f}x ingest throughput"
+    )
+    return 0
+
+if __name__ == "__main__":
+    main()
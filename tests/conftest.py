@@ -3,9 +3,8 @@ import uuid
 import pytest
 import logging
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient
 from qdrant_mcp_server.embedding import EmbeddingModel
-from qdrant_mcp_server.qdrant_client import QdrantClientWrapper
+from qdrant_mcp_server.qdrant_client import QdrantClientWrapper, QdrantConnectionPool
 
 # Configure logging for tests
 logging.basicConfig(level=logging.INFO, 
@@ -24,11 +23,39 @@ else:
     logger.warning(f".env file not found at {ENV_FILE}, using environment variables")
     load_dotenv()
 
+class MockMCP:
+    """Mock MCP class for testing tools."""
+    
+    def __init__(self):
+        self.registered_tools = {}
+    
+    def tool(self, description=""):
+        """Mock tool decorator."""
+        def decorator(func):
+            self.registered_tools[func.__name__] = func
+            return func
+        return decorator
+
 @pytest.fixture
 def test_logger():
     """Provide a logger for tests."""
     return logger
 
+@pytest.fixture
+def mock_mcp():
+    """Create a mock MCP instance."""
+    return MockMCP()
+
+@pytest.fixture
+def make_local_pool(test_logger):
+    """Return a factory for connection pools backed by Qdrant's in-memory local mode.
+
+    Pools read their settings when created, so set environment variables first.
+    """
+    def make(**overrides):
+        return QdrantConnectionPool(test_logger, location=":memory:", **overrides)
+    return make
+
 @pytest.fixture
 def embedding_model(test_logger):
     """Provide an embedding model instance for tests."""
@@ -49,18 +76,18 @@ def qdrant_client(test_logger):
     return client_wrapper
 
 @pytest.fixture
-def clean_test_collection(qdrant_client, test_collection_name):
+async def clean_test_collection(qdrant_client, test_collection_name):
     """Ensure a clean test collection exists."""
     # Delete collection if it exists
     try:
-        qdrant_client.client.delete_collection(test_collection_name)
+        await qdrant_client.client.delete_collection(test_collection_name)
         logger.info(f"Deleted existing test collection: {test_collection_name}")
     except Exception:
         logger.info(f"Test collection {test_collection_name} did not exist")
     
     # Create a fresh collection with the embedding model's vector size
     embedding_model = EmbeddingModel(logger)
-    qdrant_client.client.recreate_collection(
+    await qdrant_client.client.recreate_collection(
         collection_name=test_collection_name,
         vectors_config={
             "default": {
@@ -75,7 +102,7 @@ def clean_test_collection(qdrant_client, test_collection_name):
     
     # Cleanup after tests
     try:
-        qdrant_client.client.delete_collection(test_collection_name)
+        await qdrant_client.client.delete_collection(test_collection_name)
         logger.info(f"Cleaned up test collection: {test_collection_name}")
     except Exception as e:
         logger.error(f"Failed to clean up test collection: {e}")
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from qdrant_client.http.models import (
+    CompressionRatio, Datatype, Distance, PointStruct, ProductQuantization, VectorParams
+)
+from qdrant_mcp_server.collection_cache import CollectionCache, DENSE_VECTOR_NAME
+
+@pytest.fixture
+def local_client(make_local_pool):
+    """Provide an async client in Qdrant's in-memory local mode."""
+    return make_local_pool().client
+
+@pytest.fixture
+def collection_cache(local_client, test_logger):
+    """Provide a collection cache over the local client."""
+    return CollectionCache(local_client, test_logger)
+
+async def test_ensure_creates_missing_collection_once(collection_cache, local_client):
+    """Test that concurrent writers create a missing collection without wiping it."""
+    infos = await asyncio.gather(*(collection_cache.ensure("docs", 4) for _ in range(5)))
+    
+    assert all(info.vector_name == DENSE_VECTOR_NAME for info in infos)
+    assert infos[0].vector_size == 4
+    
+    await local_client.upsert(
+        collection_name="docs",
+        points=[PointStruct(id=1, vector=infos[0].vector_input([0.1, 0.2, 0.3, 0.4]))]
+    )
+    collection_cache.invalidate("docs")
+    await collection_cache.ensure("docs", 4)
+    
+    assert (await local_client.count("docs")).count == 1
+
+async def test_cached_metadata_skips_round_trips(collection_cache, local_client, monkeypatch):
+    """Test that writes served from the cache don't query the collection again."""
+    await collection_cache.ensure("docs", 4)
+    
+    async def fail(*args, **kwargs):
+        raise AssertionError("collection metadata should come from the cache")
+    
+    monkeypatch.setattr(local_client, "get_collection", fail)
+    monkeypatch.setattr(local_client, "collection_exists", fail)
+    
+    info = await collection_cache.ensure("docs", 4)
+    assert info.distance == "Cosine"
+    assert collection_cache.get_stats()["hits"] >= 1
+
+async def test_unnamed_vector_layout(collection_cache, local_client):
+    """Test that collections with a single unnamed vector are detected."""
+    await local_client.create_collection(
+        collection_name="plain",
+        vectors_config=VectorParams(size=3, distance=Distance.DOT)
+    )
+    
+    info = await collection_cache.get("plain")
+    assert info.vector_name is None
+    assert info.vector_input([1.0, 2.0, 3.0]) == [1.0, 2.0, 3.0]
+    assert info.distance == "Dot"
+
+async def test_size_mismatch_is_rejected(collection_cache):
+    """Test that writing vectors of the wrong size fails before the upsert."""
+    await collection_cache.ensure("docs", 4)
+    
+    with pytest.raises(ValueError):
+        await collection_cache.ensure("docs", 8)
+
+async def test_missing_collection_returns_none(collection_cache):
+    """Test that lookups of absent collections return None."""
+    assert await collection_cache.get("absent") is None
+
+async def test_created_collection_uses_storage_settings(local_client, test_logger, monkeypatch):
+    """Test that quantization, datatype and on-disk settings apply to new collections."""
+    monkeypatch.setenv("COLLECTION_QUANTIZATION", "product")
+    monkeypatch.setenv("COLLECTION_PRODUCT_COMPRESSION", "x8")
+    monkeypatch.setenv("COLLECTION_VECTOR_DATATYPE", "float16")
+    monkeypatch.setenv("COLLECTION_VECTORS_ON_DISK", "True")
+    cache = CollectionCache(local_client, test_logger)
+    
+    await cache.ensure("compact", 4)
+    
+    params = (await local_client.get_collection("compact")).config.params.vectors[DENSE_VECTOR_NAME]
+    assert params.datatype == Datatype.FLOAT16
+    assert params.on_disk is True
+    assert isinstance(params.quantization_config, ProductQuantization)
+    assert params.quantization_config.product.compression == CompressionRatio.X8
+
+@pytest.mark.parametrize("name, value", [
+    ("COLLECTION_QUANTIZATION", "pq"),
+    ("COLLECTION_VECTOR_DATATYPE", "float64"),
+    ("COLLECTION_VECTOR_DATATYPE", "uint8"),
+    ("COLLECTION_PRODUCT_COMPRESSION", "x3"),
+])
+def test_invalid_storage_settings_are_rejected(local_client, test_logger, monkeypatch, name, value):
+    """Test that unknown storage settings fail when the cache is created."""
+    monkeypatch.setenv(name, value)
+    
+    with pytest.raises(ValueError):
+        CollectionCache(local_client, test_logger)
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import time
+import httpx
+import pytest
+from qdrant_mcp_server.qdrant_client import QdrantConnectionPool, _TrackingTransport
+from qdrant_mcp_server.tools.vector import VectorTools
+
+# Simulated network round-trip added to every request by the transport
+SEARCH_LATENCY = 0.05
+
+class DelayedTransport(_TrackingTransport):
+    """Pool transport answering like a Qdrant server, each response arriving after SEARCH_LATENCY."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._on_request(None)
+        await asyncio.sleep(SEARCH_LATENCY)
+        if request.url.path.endswith("/points/query"):
+            limit = json.loads(request.content)["limit"]
+            points = [{"id": i, "version": 0, "score": 1.0 - i / 100, "payload": {"n": i}} for i in range(limit)]
+            result = {"points": points}
+        else:
+            # Anything else the client asks for
+            result = {"title": "qdrant", "version": "1.15.0"}
+        return httpx.Response(200, json={"result": result, "status": "ok", "time": SEARCH_LATENCY}, request=request)
+
+@pytest.fixture
+def slow_search_tools(test_logger, mock_mcp, monkeypatch):
+    """Register vector tools on a remote-mode pool whose HTTP transport adds latency to every request."""
+    monkeypatch.setattr(
+        QdrantConnectionPool,
+        "_create_transport",
+        lambda self, verify: DelayedTransport(self._record_request, verify=verify)
+    )
+    pool = QdrantConnectionPool(test_logger, location="", host="localhost", port=6333, api_key="")
+
+    VectorTools(test_logger, pool=pool).register_tools(mock_mcp)
+    return mock_mcp.registered_tools
+
+async def _throughput(search_vectors, requests: int, in_flight: int) -> float:
+    """Run searches with at most `in_flight` concurrent calls and return requests per second."""
+    semaphore = asyncio.Semaphore(in_flight)
+
+    async def one_search():
+        async with semaphore:
+            result = await search_vectors(collection_name="concurrency", vector=[1.0, 1.0, 0.5, 0.25], limit=3)
+            assert not result[0].text.startswith("Error"), result[0].text
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_search() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+async def test_search_throughput_scales_with_in_flight_requests(slow_search_tools, test_logger):
+    """Test that concurrent searches overlap their network waits instead of blocking the event loop."""
+    search_vectors = slow_search_tools["search_vectors"]
+
+    sequential = await _throughput(search_vectors, requests=8, in_flight=1)
+    concurrent = await _throughput(search_vectors, requests=8, in_flight=8)
+
+    test_logger.info(f"Throughput: {sequential:.1f} req/s sequential, {concurrent:.1f} req/s with 8 in flight")
+    assert concurrent > sequential * 4
+
+async def test_check_connection_fails_fast(test_logger):
+    """Test that the startup check surfaces an unreachable Qdrant instead of waiting for a tool call."""
+    pool = QdrantConnectionPool(test_logger, location="", host="127.0.0.1", port=9, api_key="")
+
+    with pytest.raises(Exception):
+        await pool.check_connection()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import pytest
+from qdrant_mcp_server.qdrant_client import QdrantConnectionPool, get_connection_pool
+from qdrant_mcp_server.tools.point import PointTools
+from qdrant_mcp_server.tools.text import TextTools
+from qdrant_mcp_server.tools.transfer import TransferTools
+from qdrant_mcp_server.tools.vector import VectorTools
+
+def test_tools_share_one_client(make_local_pool, test_logger):
+    """Test that tool classes built from one pool share a single client."""
+    local_pool = make_local_pool()
+    point_tools = PointTools(test_logger, pool=local_pool)
+    vector_tools = VectorTools(test_logger, pool=local_pool)
+    
+    assert point_tools.client is vector_tools.client
+    assert local_pool.get_stats()["consumers"] == 2
+
+def test_tools_share_one_collection_cache(make_local_pool, test_logger):
+    """Test that tools writing collections see each other's creations and invalidations."""
+    local_pool = make_local_pool()
+    text_tools = TextTools(test_logger, pool=local_pool)
+    transfer_tools = TransferTools(test_logger, pool=local_pool)
+    
+    assert text_tools.collections is local_pool.collections
+    assert transfer_tools.collections is local_pool.collections
+
+def test_pool_stats_reflect_configuration(make_local_pool):
+    """Test that pool statistics report the configured limits."""
+    pool = make_local_pool(pool_size=4, keepalive_expiry=5.0)
+    stats = pool.get_stats()
+    
+    assert stats["pool_size"] == 4
+    assert stats["keepalive_expiry"] == 5.0
+    assert stats["hits"] == 0
+    assert stats["misses"] == 0
+
+def test_shared_pool_is_reused(test_logger, monkeypatch):
+    """Test that the process-wide pool is created only once."""
+    monkeypatch.setenv("QDRANT_LOCATION", ":memory:")
+    monkeypatch.setattr("qdrant_mcp_server.qdrant_client._shared_pool", None)
+    
+    assert get_connection_pool(test_logger) is get_connection_pool(test_logger)
+
+@pytest.fixture
+async def fake_qdrant():
+    """Minimal keep-alive HTTP server on localhost answering every request with an empty collection list."""
+    body = json.dumps({"result": {"collections": []}, "status": "ok", "time": 0.0}).encode()
+    connections = []
+    
+    async def handle(reader, writer):
+        connections.append(writer)
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = next(
+                (int(line.split(b":")[1]) for line in head.split(b"\r\n") if line.lower().startswith(b"content-length:")),
+                0
+            )
+            await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+    
+    async def serve(reader, writer):
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+    
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    yield server.sockets[0].getsockname()[1]
+    server.close()
+    for writer in connections:
+        writer.close()
+
+async def test_pool_counts_new_and_reused_connections(fake_qdrant, test_logger):
+    """Test that the tracking transport counts a miss for a new connection and a hit when it is reused."""
+    pool = QdrantConnectionPool(test_logger, location="", host="127.0.0.1", port=fake_qdrant, api_key="")
+    
+    await pool.client.get_collections()
+    stats = pool.get_stats()
+    assert (stats["misses"], stats["hits"], stats["untracked"]) == (1, 0, 0)
+    
+    await pool.client.get_collections()
+    stats = pool.get_stats()
+    assert (stats["misses"], stats["hits"], stats["untracked"]) == (1, 1, 0)
+    assert stats["open_connections"] == 1
+    await pool.client.close()
+
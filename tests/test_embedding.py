@@ -1,5 +1,6 @@
 import pytest
 import numpy as np
+from qdrant_mcp_server.embedding import EmbeddingModel
 
 def test_embedding_model_initialization(embedding_model, test_logger):
     """Test that the embedding model initializes correctly."""
@@ -85,4 +86,90 @@ def test_similar_texts_have_similar_embeddings(embedding_model, test_logger):
     assert sim_1_2 > sim_1_3
     
     test_logger.info(f"Similarity between similar texts: {sim_1_2:.4f}")
-    test_logger.info(f"Similarity between different texts: {sim_1_3:.4f}") 
\ No newline at end of file
+    test_logger.info(f"Similarity between different texts: {sim_1_3:.4f}") 
+
+def test_repeated_text_is_served_from_cache(embedding_model, test_logger):
+    """Test that embedding the same text twice skips inference the second time."""
+    text = "A query that agents repeat constantly."
+    first = embedding_model.embed_text(text)[0]
+    hits_before = embedding_model.cache.get_stats()["hits"]
+    
+    second = embedding_model.embed_text(text)[0]
+    
+    assert embedding_model.cache.get_stats()["hits"] == hits_before + 1
+    assert np.allclose(first, second)
+    test_logger.info(f"Embedding cache stats: {embedding_model.cache.get_stats()}")
+
+def test_model_loads_lazily(test_logger, monkeypatch):
+    """Test that creating the model and reading its vector size don't load it."""
+    monkeypatch.setattr(EmbeddingModel, "_instance", None)
+    monkeypatch.setenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+    monkeypatch.setenv("EMBEDDING_WARMUP", "False")
+    
+    model = EmbeddingModel(test_logger)
+    
+    assert model.vector_size == 384
+    assert model.get_stats()["model_loaded"] is False
+
+def test_process_warm_up_reaches_every_worker(test_logger, monkeypatch):
+    """Test that process-mode warm-up sends one task per worker and leaves the main process unloaded."""
+    monkeypatch.setattr(EmbeddingModel, "_instance", None)
+    monkeypatch.setenv("EMBEDDING_EXECUTOR", "process")
+    monkeypatch.setenv("EMBEDDING_WORKERS", "3")
+    monkeypatch.setenv("EMBEDDING_WARMUP", "False")
+    model = EmbeddingModel(test_logger)
+    model.executor.shutdown()
+    
+    loads = []
+    calls = []
+    
+    async def fake_run(fn, *args):
+        calls.append(fn.__name__)
+        return len(calls)
+    
+    monkeypatch.setattr(model, "_load_model", lambda: loads.append(1) or FakeTextEmbedding())
+    monkeypatch.setattr(model.executor, "run", fake_run)
+    model._warm_up()
+    
+    assert calls == ["_worker_warm_up"] * 3
+    assert loads == []
+
+class FakeTextEmbedding:
+    """Deterministic stand-in for fastembed's TextEmbedding."""
+    
+    def embed(self, texts):
+        for text in texts:
+            yield np.array([len(text), text.count(" "), 1.0, 0.5], dtype=np.float32)
+
+@pytest.fixture
+def fake_embedding_model(test_logger, monkeypatch):
+    """Provide a fresh EmbeddingModel backed by a fake model."""
+    monkeypatch.setattr(EmbeddingModel, "_instance", None)
+    monkeypatch.setenv("EMBEDDING_DISK_CACHE_PATH", "")
+    model = EmbeddingModel(test_logger)
+    model._model = FakeTextEmbedding()
+    model._vector_size = 4
+    return model
+
+def test_embed_array_returns_contiguous_float32_matrix(fake_embedding_model):
+    """Test that the array path returns one contiguous matrix with a row per text."""
+    fake_embedding_model.embed_text("cached text")
+    
+    matrix = fake_embedding_model.embed_array(["cached text", "a new text", "cached text"])
+    
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (3, 4)
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert matrix[1, 0] == len("a new text")
+    assert np.array_equal(matrix[0], matrix[2])
+
+async def test_aembed_array_matches_list_wrapper(fake_embedding_model):
+    """Test that the async array path and the list-returning wrapper agree."""
+    texts = ["one", "two words", "three little words"]
+    
+    matrix = await fake_embedding_model.aembed_array(texts)
+    vectors = fake_embedding_model.embed_text(texts)
+    
+    assert matrix.shape == (3, 4)
+    assert vectors == matrix.tolist()
+    assert all(isinstance(x, float) for x in vectors[0])
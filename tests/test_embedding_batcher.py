@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from qdrant_mcp_server.embedding_batcher import EmbeddingBatcher
+
+class RecordingEmbedder:
+    """Fake batch embedder that records the size of every model call."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    async def __call__(self, texts):
+        self.calls.append(len(texts))
+        await asyncio.sleep(0.001)
+        return [[float(len(text))] for text in texts]
+
+@pytest.fixture
+def embedder():
+    """Provide a recording batch embedder."""
+    return RecordingEmbedder()
+
+@pytest.fixture
+def batcher(embedder, test_logger, monkeypatch):
+    """Create a batcher with a short window and small maximum batch size."""
+    monkeypatch.setenv("EMBEDDING_BATCH_WINDOW_MS", "20")
+    monkeypatch.setenv("EMBEDDING_MAX_BATCH_SIZE", "4")
+    return EmbeddingBatcher(embedder, test_logger)
+
+async def test_concurrent_requests_share_one_call(batcher, embedder):
+    """Test that requests arriving within the window are embedded together."""
+    vectors = await asyncio.gather(*(batcher.embed("x" * i) for i in range(1, 4)))
+    
+    assert vectors == [[1.0], [2.0], [3.0]]
+    assert embedder.calls == [3]
+    
+    stats = batcher.get_stats()
+    assert stats["batches"] == 1
+    assert stats["avg_batch_fill"] == 0.75
+
+async def test_full_batch_is_dispatched_immediately(batcher, embedder):
+    """Test that reaching the maximum batch size flushes without waiting for the window."""
+    vectors = await asyncio.gather(*(batcher.embed("x" * i) for i in range(1, 7)))
+    
+    assert vectors == [[float(i)] for i in range(1, 7)]
+    assert embedder.calls == [4, 2]
+
+async def test_errors_reach_every_caller(test_logger):
+    """Test that a failed model call is reported to each waiting request."""
+    async def failing_embedder(texts):
+        raise RuntimeError("model failure")
+    
+    batcher = EmbeddingBatcher(failing_embedder, test_logger)
+    results = await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+    
+    assert all(isinstance(r, RuntimeError) for r in results)
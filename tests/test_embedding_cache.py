@@ -0,0 +1,98 @@
+import itertools
+import numpy as np
+import pytest
+from qdrant_mcp_server.embedding_cache import EmbeddingCache, PersistentEmbeddingCache
+
+@pytest.fixture
+def cache(test_logger, monkeypatch):
+    """Create a cache that holds at most three entries."""
+    monkeypatch.setenv("EMBEDDING_CACHE_MAX_ENTRIES", "3")
+    monkeypatch.setenv("EMBEDDING_CACHE_MAX_BYTES", "1000000")
+    return EmbeddingCache("test-model", test_logger)
+
+def test_vectors_are_stored_as_float32(cache):
+    """Test that cached vectors are compact float32 arrays."""
+    cache.put("hello", [0.1, 0.2, 0.3])
+    vector = cache.get("hello")
+    
+    assert isinstance(vector, np.ndarray)
+    assert vector.dtype == np.float32
+    assert np.allclose(vector, [0.1, 0.2, 0.3])
+
+def test_lookup_uses_normalized_text(cache):
+    """Test that whitespace differences map to the same entry."""
+    cache.put("What is  the capital?", [1.0])
+    
+    assert cache.get("  What is the\tcapital? ") is not None
+    assert cache.get("what is the capital?") is None
+    
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_least_recently_used_entry_is_evicted(cache):
+    """Test LRU eviction once the entry budget is exceeded."""
+    for text in ["a", "b", "c"]:
+        cache.put(text, [1.0])
+    cache.get("a")
+    cache.put("d", [1.0])
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+def test_byte_budget_is_enforced(test_logger, monkeypatch):
+    """Test that entries are evicted to stay within the byte budget."""
+    monkeypatch.setenv("EMBEDDING_CACHE_MAX_BYTES", "100")
+    cache = EmbeddingCache("test-model", test_logger)
+    
+    cache.put("x", np.zeros(16))
+    cache.put("y", np.zeros(16))
+    
+    stats = cache.get_stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] <= 100
+
+def test_persistent_cache_survives_restart(tmp_path, test_logger):
+    """Test that vectors written to disk are found after reopening the cache."""
+    path = str(tmp_path / "embeddings.sqlite")
+    cache = PersistentEmbeddingCache(path, "test-model", test_logger)
+    cache.put_many(["first", "second"], [[1.0, 2.0], [3.0, 4.0]])
+    cache.close()
+    
+    reopened = PersistentEmbeddingCache(path, "test-model", test_logger)
+    vectors = reopened.get_many(["second", "third", "first"])
+    
+    assert np.allclose(vectors[0], [3.0, 4.0])
+    assert vectors[1] is None
+    assert np.allclose(vectors[2], [1.0, 2.0])
+    assert reopened.get_stats()["hits"] == 2
+
+def test_persistent_cache_is_keyed_by_model(tmp_path, test_logger):
+    """Test that vectors from a different model are never returned."""
+    path = str(tmp_path / "embeddings.sqlite")
+    PersistentEmbeddingCache(path, "model-a", test_logger).put_many(["text"], [[1.0]])
+    
+    assert PersistentEmbeddingCache(path, "model-b", test_logger).get_many(["text"]) == [None]
+
+def test_persistent_cache_compacts_least_recently_used(tmp_path, test_logger, monkeypatch):
+    """Test that exceeding the size limit evicts the oldest entries."""
+    monkeypatch.setenv("EMBEDDING_DISK_CACHE_MAX_ENTRIES", "4")
+    monkeypatch.setenv("EMBEDDING_DISK_CACHE_COMPACT_RATIO", "0.5")
+    # Give every access a distinct timestamp so recency order is deterministic
+    clock = itertools.count()
+    monkeypatch.setattr("qdrant_mcp_server.embedding_cache.time.time", lambda: float(next(clock)))
+    cache = PersistentEmbeddingCache(str(tmp_path / "embeddings.sqlite"), "test-model", test_logger)
+    
+    for i in range(4):
+        cache.put_many([f"text {i}"], [[float(i)]])
+    cache.get_many(["text 0"])
+    cache.put_many(["text 4"], [[4.0]])
+    
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 3
+    vectors = cache.get_many(["text 0", "text 1", "text 4"])
+    assert vectors[0] is not None
+    assert vectors[1] is None
+    assert vectors[2] is not None
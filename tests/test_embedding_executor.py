@@ -0,0 +1,48 @@
+import asyncio
+import time
+import pytest
+from qdrant_mcp_server.embedding_executor import EmbeddingExecutor
+
+def busy_embed(texts):
+    """Stand-in for model inference that holds the worker for a while."""
+    time.sleep(0.05)
+    return [[float(len(text))] for text in texts]
+
+@pytest.fixture
+def executor(test_logger, monkeypatch):
+    """Create a single-worker thread executor with a small queue."""
+    monkeypatch.setenv("EMBEDDING_EXECUTOR", "thread")
+    monkeypatch.setenv("EMBEDDING_WORKERS", "1")
+    monkeypatch.setenv("EMBEDDING_QUEUE_SIZE", "2")
+    executor = EmbeddingExecutor(test_logger)
+    yield executor
+    executor.shutdown()
+
+async def test_event_loop_stays_responsive(executor):
+    """Test that the event loop keeps running while inference is in progress."""
+    ticks = 0
+    
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+    
+    task = asyncio.create_task(ticker())
+    result = await executor.run(busy_embed, ["abc"])
+    task.cancel()
+    
+    assert result == [[3.0]]
+    assert ticks > 3
+
+async def test_queue_depth_and_wait_are_reported(executor, test_logger):
+    """Test that queued submissions are bounded and their wait time is recorded."""
+    results = await asyncio.gather(*(executor.run(busy_embed, ["x" * i]) for i in range(4)))
+    stats = executor.get_stats()
+    test_logger.info(f"Executor stats: {stats}")
+    
+    assert [r[0][0] for r in results] == [0.0, 1.0, 2.0, 3.0]
+    assert stats["completed"] == 4
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 4
+    assert stats["max_wait_ms"] >= 100
@@ -0,0 +1,119 @@
+import json
+import logging
+import threading
+import numpy as np
+import pytest
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+from qdrant_mcp_server.export import _NdjsonWriter, export_collection
+
+logger = logging.getLogger("test_export")
+
+@pytest.fixture
+async def client(make_local_pool):
+    """Local collection with 2-d named vectors; point i has vector [i, -i]."""
+    client = make_local_pool().client
+    await client.create_collection("docs", vectors_config={"default": VectorParams(size=2, distance=Distance.DOT)})
+    await client.upsert("docs", [
+        PointStruct(id=i, vector={"default": [float(i), -float(i)]}, payload={"n": i, "even": i % 2 == 0})
+        for i in range(1, 26)
+    ])
+    yield client
+    await client.close()
+
+def read_ndjson(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+async def test_export_ndjson_and_vectors(client, tmp_path):
+    """Test that payload lines and vector rows line up point by point."""
+    report = await export_collection(client, "docs", str(tmp_path), logger, page_size=10)
+
+    assert report.complete
+    assert report.to_dict()["points"] == 25
+    lines = read_ndjson(tmp_path / "points.ndjson")
+    vectors = np.load(tmp_path / "vectors.default.npy", mmap_mode="r")
+    assert vectors.shape == (25, 2)
+    assert [line["id"] for line in lines] == list(range(1, 26))
+    for line, vector in zip(lines, vectors):
+        assert line["payload"]["n"] == line["id"]
+        assert vector.tolist() == [line["id"], -line["id"]]
+
+async def test_export_filtered_without_vectors(client, tmp_path):
+    """Test that a filter selects the exported points and vectors can be left out."""
+    report = await export_collection(
+        client, "docs", str(tmp_path), logger,
+        with_vectors=False, filter_json='{"must": [{"key": "even", "match": {"value": true}}]}'
+    )
+
+    assert report.to_dict()["total"] == 12
+    assert [line["id"] for line in read_ndjson(tmp_path / "points.ndjson")] == list(range(2, 26, 2))
+    assert not list(tmp_path.glob("*.npy"))
+
+async def test_export_resumes_after_interruption(client, tmp_path):
+    """Test that an interrupted export continues without duplicating or losing points."""
+    async def interrupt(done, total):
+        if done >= 20:
+            raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        await export_collection(client, "docs", str(tmp_path), logger, page_size=10, on_progress=interrupt)
+    manifest = json.loads((tmp_path / "export.json").read_text())
+    assert manifest["rows"] == 20 and not manifest["complete"]
+
+    # Simulate a crash after the payloads of the next page were written
+    with open(tmp_path / "points.ndjson", "a") as f:
+        f.write('{"id": 21, "payload": {}}\n')
+
+    pages = []
+    async def record(done, total):
+        pages.append(done)
+    report = await export_collection(client, "docs", str(tmp_path), logger, page_size=10, on_progress=record)
+
+    assert report.complete
+    assert pages == [25]
+    lines = read_ndjson(tmp_path / "points.ndjson")
+    assert [line["id"] for line in lines] == list(range(1, 26))
+    vectors = np.load(tmp_path / "vectors.default.npy")
+    assert vectors[:, 0].tolist() == list(range(1, 26))
+
+async def test_export_rejects_mismatched_resume(client, tmp_path):
+    """Test that resuming with other settings fails and resume=False starts over."""
+    await export_collection(client, "docs", str(tmp_path), logger, with_vectors=False)
+
+    with pytest.raises(ValueError):
+        await export_collection(client, "docs", str(tmp_path), logger, with_vectors=True)
+
+    report = await export_collection(client, "docs", str(tmp_path), logger, with_vectors=True, resume=False)
+    assert report.complete
+    assert len(read_ndjson(tmp_path / "points.ndjson")) == 25
+
+async def test_export_parquet(client, tmp_path):
+    """Test that Parquet parts hold ids and JSON payloads in point order."""
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    await export_collection(client, "docs", str(tmp_path), logger, payload_format="parquet", page_size=10)
+
+    parts = sorted((tmp_path / "points").glob("part-*.parquet"))
+    assert len(parts) == 3
+    rows = [row for part in parts for row in pq.read_table(part).to_pylist()]
+    assert [row["id"] for row in rows] == [str(i) for i in range(1, 26)]
+    assert json.loads(rows[0]["payload"]) == {"n": 1, "even": False}
+
+async def test_export_writes_pages_off_the_event_loop(client, tmp_path, monkeypatch):
+    """Test that page writes and checkpoints run in worker threads, not on the event loop."""
+    threads = []
+
+    def record_thread(method):
+        def wrapper(self, *args):
+            threads.append(threading.current_thread())
+            return method(self, *args)
+        return wrapper
+
+    monkeypatch.setattr(_NdjsonWriter, "write", record_thread(_NdjsonWriter.write))
+    monkeypatch.setattr(_NdjsonWriter, "checkpoint", record_thread(_NdjsonWriter.checkpoint))
+
+    report = await export_collection(client, "docs", str(tmp_path), logger, page_size=10)
+
+    assert report.complete
+    assert len(threads) == 6
+    assert threading.main_thread() not in threads
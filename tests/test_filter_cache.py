@@ -0,0 +1,51 @@
+import json
+import pytest
+from qdrant_mcp_server.filter_cache import FilterCache
+
+FILTER_JSON = '{"must": [{"key": "category", "match": {"value": "news"}}]}'
+
+def test_equivalent_filters_share_an_entry():
+    """Test that key order and whitespace don't create new entries."""
+    cache = FilterCache()
+    
+    first = cache.parse(FILTER_JSON)
+    second = cache.parse('{"must":[{"match":{"value":"news"},"key":"category"}]}')
+    
+    assert first is second
+    assert first.must[0].key == "category"
+    assert cache.parse(None) is None and cache.parse("") is None
+    stats = cache.get_stats()
+    assert stats["entries"] == 1 and stats["hits"] == 1 and stats["misses"] == 1
+
+def test_invalid_filters_are_cached():
+    """Test that validation errors are cached and raised again on every call."""
+    cache = FilterCache()
+    invalid = '{"must": [{"key": "category", "match": {"valu": "news"}}]}'
+    
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            cache.parse(invalid)
+    with pytest.raises(ValueError):
+        cache.parse("[1, 2]")
+    with pytest.raises(json.JSONDecodeError):
+        cache.parse("{not json")
+    
+    stats = cache.get_stats()
+    assert stats["invalid"] == 2 and stats["hits"] == 2 and stats["entries"] == 2
+
+@pytest.mark.parametrize("size, entries", [("2", 2), ("0", 0)])
+def test_cache_is_bounded(monkeypatch, size, entries):
+    """Test that the least recently used filters are evicted, and that size 0 disables caching."""
+    monkeypatch.setenv("FILTER_CACHE_SIZE", size)
+    cache = FilterCache()
+    filters = [json.dumps({"must": [{"key": "n", "match": {"value": i}}]}) for i in range(3)]
+    
+    cache.parse(filters[0])
+    cache.parse(filters[1])
+    cache.parse(filters[0])
+    cache.parse(filters[2])
+    
+    assert cache.get_stats()["entries"] == entries
+    cache.parse(filters[0])
+    cache.parse(filters[1])
+    assert cache.get_stats()["hits"] == (2 if entries else 0)
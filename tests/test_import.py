@@ -0,0 +1,166 @@
+import json
+import logging
+import threading
+import numpy as np
+import pytest
+from qdrant_client.http.models import PointStruct
+from qdrant_mcp_server.collection_cache import CollectionCache
+from qdrant_mcp_server.export import export_collection
+from qdrant_mcp_server import importer
+from qdrant_mcp_server.importer import import_file
+
+logger = logging.getLogger("test_import")
+
+class FakeEmbedding:
+    """Embeds a text as [length, 1.0] and records the texts it was asked for."""
+    vector_size = 2
+
+    def __init__(self):
+        self.texts = []
+
+    async def aembed_array(self, texts):
+        self.texts.extend(texts)
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+@pytest.fixture
+async def client(make_local_pool):
+    client = make_local_pool().client
+    yield client
+    await client.close()
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return str(path)
+
+async def run_import(client, path, model=None, **kwargs):
+    model = model or FakeEmbedding()
+    return await import_file(
+        client, CollectionCache(client, logger), "docs", path, logger,
+        embed=model.aembed_array, vector_size=model.vector_size, **kwargs
+    )
+
+async def test_import_jsonl_texts(client, tmp_path):
+    """Test that texts are embedded and stored with their ids and remaining fields."""
+    path = write_jsonl(tmp_path / "texts.jsonl", [{"id": i, "text": "x" * i, "tag": i % 3} for i in range(1, 21)])
+
+    report = await run_import(client, path, id_field="id", batch_size=3, parallel=2)
+
+    assert report.complete
+    assert report.to_dict()["points"] == 20 and report.batches == 7
+    points = await client.retrieve("docs", ids=[5], with_vectors=True)
+    assert points[0].payload == {"tag": 2, "text": "xxxxx"}
+    assert points[0].vector["default"][0] > 0
+
+async def test_import_csv_with_derived_ids(client, tmp_path):
+    """Test that CSV rows get stable ids, so importing again overwrites the same points."""
+    path = tmp_path / "texts.csv"
+    path.write_text("text,lang\nhello,en\nbonjour,fr\nhallo,de\n")
+
+    await run_import(client, str(path), batch_size=2)
+    await run_import(client, str(path), batch_size=2, resume=False)
+
+    assert (await client.count("docs")).count == 3
+    points, _ = await client.scroll("docs")
+    assert sorted(point.payload["lang"] for point in points) == ["de", "en", "fr"]
+
+async def test_import_resumes_after_interruption(client, tmp_path):
+    """Test that a resumed import skips the batches stored before the interruption."""
+    path = write_jsonl(tmp_path / "texts.jsonl", [{"id": i, "text": f"text {i}"} for i in range(10)])
+
+    async def interrupt(done, total):
+        if done >= 4:
+            raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        await run_import(client, path, id_field="id", batch_size=2, parallel=1, on_progress=interrupt)
+    checkpoint = json.loads((tmp_path / "texts.jsonl.import.json").read_text())
+    assert checkpoint["done"] == [0, 1] and not checkpoint["complete"]
+
+    model = FakeEmbedding()
+    report = await run_import(client, path, model, id_field="id", batch_size=2, parallel=1)
+
+    assert report.complete
+    assert report.skipped == 2 and report.points == 6
+    assert model.texts == [f"text {i}" for i in range(4, 10)]
+    assert (await client.count("docs")).count == 10
+
+    again = await run_import(client, path, model, id_field="id", batch_size=2, parallel=1)
+    assert again.points == 0 and again.skipped == 5
+
+async def test_import_reads_and_checkpoints_off_the_event_loop(client, tmp_path, monkeypatch):
+    """Test that rows are parsed and checkpoints written in worker threads, not on the event loop."""
+    path = write_jsonl(tmp_path / "texts.jsonl", [{"text": f"text {i}"} for i in range(10)])
+    threads = {"read": [], "checkpoint": []}
+    read_rows = importer.read_rows
+    write_checkpoint = importer._write_checkpoint
+
+    def recording_read_rows(path):
+        for row in read_rows(path):
+            threads["read"].append(threading.current_thread())
+            yield row
+
+    def recording_write_checkpoint(path, state):
+        threads["checkpoint"].append(threading.current_thread())
+        write_checkpoint(path, state)
+
+    monkeypatch.setattr(importer, "read_rows", recording_read_rows)
+    monkeypatch.setattr(importer, "_write_checkpoint", recording_write_checkpoint)
+
+    report = await run_import(client, path, batch_size=2, parallel=2)
+
+    assert report.complete and report.points == 10
+    assert len(threads["read"]) == 10 and len(threads["checkpoint"]) == 6
+    assert threading.main_thread() not in threads["read"] + threads["checkpoint"]
+
+async def test_import_rejects_changed_input(client, tmp_path):
+    """Test that a checkpoint is not applied to a modified file or other settings."""
+    path = write_jsonl(tmp_path / "texts.jsonl", [{"text": "a"}, {"text": "b"}])
+    await run_import(client, path, batch_size=1)
+
+    with pytest.raises(ValueError):
+        await run_import(client, path, batch_size=2)
+    write_jsonl(tmp_path / "texts.jsonl", [{"text": "a"}, {"text": "b"}, {"text": "c"}])
+    with pytest.raises(ValueError):
+        await run_import(client, path, batch_size=1)
+
+async def test_import_exported_vectors(client, make_local_pool, tmp_path):
+    """Test that an export's .npy vectors and NDJSON payloads import into a new collection."""
+    source_pool = make_local_pool()
+    source = source_pool.client
+    await source_pool.collections.ensure("source", 3)
+    await source.upsert("source", [
+        PointStruct(id=i, vector={"default": [float(i), 1.0, 0.0]}, payload={"n": i}) for i in range(1, 8)
+    ])
+    await export_collection(source, "source", str(tmp_path), logger)
+
+    report = await import_file(
+        client, CollectionCache(client, logger), "docs", str(tmp_path / "vectors.default.npy"), logger,
+        payload_path=str(tmp_path / "points.ndjson"), id_field="id", payload_field="payload", batch_size=3
+    )
+
+    assert report.complete and report.points == 7
+    points = await client.retrieve("docs", ids=[6], with_vectors=True)
+    assert points[0].payload == {"n": 6}
+    assert np.allclose(points[0].vector["default"], np.array([6.0, 1.0, 0.0]) / np.linalg.norm([6.0, 1.0, 0.0]))
+
+async def test_import_rejects_missing_text_before_embedding(client, tmp_path):
+    """Test that a row without text fails before its window is embedded."""
+    path = write_jsonl(tmp_path / "texts.jsonl", [{"text": "a"}, {"text": "b"}, {"title": "no text"}])
+    model = FakeEmbedding()
+
+    with pytest.raises(ValueError, match="Row 2"):
+        await run_import(client, path, model, batch_size=2, parallel=2)
+    assert model.texts == []
+
+async def test_import_report_clips_failed_batches(client, tmp_path, monkeypatch):
+    """Test that the last failed batch ends at the number of rows read."""
+    path = write_jsonl(tmp_path / "texts.jsonl", [{"text": f"text {i}"} for i in range(5)])
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("unavailable")
+
+    monkeypatch.setattr(client, "upsert", fail)
+    report = await run_import(client, path, batch_size=2, max_retries=0)
+
+    assert not report.complete
+    assert [(batch["start"], batch["end"]) for batch in report.to_dict()["failed"]] == [(0, 2), (2, 4), (4, 5)]
@@ -0,0 +1,60 @@
+import json
+import pytest
+from qdrant_client.http.models import Distance, Filter, PayloadSchemaType, VectorParams
+from qdrant_mcp_server.index_advisor import classify_condition, filter_conditions
+
+FILTER = Filter(**json.loads("""{
+    "must": [
+        {"key": "category", "match": {"value": "news"}},
+        {"key": "year", "range": {"gte": 2020}},
+        {"nested": {"key": "authors", "filter": {"must": [{"key": "id", "match": {"any": [1, 2]}}]}}}
+    ],
+    "should": [{"key": "body", "match": {"text": "qdrant"}}],
+    "must_not": [{"key": "published", "match": {"value": false}}, {"key": "tags", "values_count": {"gt": 1}}]
+}"""))
+
+def test_filter_fields_and_index_types():
+    """Test that every field condition is found and mapped to the index it needs."""
+    fields = {key: classify_condition(condition) for key, condition in filter_conditions(FILTER)}
+
+    assert fields == {
+        "category": ("value", PayloadSchemaType.KEYWORD),
+        "year": ("range", PayloadSchemaType.FLOAT),
+        "authors[].id": ("any", PayloadSchemaType.INTEGER),
+        "body": ("text", PayloadSchemaType.TEXT),
+        "published": ("value", PayloadSchemaType.BOOL),
+        "tags": None,
+    }
+
+def test_fields_become_due_at_threshold(make_local_pool, monkeypatch):
+    """Test that fields are counted once per filter and recommended at the threshold."""
+    monkeypatch.setenv("PAYLOAD_INDEX_THRESHOLD", "2")
+    advisor = make_local_pool().index_advisor
+    category = Filter(**json.loads('{"should": [{"key": "category", "match": {"value": "a"}}, {"key": "category", "match": {"any": ["b"]}}]}'))
+
+    assert advisor.record("docs", category) == {}
+    assert advisor.record("docs", category) == {"category": PayloadSchemaType.KEYWORD}
+    assert advisor.record("docs", None) == {}
+
+    stats = advisor.get_stats()["collections"]["docs"]["category"]
+    assert stats["uses"] == 2 and stats["match_types"] == {"value": 2}
+    assert stats["suggested_index"] == "keyword" and stats["recommended"]
+
+@pytest.mark.parametrize("auto_create, created", [(False, 0), (True, 1)])
+async def test_observe_creates_indexes_when_enabled(make_local_pool, monkeypatch, auto_create, created):
+    """Test that due indexes are only created with auto-creation enabled, and only once."""
+    monkeypatch.setenv("PAYLOAD_INDEX_THRESHOLD", "3")
+    monkeypatch.setenv("PAYLOAD_INDEX_AUTO_CREATE", str(auto_create))
+    pool = make_local_pool()
+    client, advisor = pool.client, pool.index_advisor
+    await client.create_collection("docs", vectors_config=VectorParams(size=2, distance=Distance.DOT))
+    year = Filter(**json.loads('{"must": [{"key": "year", "match": {"value": 2024}}]}'))
+
+    for _ in range(5):
+        await advisor.observe("docs", year)
+
+    stats = advisor.get_stats()
+    assert stats["created"] == created
+    field = stats["collections"]["docs"]["year"]
+    assert field["index"] == ("integer" if auto_create else None)
+    assert field["recommended"] is not auto_create
@@ -0,0 +1,113 @@
+import asyncio
+import numpy as np
+import pytest
+from qdrant_client.http.models import PointStruct
+from qdrant_mcp_server.ingest import stream_texts, upsert_batches
+
+@pytest.fixture
+def local_pool(make_local_pool):
+    """Provide a pool in Qdrant's in-memory local mode."""
+    return make_local_pool()
+
+@pytest.fixture
+def local_client(local_pool):
+    """Provide the local pool's async client."""
+    return local_pool.client
+
+@pytest.fixture
+async def collection_info(local_pool):
+    """Create a collection for ingestion and return its metadata."""
+    return await local_pool.collections.ensure("ingest", 2)
+
+async def test_stream_texts_overlaps_embedding_and_upsert(local_client, collection_info, test_logger, monkeypatch):
+    """Test that texts are stored in chunks with embedding running ahead of upserts."""
+    events = []
+    
+    async def embed(texts):
+        events.append(f"embed {texts[0]}")
+        await asyncio.sleep(0.01)
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+    
+    upsert = local_client.upsert
+    
+    async def slow_upsert(*args, **kwargs):
+        events.append("upsert started")
+        await asyncio.sleep(0.02)
+        events.append("upsert finished")
+        return await upsert(*args, **kwargs)
+    
+    monkeypatch.setattr(local_client, "upsert", slow_upsert)
+    
+    progress = []
+    
+    async def on_progress(batch, done, total):
+        progress.append((batch, done, total))
+    
+    texts = [f"text {i}" for i in range(10)]
+    batches = await stream_texts(
+        local_client, "ingest", collection_info, texts,
+        [{"text": text} for text in texts], list(range(10)),
+        embed, 4, test_logger, on_progress=on_progress
+    )
+    
+    assert batches == 3
+    assert progress == [(1, 4, 10), (2, 8, 10), (3, 10, 10)]
+    assert (await local_client.count("ingest")).count == 10
+    # The next chunk is embedded while the previous upsert is still in flight
+    assert events[:4] == ["embed text 0", "upsert started", "embed text 4", "upsert finished"]
+
+async def test_stream_texts_with_no_input(local_client, collection_info, test_logger):
+    """Test that an empty input does nothing."""
+    async def embed(texts):
+        raise AssertionError("nothing to embed")
+    
+    assert await stream_texts(local_client, "ingest", collection_info, [], [], [], embed, 4, test_logger) == 0
+
+def build_unnamed_batch(start, end):
+    """Build points with two-dimensional vectors for the given range."""
+    return [PointStruct(id=i, vector=[float(i), 1.0]) for i in range(start, end)]
+
+async def test_upsert_batches_retries_only_failed_batches(local_client, test_logger, monkeypatch):
+    """Test that a failing batch is retried on its own and the rest run in parallel."""
+    await local_client.create_collection("vectors", vectors_config={"size": 2, "distance": "Cosine"})
+    
+    upsert = local_client.upsert
+    attempts = {}
+    in_flight = 0
+    max_in_flight = 0
+    
+    async def flaky_upsert(collection_name, points):
+        nonlocal in_flight, max_in_flight
+        first_id = points[0].id
+        attempts[first_id] = attempts.get(first_id, 0) + 1
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if first_id == 4 and attempts[first_id] == 1:
+            raise RuntimeError("request too large")
+        return await upsert(collection_name=collection_name, points=points)
+    
+    monkeypatch.setattr(local_client, "upsert", flaky_upsert)
+    
+    report = await upsert_batches(
+        local_client, "vectors", 10, build_unnamed_batch,
+        batch_size=2, parallel=3, max_retries=2, logger=test_logger
+    )
+    
+    assert report.failed == {}
+    assert report.retried == 1
+    assert attempts == {0: 1, 2: 1, 4: 2, 6: 1, 8: 1}
+    assert max_in_flight == 3
+    assert (await local_client.count("vectors")).count == 10
+
+async def test_upsert_batches_reports_permanent_failures(local_client, test_logger):
+    """Test that batches that keep failing are reported with their ranges."""
+    report = await upsert_batches(
+        local_client, "missing", 5, build_unnamed_batch,
+        batch_size=2, parallel=2, max_retries=0, logger=test_logger, batches=[2]
+    )
+    
+    failed = report.to_dict()["failed"]
+    assert report.batches == 1
+    assert [(f["batch"], f["start"], f["end"]) for f in failed] == [(2, 4, 5)]
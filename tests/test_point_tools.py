@@ -2,21 +2,11 @@ import pytest
 import json
 import uuid
 import os
+from types import SimpleNamespace
+from qdrant_mcp_server import result_cache
 from qdrant_mcp_server.tools.point import PointTools
 from qdrant_mcp_server.tools.vector import VectorTools
-
-class MockMCP:
-    """Mock MCP class for testing tools."""
-    
-    def __init__(self):
-        self.registered_tools = {}
-    
-    def tool(self, description=""):
-        """Mock tool decorator."""
-        def decorator(func):
-            self.registered_tools[func.__name__] = func
-            return func
-        return decorator
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
 
 @pytest.fixture
 def point_tools(test_logger):
@@ -32,11 +22,6 @@ def vector_tools(test_logger):
     os.environ["QDRANT_VERIFY_SSL"] = "False"
     return VectorTools(test_logger)
 
-@pytest.fixture
-def mock_mcp():
-    """Create a mock MCP instance."""
-    return MockMCP()
-
 @pytest.fixture
 def point_registered_tools(point_tools, mock_mcp):
     """Register point tools with the mock MCP and return them."""
@@ -139,4 +124,50 @@ async def test_delete_points(point_registered_tools, populated_collection, test_
     final_count = int(result[0].text.split(": ")[1])
     assert final_count == new_count - len(delete_ids)
     
-    test_logger.info(f"Deleted {len(delete_ids)} additional points") 
\ No newline at end of file
+    test_logger.info(f"Deleted {len(delete_ids)} additional points") 
+
+@pytest.fixture
+async def local_count_tools(test_logger, make_local_pool, mock_mcp, monkeypatch):
+    """Register point tools on a local collection of 10 points, with a fake clock for the count cache."""
+    monkeypatch.setenv("COUNT_CACHE_TTL", "60")
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(result_cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    pool = make_local_pool()
+    await pool.client.create_collection("local", vectors_config=VectorParams(size=2, distance=Distance.DOT))
+    await pool.client.upsert("local", [
+        PointStruct(id=i, vector=[1.0, 0.0], payload={"even": i % 2 == 0}) for i in range(1, 11)
+    ])
+    PointTools(test_logger, pool=pool).register_tools(mock_mcp)
+    return pool, clock, mock_mcp.registered_tools
+
+async def test_count_points_filtered_and_cached(local_count_tools):
+    """Test filtered and approximate counts, and that cached counts are invalidated by writes."""
+    pool, clock, tools = local_count_tools
+    count_points = tools["count_points"]
+    even = json.dumps({"must": [{"key": "even", "match": {"value": True}}]})
+    
+    assert (await count_points(collection_name="local"))[0].text == "Count: 10"
+    assert (await count_points(collection_name="local", exact=False))[0].text == "Count: 10"
+    assert (await count_points(collection_name="local", filter_json=even))[0].text == "Count: 5"
+    assert "Error" in (await count_points(collection_name="local", filter_json='{"must": 1}'))[0].text
+    
+    # Writes made directly on the client are only seen once the entry expires,
+    # writes through the tools invalidate it at once
+    await pool.client.delete("local", points_selector=[1])
+    assert (await count_points(collection_name="local"))[0].text == "Count: 10"
+    await tools["delete_points"](collection_name="local", ids=[2])
+    assert (await count_points(collection_name="local"))[0].text == "Count: 8"
+    assert pool.count_cache.get_stats()["hits"] == 1
+
+async def test_cached_count_expires_after_ttl(local_count_tools):
+    """Test that a count cached before an outside write is refreshed once COUNT_CACHE_TTL has passed."""
+    pool, clock, tools = local_count_tools
+    count_points = tools["count_points"]
+
+    assert (await count_points(collection_name="local"))[0].text == "Count: 10"
+    await pool.client.delete("local", points_selector=[1, 2, 3])
+
+    clock.now += 59
+    assert (await count_points(collection_name="local"))[0].text == "Count: 10"
+    clock.now += 2
+    assert (await count_points(collection_name="local"))[0].text == "Count: 7"
@@ -0,0 +1,76 @@
+import itertools
+import pytest
+from qdrant_mcp_server import result_cache as result_cache_module
+from qdrant_mcp_server.result_cache import CollectionVersions, ResultCache
+
+@pytest.fixture
+def versions():
+    """Provide fresh collection version counters."""
+    return CollectionVersions()
+
+@pytest.fixture
+def result_cache(versions, test_logger, monkeypatch):
+    """Provide an enabled result cache with a small byte budget."""
+    monkeypatch.setenv("RESULT_CACHE_MAX_BYTES", "100")
+    monkeypatch.setenv("RESULT_CACHE_TTL", "60")
+    return ResultCache(versions, test_logger)
+
+def test_key_is_stable_and_input_sensitive():
+    """Test that keys ignore argument order but not argument values."""
+    key = ResultCache.key("search_vectors", "docs", vector=[0.1, 0.2], limit=3)
+    
+    assert key == ResultCache.key("search_vectors", "docs", limit=3, vector=[0.1, 0.2])
+    assert key != ResultCache.key("search_vectors", "docs", vector=[0.1, 0.2], limit=4)
+    assert key != ResultCache.key("search_vectors", "other", vector=[0.1, 0.2], limit=3)
+
+def test_write_invalidates_collection(result_cache, versions):
+    """Test that bumping a collection's version only invalidates that collection."""
+    result_cache.put("docs", "a", versions.get("docs"), "docs result")
+    result_cache.put("logs", "b", versions.get("logs"), "logs result")
+    assert result_cache.get("docs", "a") == "docs result"
+    
+    versions.bump("docs")
+    
+    assert result_cache.get("docs", "a") is None
+    assert result_cache.get("logs", "b") == "logs result"
+    assert result_cache.get_stats()["stale"] == 1
+
+def test_result_computed_during_write_is_not_cached(result_cache, versions):
+    """Test that a result read before a concurrent write finished is discarded."""
+    version = versions.get("docs")
+    versions.bump("docs")
+    
+    result_cache.put("docs", "a", version, "old result")
+    
+    assert result_cache.get("docs", "a") is None
+
+def test_entries_expire_after_ttl(result_cache, versions, monkeypatch):
+    """Test that entries older than the TTL are misses."""
+    clock = itertools.count(start=0, step=61)
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: next(clock))
+    
+    result_cache.put("docs", "a", versions.get("docs"), "result")
+    
+    assert result_cache.get("docs", "a") is None
+
+def test_byte_budget_evicts_least_recently_used(result_cache, versions):
+    """Test that the byte budget is enforced by evicting the oldest entries."""
+    for key in "abc":
+        result_cache.put("docs", key, 0, key * 40)
+        result_cache.get("docs", "a")
+    
+    stats = result_cache.get_stats()
+    assert stats["bytes"] <= 100
+    assert result_cache.get("docs", "a") == "a" * 40
+    assert result_cache.get("docs", "b") is None
+    assert stats["evictions"] == 1
+
+def test_disabled_by_default(versions, test_logger, monkeypatch):
+    """Test that the cache stores nothing unless a byte budget is configured."""
+    monkeypatch.delenv("RESULT_CACHE_MAX_BYTES", raising=False)
+    cache = ResultCache(versions, test_logger)
+    
+    cache.put("docs", "a", 0, "result")
+    
+    assert cache.enabled is False
+    assert cache.get("docs", "a") is None
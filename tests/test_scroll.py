@@ -0,0 +1,45 @@
+import pytest
+from qdrant_client.http.models import (
+    Distance, FieldCondition, Filter, MatchValue, PointStruct, VectorParams
+)
+from qdrant_mcp_server.scroll import decode_cursor, encode_cursor, scroll_pages
+
+FILTER_JSON = '{"must": [{"key": "even", "match": {"value": true}}]}'
+
+def test_cursor_round_trip():
+    """Test that cursors carry integer and UUID offsets and end with None."""
+    for offset in (42, "3f2b8c1e-6a57-4b8e-9d7c-0a1b2c3d4e5f"):
+        cursor = encode_cursor("docs", FILTER_JSON, offset)
+        assert decode_cursor(cursor, "docs", '{"must":[{"match":{"value":true},"key":"even"}]}') == offset
+    
+    assert encode_cursor("docs", FILTER_JSON, None) is None
+
+@pytest.mark.parametrize("collection, filter_json, cursor", [
+    ("other", FILTER_JSON, None),
+    ("docs", '{"must": []}', None),
+    ("docs", FILTER_JSON, "not a cursor"),
+])
+def test_cursor_is_bound_to_collection_and_filter(collection, filter_json, cursor):
+    """Test that cursors can't be replayed against another query or forged."""
+    cursor = cursor or encode_cursor("docs", FILTER_JSON, 7)
+    
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, collection, filter_json)
+
+async def test_scroll_pages_walks_all_matches(make_local_pool):
+    """Test that pages cover every match once and stop at max_points."""
+    client = make_local_pool().client
+    await client.create_collection("docs", vectors_config=VectorParams(size=2, distance=Distance.DOT))
+    await client.upsert("docs", [
+        PointStruct(id=i, vector=[1.0, 0.0], payload={"even": i % 2 == 0}) for i in range(1, 24)
+    ])
+    even = Filter(must=[FieldCondition(key="even", match=MatchValue(value=True))])
+    
+    pages = [page async for page in scroll_pages(client, "docs", even, page_size=5)]
+    assert [point.id for points, _ in pages for point in points] == list(range(2, 24, 2))
+    assert [len(points) for points, _ in pages] == [5, 5, 1]
+    assert pages[-1][1] is None
+    
+    limited = [page async for page in scroll_pages(client, "docs", even, page_size=5, max_points=7)]
+    assert [len(points) for points, _ in limited] == [5, 2]
+    assert limited[-1][1] == 16
@@ -0,0 +1,67 @@
+import pytest
+from qdrant_client.http.models import PayloadSelectorExclude, PayloadSelectorInclude
+from qdrant_mcp_server.search_params import (
+    ALL_COLLECTIONS, build_payload_selector, build_search_params, get_search_defaults, resolve_search_params
+)
+
+@pytest.fixture(autouse=True)
+def clear_search_env(monkeypatch):
+    """Start every test without search defaults from the environment."""
+    for variable in ("SEARCH_HNSW_EF", "SEARCH_EXACT", "SEARCH_INDEXED_ONLY", "SEARCH_IGNORE_QUANTIZATION",
+                     "SEARCH_RESCORE", "SEARCH_OVERSAMPLING", "SEARCH_COLLECTION_PARAMS"):
+        monkeypatch.setenv(variable, "")
+
+def test_no_options_uses_qdrant_defaults():
+    """Test that no search params are sent when nothing is configured."""
+    assert build_search_params({}) is None
+    assert resolve_search_params(get_search_defaults(), "docs", hnsw_ef=None) is None
+
+def test_options_map_to_search_params():
+    """Test that HNSW and quantization options end up in the right fields."""
+    params = build_search_params({"hnsw_ef": 128, "indexed_only": True, "rescore": True, "oversampling": 2.0})
+    
+    assert params.hnsw_ef == 128
+    assert params.indexed_only is True
+    assert params.exact is None
+    assert params.quantization.rescore is True
+    assert params.quantization.oversampling == 2.0
+
+def test_explicit_options_override_collection_and_server_defaults(monkeypatch):
+    """Test the precedence of request options, collection defaults and server defaults."""
+    monkeypatch.setenv("SEARCH_HNSW_EF", "64")
+    monkeypatch.setenv("SEARCH_EXACT", "false")
+    monkeypatch.setenv("SEARCH_COLLECTION_PARAMS", '{"docs": {"hnsw_ef": 256, "oversampling": 3.0}}')
+    defaults = get_search_defaults()
+    
+    assert defaults[ALL_COLLECTIONS] == {"hnsw_ef": 64, "exact": False}
+    
+    other = resolve_search_params(defaults, "other")
+    assert other.hnsw_ef == 64 and other.quantization is None
+    
+    docs = resolve_search_params(defaults, "docs")
+    assert docs.hnsw_ef == 256 and docs.quantization.oversampling == 3.0
+    
+    exact = resolve_search_params(defaults, "docs", exact=True, hnsw_ef=None)
+    assert exact.exact is True and exact.hnsw_ef == 256
+
+@pytest.mark.parametrize("value", [
+    '{"docs": {"ef": 10}}',
+    '{"docs": {"hnsw_ef": "many"}}',
+    '["docs"]',
+])
+def test_invalid_collection_defaults_are_rejected(monkeypatch, value):
+    """Test that malformed per-collection defaults fail at startup."""
+    monkeypatch.setenv("SEARCH_COLLECTION_PARAMS", value)
+    
+    with pytest.raises(ValueError):
+        get_search_defaults()
+
+def test_payload_selector():
+    """Test the payload selector built from projection options."""
+    assert build_payload_selector() is True
+    assert build_payload_selector(with_payload=False, include=["a"]) is False
+    assert build_payload_selector(include=["a", "meta.b"]) == PayloadSelectorInclude(include=["a", "meta.b"])
+    assert build_payload_selector(exclude=["text"]) == PayloadSelectorExclude(exclude=["text"])
+    
+    with pytest.raises(ValueError):
+        build_payload_selector(include=["a"], exclude=["b"])
@@ -0,0 +1,64 @@
+import json
+import pytest
+from qdrant_client.http.models import Record, ScoredPoint
+from qdrant_mcp_server import serialization
+from qdrant_mcp_server.serialization import ResponseSerializer
+
+@pytest.fixture
+def make_serializer(test_logger, monkeypatch):
+    """Create serializers with the given RESPONSE_* settings."""
+    def make(**settings):
+        for name in ("RESPONSE_OMIT_VECTORS", "RESPONSE_VECTOR_PRECISION", "RESPONSE_MAX_BYTES"):
+            monkeypatch.delenv(name, raising=False)
+        for name, value in settings.items():
+            monkeypatch.setenv(f"RESPONSE_{name.upper()}", str(value))
+        return ResponseSerializer(test_logger)
+    return make
+
+def hits(count):
+    """Return scored points with a payload and a named vector."""
+    return [
+        ScoredPoint(id=i, version=0, score=1.0 / (i + 1), payload={"n": i},
+                    vector={"default": [0.123456789, -1.0, 2.5]})
+        for i in range(count)
+    ]
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_points_are_compact_json(make_serializer, monkeypatch, use_orjson):
+    """Test that points are reduced to compact JSON with either encoder."""
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+    serializer = make_serializer()
+    
+    text = serializer.serialize([Record(id="a", payload={"text": "héllo"})] + hits(1))
+    
+    assert " " not in text.replace("héllo", "")
+    assert json.loads(text) == [
+        {"id": "a", "payload": {"text": "héllo"}},
+        {"id": 0, "score": 1.0, "payload": {"n": 0}, "vector": {"default": [0.123456789, -1.0, 2.5]}},
+    ]
+
+def test_vectors_can_be_rounded_or_omitted(make_serializer):
+    """Test vector rounding and omission."""
+    rounded = json.loads(make_serializer(vector_precision=3).serialize(hits(1)))
+    assert rounded[0]["vector"] == {"default": [0.123, -1.0, 2.5]}
+    
+    omitted = json.loads(make_serializer(omit_vectors="True").serialize(hits(1)))
+    assert "vector" not in omitted[0]
+
+def test_oversized_list_is_truncated_with_metadata(make_serializer):
+    """Test that responses over the cap keep the leading items and say what was dropped."""
+    serializer = make_serializer(max_bytes=500)
+    
+    text = serializer.serialize(hits(50))
+    result = json.loads(text)
+    
+    assert len(text.encode("utf-8")) <= 500
+    assert result["truncated"] is True
+    assert result["total"] == 50
+    assert result["returned"] == len(result["results"]) > 0
+    assert [hit["id"] for hit in result["results"]] == list(range(result["returned"]))
+
+def test_small_responses_are_not_wrapped(make_serializer):
+    """Test that responses under the cap keep their original shape."""
+    assert json.loads(make_serializer(max_bytes=10000).serialize(hits(2)))[1]["id"] == 1
@@ -2,21 +2,13 @@ import pytest
 import json
 import uuid
 import os
+import threading
+import numpy as np
+from types import SimpleNamespace
+from qdrant_client.http.models import Distance, VectorParams
+from qdrant_mcp_server.embedding import EmbeddingModel
 from qdrant_mcp_server.tools.text import TextTools
 
-class MockMCP:
-    """Mock MCP class for testing tools."""
-    
-    def __init__(self):
-        self.registered_tools = {}
-    
-    def tool(self, description=""):
-        """Mock tool decorator."""
-        def decorator(func):
-            self.registered_tools[func.__name__] = func
-            return func
-        return decorator
-
 @pytest.fixture
 def text_tools(test_logger):
     """Create a TextTools instance for testing."""
@@ -24,17 +16,55 @@ def text_tools(test_logger):
     os.environ["QDRANT_VERIFY_SSL"] = "False"
     return TextTools(test_logger)
 
-@pytest.fixture
-def mock_mcp():
-    """Create a mock MCP instance."""
-    return MockMCP()
-
 @pytest.fixture
 def registered_tools(text_tools, mock_mcp):
     """Register tools with the mock MCP and return them."""
     text_tools.register_tools(mock_mcp)
     return mock_mcp.registered_tools
 
+class KeywordEmbedding:
+    """Fake model embedding texts by keyword counts, recording each model call."""
+    
+    KEYWORDS = ("cat", "dog", "fish")
+    
+    def __init__(self):
+        self.calls = []
+    
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        for text in texts:
+            yield np.array([text.count(word) for word in self.KEYWORDS] + [0.1], dtype=np.float32)
+
+class WordSparseEmbedding:
+    """Fake sparse model with one dimension per distinct word, recording the threads it runs in."""
+    
+    def __init__(self):
+        self.vocabulary = {}
+        self.threads = set()
+    
+    def _embed(self, text):
+        self.threads.add(threading.current_thread().name)
+        words = sorted({self.vocabulary.setdefault(word, len(self.vocabulary)) for word in text.lower().split()})
+        return SimpleNamespace(indices=np.array(words), values=np.ones(len(words), dtype=np.float32))
+    
+    def embed(self, texts):
+        return [self._embed(text) for text in texts]
+    
+    def query_embed(self, query):
+        return self.embed([query] if isinstance(query, str) else query)
+
+@pytest.fixture
+def local_tools(test_logger, make_local_pool, mock_mcp, monkeypatch):
+    """Register text tools over in-memory Qdrant and a fake embedding model."""
+    monkeypatch.setattr(EmbeddingModel, "_instance", None)
+    monkeypatch.setenv("EMBEDDING_DISK_CACHE_PATH", "")
+    monkeypatch.setenv("RESULT_CACHE_MAX_BYTES", str(1024 * 1024))
+    tools = TextTools(test_logger, pool=make_local_pool())
+    tools.embedding_model._model = KeywordEmbedding()
+    tools.embedding_model._vector_size = 4
+    tools.register_tools(mock_mcp)
+    return tools, mock_mcp.registered_tools
+
 async def test_store_text(registered_tools, clean_test_collection, test_logger):
     """Test storing a single text as a vector."""
     store_text = registered_tools["store_text"]
@@ -171,4 +201,120 @@ async def test_store_texts(registered_tools, clean_test_collection, sample_texts
     assert result is not None
     assert f"{len(subset_texts)} texts stored successfully" in result[0].text
     
-    test_logger.info(f"Stored {len(sample_texts)} texts and {len(subset_texts)} texts with custom IDs") 
\ No newline at end of file
+    test_logger.info(f"Stored {len(sample_texts)} texts and {len(subset_texts)} texts with custom IDs") 
+
+async def test_search_similar_texts(local_tools):
+    """Test that several queries are embedded in one model call and answered per query."""
+    tools, registered = local_tools
+    await registered["store_texts"](
+        texts=["a cat sleeps", "a dog barks", "a fish swims"],
+        metadatas=[{"animal": "cat"}, {"animal": "dog"}, {"animal": "fish"}],
+        collection_name="animals"
+    )
+    model = tools.embedding_model.model
+    model.calls.clear()
+    
+    result = await registered["search_similar_texts"](
+        queries=["dog", "fish", "cat"],
+        limit=1,
+        collection_name="animals"
+    )
+    groups = json.loads(result[0].text)
+    
+    assert model.calls == [["dog", "fish", "cat"]]
+    assert [group["query"] for group in groups] == ["dog", "fish", "cat"]
+    assert [group["results"][0]["metadata"]["animal"] for group in groups] == ["dog", "fish", "cat"]
+    assert groups[0]["results"][0]["text"] == "a dog barks"
+    
+    result = await registered["search_similar_texts"](queries=["cat"], collection_name="missing")
+    assert result[0].text == "Error: Collection missing not found"
+
+async def test_invalid_filter_fails_before_embedding(local_tools):
+    """Test that a bad filter is rejected without running the embedding model."""
+    tools, registered = local_tools
+    await registered["store_text"](text="a cat", collection_name="animals")
+    submitted = tools.embedding_model.executor.get_stats()["submitted"]
+    
+    for _ in range(2):
+        result = await registered["search_similar_text"](
+            query="an uncached query", collection_name="animals", filter_json='{"must": 1}'
+        )
+        assert result[0].text.startswith("Error parsing filter")
+    
+    assert tools.embedding_model.executor.get_stats()["submitted"] == submitted
+    assert tools.embedding_model.cache.get_stats()["misses"] == 1
+
+async def test_search_results_are_cached_until_a_write(local_tools):
+    """Test that repeated searches skip Qdrant until the collection is written to."""
+    tools, registered = local_tools
+    await registered["store_text"](text="a cat sleeps", collection_name="animals")
+    
+    first = await registered["search_similar_text"](query="cat", collection_name="animals")
+    second = await registered["search_similar_text"](query="cat", collection_name="animals")
+    
+    assert second[0].text == first[0].text
+    assert tools.result_cache.get_stats()["hits"] == 1
+    
+    await registered["store_text"](text="another cat purrs", collection_name="animals")
+    third = await registered["search_similar_text"](query="cat", collection_name="animals")
+    
+    assert len(json.loads(third[0].text)) == 2
+    assert tools.result_cache.get_stats()["hits"] == 1
+
+async def test_search_payload_projection(local_tools):
+    """Test that only the requested payload fields are returned."""
+    _, registered = local_tools
+    await registered["store_text"](
+        text="a cat sleeps",
+        metadata={"animal": "cat", "notes": "x" * 1000},
+        collection_name="animals"
+    )
+    
+    result = await registered["search_similar_text"](
+        query="cat", collection_name="animals", payload_include=["animal"], include_text=False
+    )
+    hit = json.loads(result[0].text)[0]
+    assert "text" not in hit
+    assert hit["metadata"] == {"animal": "cat"}
+    
+    result = await registered["search_similar_texts"](
+        queries=["cat"], collection_name="animals", payload_exclude=["notes"]
+    )
+    hit = json.loads(result[0].text)[0]["results"][0]
+    assert hit["text"] == "a cat sleeps"
+    assert hit["metadata"] == {"animal": "cat"}
+
+async def test_hybrid_search(local_tools):
+    """Test that texts get sparse vectors and hybrid search fuses both rankings."""
+    tools, registered = local_tools
+    
+    result = await registered["hybrid_search"](query="zebra", collection_name="hybrid")
+    assert "SPARSE_EMBEDDING_MODEL" in result[0].text
+    
+    tools.sparse_model.model_name = "test/word-sparse"
+    tools.sparse_model._model = sparse = WordSparseEmbedding()
+    submitted = tools.embedding_model.executor.get_stats()["submitted"]
+    await registered["store_texts"](
+        texts=["a cat", "a dog", "zebra crossing", "fish and cat"],
+        collection_name="hybrid",
+        point_ids=[1, 2, 3, 4]
+    )
+    await registered["store_text"](text="zebra", collection_name="hybrid", point_id=5)
+    
+    points = await tools.client.retrieve("hybrid", ids=[3, 5], with_vectors=True)
+    assert all(set(point.vector) == {"default", "sparse"} for point in points)
+    
+    result = await registered["hybrid_search"](query="zebra crossing", limit=3, collection_name="hybrid")
+    hits = json.loads(result[0].text)
+    # The fake dense model can't tell them apart; the keyword match ranks them first
+    assert {hit["text"] for hit in hits[:2]} == {"zebra crossing", "zebra"}
+    assert hits[0]["score"] > hits[2]["score"]
+    
+    # Sparse inference is queued in the shared embedding executor
+    assert all(name.startswith("embedding") for name in sparse.threads)
+    assert tools.embedding_model.executor.get_stats()["submitted"] >= submitted + 3
+    
+    # Collections without the sparse vector are rejected
+    await tools.client.create_collection("dense", vectors_config=VectorParams(size=4, distance=Distance.COSINE))
+    result = await registered["hybrid_search"](query="zebra", collection_name="dense")
+    assert "no 'sparse' sparse vector" in result[0].text
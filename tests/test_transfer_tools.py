@@ -0,0 +1,84 @@
+import os
+import pytest
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+from qdrant_mcp_server.tools.transfer import TransferTools
+
+@pytest.fixture
+async def transfer_tools(test_logger, make_local_pool, mock_mcp, tmp_path, monkeypatch):
+    """Register transfer tools on a local collection, with TRANSFER_DIR set to tmp_path/transfers."""
+    monkeypatch.setenv("TRANSFER_DIR", str(tmp_path / "transfers"))
+    pool = make_local_pool()
+    await pool.client.create_collection("docs", vectors_config={"default": VectorParams(size=2, distance=Distance.DOT)})
+    await pool.client.upsert("docs", [
+        PointStruct(id=i, vector={"default": [float(i), 1.0]}, payload={"n": i}) for i in range(1, 6)
+    ])
+
+    TransferTools(test_logger, pool=pool).register_tools(mock_mcp)
+    return mock_mcp.registered_tools
+
+async def test_export_writes_below_transfer_dir(transfer_tools, tmp_path):
+    """Test that export paths are resolved against the transfer directory."""
+    result = await transfer_tools["export_collection"](collection_name="docs", output_dir="docs")
+
+    assert not result[0].text.startswith("Error"), result[0].text
+    assert (tmp_path / "transfers" / "docs" / "points.ndjson").exists()
+
+@pytest.mark.parametrize("output_dir", ["../outside", "/tmp/outside", "docs/../../outside"])
+async def test_export_rejects_paths_outside_transfer_dir(transfer_tools, tmp_path, output_dir):
+    """Test that exports cannot write anywhere else on the server."""
+    result = await transfer_tools["export_collection"](collection_name="docs", output_dir=output_dir, resume=False)
+
+    assert result[0].text.startswith("Error")
+    assert "outside the transfer directory" in result[0].text
+    assert not (tmp_path / "outside").exists()
+
+async def test_export_rejects_symlinks_leaving_transfer_dir(transfer_tools, tmp_path):
+    """Test that a symlink inside the transfer directory does not lead out of it."""
+    (tmp_path / "transfers").mkdir()
+    (tmp_path / "elsewhere").mkdir()
+    os.symlink(tmp_path / "elsewhere", tmp_path / "transfers" / "link")
+
+    result = await transfer_tools["export_collection"](collection_name="docs", output_dir="link")
+
+    assert "outside the transfer directory" in result[0].text
+    assert not list((tmp_path / "elsewhere").iterdir())
+
+async def test_import_reads_below_transfer_dir(transfer_tools, tmp_path):
+    """Test that import paths are resolved against the transfer directory and checkpointed there."""
+    await transfer_tools["export_collection"](collection_name="docs", output_dir="docs")
+
+    result = await transfer_tools["import_file"](
+        path="docs/vectors.default.npy",
+        collection_name="copy",
+        payload_path="docs/points.ndjson",
+        id_field="id",
+        payload_field="payload"
+    )
+
+    assert not result[0].text.startswith("Error"), result[0].text
+    assert (tmp_path / "transfers" / "docs" / "vectors.default.npy.import.json").exists()
+
+@pytest.mark.parametrize("path, payload_path", [
+    ("../secret.jsonl", None),
+    ("/etc/hostname", None),
+    ("docs/vectors.default.npy", "../secret.jsonl"),
+])
+async def test_import_rejects_paths_outside_transfer_dir(transfer_tools, tmp_path, path, payload_path):
+    """Test that imports cannot read files elsewhere on the server."""
+    (tmp_path / "secret.jsonl").write_text('{"text": "secret"}\n')
+    await transfer_tools["export_collection"](collection_name="docs", output_dir="docs")
+
+    result = await transfer_tools["import_file"](path=path, collection_name="copy", payload_path=payload_path)
+
+    assert "outside the transfer directory" in result[0].text
+    assert not (tmp_path / "secret.jsonl.import.json").exists()
+
+async def test_import_rejects_checkpoint_symlinks_leaving_transfer_dir(transfer_tools, tmp_path):
+    """Test that a checkpoint symlinked out of the transfer directory is not written."""
+    await transfer_tools["export_collection"](collection_name="docs", output_dir="docs")
+    os.symlink(tmp_path / "elsewhere.json", tmp_path / "transfers" / "docs" / "vectors.default.npy.import.json")
+
+    result = await transfer_tools["import_file"](path="docs/vectors.default.npy", collection_name="copy")
+
+    assert "outside the transfer directory" in result[0].text
+    assert not (tmp_path / "elsewhere.json").exists()
@@ -3,22 +3,10 @@ import json
 import uuid
 import os
 import numpy as np
+from qdrant_client.http.models import Distance, VectorParams
 from qdrant_mcp_server.tools.vector import VectorTools
 from qdrant_mcp_server.embedding import EmbeddingModel
 
-class MockMCP:
-    """Mock MCP class for testing tools."""
-    
-    def __init__(self):
-        self.registered_tools = {}
-    
-    def tool(self, description=""):
-        """Mock tool decorator."""
-        def decorator(func):
-            self.registered_tools[func.__name__] = func
-            return func
-        return decorator
-
 @pytest.fixture
 def vector_tools(test_logger):
     """Create a VectorTools instance for testing."""
@@ -26,17 +14,29 @@ def vector_tools(test_logger):
     os.environ["QDRANT_VERIFY_SSL"] = "False"
     return VectorTools(test_logger)
 
-@pytest.fixture
-def mock_mcp():
-    """Create a mock MCP instance."""
-    return MockMCP()
-
 @pytest.fixture
 def registered_tools(vector_tools, mock_mcp):
     """Register tools with the mock MCP and return them."""
     vector_tools.register_tools(mock_mcp)
     return mock_mcp.registered_tools
 
+@pytest.fixture
+async def local_tools(test_logger, make_local_pool, mock_mcp):
+    """Register vector tools over a small in-memory collection."""
+    pool = make_local_pool()
+    await pool.client.create_collection(
+        collection_name="local",
+        vectors_config=VectorParams(size=3, distance=Distance.COSINE)
+    )
+    VectorTools(test_logger, pool=pool).register_tools(mock_mcp)
+    await mock_mcp.registered_tools["upsert_vectors"](
+        collection_name="local",
+        vectors=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [1.0, 1.0, 0.0]],
+        ids=[1, 2, 3, 4],
+        metadata=[{"axis": "x"}, {"axis": "y"}, {"axis": "z"}, {"axis": "xy"}]
+    )
+    return mock_mcp.registered_tools
+
 async def test_upsert_vectors(registered_tools, clean_test_collection, sample_vectors, 
                               sample_ids, sample_metadata, test_logger):
     """Test uploading vectors to a collection."""
@@ -179,4 +179,111 @@ async def test_filter_search(registered_tools, clean_test_collection, sample_vec
                          if meta["population"] > 3.0]
     
     for country in high_pop_countries:
-        assert country in result_text 
\ No newline at end of file
+        assert country in result_text 
+
+async def test_search_vectors_batch(local_tools):
+    """Test that batched searches return results grouped per query."""
+    search_vectors_batch = local_tools["search_vectors_batch"]
+    
+    result = await search_vectors_batch(
+        collection_name="local",
+        vectors=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        limits=[2, 1, 3],
+        filter_jsons=[None, json.dumps({"must": [{"key": "axis", "match": {"value": "xy"}}]}), None]
+    )
+    groups = json.loads(result[0].text)
+    
+    assert [group["query"] for group in groups] == [0, 1, 2]
+    assert [point["id"] for point in groups[0]["points"]] == [1, 4]
+    assert [point["id"] for point in groups[1]["points"]] == [4]
+    assert groups[1]["points"][0]["payload"] == {"axis": "xy"}
+    assert groups[2]["points"][0]["id"] == 3 and len(groups[2]["points"]) == 3
+    
+    # Mismatched per-query options are rejected before searching
+    result = await search_vectors_batch(collection_name="local", vectors=[[1.0, 0.0, 0.0]], limits=[1, 2])
+    assert result[0].text.startswith("Error:")
+
+async def test_filter_search_pagination(test_logger, make_local_pool, mock_mcp, monkeypatch):
+    """Test that cursors walk every match once, in pages or in stream mode under a size cap."""
+    monkeypatch.setenv("RESPONSE_MAX_BYTES", "1500")
+    pool = make_local_pool()
+    await pool.client.create_collection(
+        collection_name="paged",
+        vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+    )
+    VectorTools(test_logger, pool=pool).register_tools(mock_mcp)
+    await mock_mcp.registered_tools["upsert_vectors"](
+        collection_name="paged",
+        vectors=[[1.0, float(i)] for i in range(1, 101)],
+        ids=list(range(1, 101)),
+        metadata=[{"group": "a" if i % 4 else "b", "blob": "x" * 40} for i in range(1, 101)]
+    )
+    filter_search = mock_mcp.registered_tools["filter_search"]
+    filter_json = json.dumps({"must": [{"key": "group", "match": {"value": "a"}}]})
+    expected = [i for i in range(1, 101) if i % 4]
+    
+    for stream in (False, True):
+        seen, cursor = [], None
+        while True:
+            result = await filter_search(
+                collection_name="paged", filter_json=filter_json, limit=10, cursor=cursor, stream=stream
+            )
+            page = json.loads(result[0].text)
+            assert len(result[0].text) <= 1500
+            seen += [point["id"] for point in page["points"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == expected
+    
+    result = await filter_search(collection_name="paged", filter_json="{}", cursor=cursor or "bogus")
+    assert result[0].text.startswith("Error:")
+
+async def test_upsert_vectors_rejects_out_of_range_retry_batches(test_logger, make_local_pool, mock_mcp):
+    """Test that retry_batches outside the batches of the vectors fail without uploading anything."""
+    pool = make_local_pool()
+    await pool.client.create_collection("retry", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+    VectorTools(test_logger, pool=pool).register_tools(mock_mcp)
+    upsert_vectors = mock_mcp.registered_tools["upsert_vectors"]
+    vectors = [[float(i), 1.0, 0.0] for i in range(10)]
+    
+    for retry_batches in ([-1], [99], [0, 5]):
+        result = await upsert_vectors(
+            collection_name="retry", vectors=vectors, ids=list(range(1, 11)), batch_size=2, retry_batches=retry_batches
+        )
+        assert result[0].text.startswith("Error:") and "out of range" in result[0].text
+    assert (await pool.client.count("retry")).count == 0
+    
+    result = await upsert_vectors(
+        collection_name="retry", vectors=vectors, ids=list(range(1, 11)), batch_size=2, retry_batches=[4]
+    )
+    assert result[0].text.startswith("Vectors uploaded successfully")
+    points, _ = await pool.client.scroll("retry")
+    assert sorted(point.id for point in points) == [9, 10]
+
+@pytest.mark.parametrize("ids, metadata, message", [
+    ([1, 2], None, "2 ids for 3 vectors"),
+    ([1, 2, 3, 4], None, "4 ids for 3 vectors"),
+    ([1, 2, 3], [{}, {}, {}, {}], "4 metadata entries for 3 vectors"),
+])
+async def test_upsert_vectors_rejects_mismatched_lengths(test_logger, make_local_pool, mock_mcp, monkeypatch, ids, metadata, message):
+    """Test that mismatched ids or metadata fail at once instead of being retried per batch."""
+    pool = make_local_pool()
+    await pool.client.create_collection("lengths", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+    VectorTools(test_logger, pool=pool).register_tools(mock_mcp)
+    upserts = []
+    upsert = pool.client.upsert
+    
+    async def recording_upsert(*args, **kwargs):
+        upserts.append(kwargs)
+        return await upsert(*args, **kwargs)
+    
+    monkeypatch.setattr(pool.client, "upsert", recording_upsert)
+    
+    result = await mock_mcp.registered_tools["upsert_vectors"](
+        collection_name="lengths", vectors=[[1.0, 0.0, 0.0]] * 3, ids=ids, metadata=metadata, batch_size=1
+    )
+    
+    assert result[0].text == f"Error: got {message}"
+    assert upserts == []
+